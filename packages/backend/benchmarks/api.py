@@ -0,0 +1,365 @@
+"""Benchmark the hot API paths against the ASGI app in-process.
+
+Runs the real application (lifespan, middleware, auth, database) through
+``httpx.ASGITransport``. The external services are replaced by local
+stand-ins: the in-process fake Hetzner DNS API from ``tests/fakes``, a
+file email transport instead of Resend, and a temporary Traefik routes
+directory. The database is a SQLite file in a temporary directory unless
+``--database-url`` points at a local PostgreSQL.
+
+Scenarios: login, ``/auth/me``, ``list_subdomains`` at each ``--sizes``
+table size, claim/activate/release, and GraphQL ``subdomains`` with owners.
+Each reports p50/p95/p99 latency and throughput.
+
+``--save NAME`` writes the results to ``benchmarks/baselines/NAME.json``;
+``--compare NAME`` diffs a run against that baseline and exits non-zero
+when a scenario's p95 or throughput regressed by more than ``--threshold``.
+Baselines are only comparable on the same machine and database.
+
+Usage:
+    uv run python packages/backend/benchmarks/api.py --save sqlite
+    uv run python packages/backend/benchmarks/api.py --compare sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from prisme_api.services.hetzner_dns import HetznerDNSService
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+PASSWORD = "BenchPass1"
+GRAPHQL_SUBDOMAINS = """
+    query { subdomains(pagination: {pageSize: 20}) { edges { node { name owner { id } } } } }
+"""
+
+Call = Callable[[httpx.AsyncClient, str], Awaitable[httpx.Response]]
+
+
+class BenchmarkError(Exception):
+    """A scenario request failed, so its timings would be meaningless."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class Result:
+    """Latency percentiles (ms) and throughput of one scenario."""
+
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    call: Call,
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Result:
+    """Issue ``requests`` calls from ``concurrency`` workers and time each.
+
+    ``call`` receives a key unique within the scenario (``w<i>`` for
+    warm-up calls, ``m<i>`` for measured ones), so chained scenarios such
+    as claim -> activate -> release address the same subdomains.
+    """
+
+    async def drive(prefix: str, count: int, latencies: list[float]) -> None:
+        indexes = iter(range(count))
+
+        async def worker() -> None:
+            for i in indexes:
+                started = time.perf_counter()
+                response = await call(client, f"{prefix}{i}")
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise BenchmarkError(f"{name}: HTTP {response.status_code} {response.text}")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    await drive("w", warmup, [])
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await drive("m", requests, latencies)
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Result(
+        requests=requests,
+        p50_ms=round(cuts[49], 3),
+        p95_ms=round(cuts[94], 3),
+        p99_ms=round(cuts[98], 3),
+        rps=round(requests / elapsed, 1),
+    )
+
+
+# ── Environment ─────────────────────────────────────────────────
+
+
+def configure_environment(workdir: Path, database_url: str | None) -> None:
+    """Point the app at local stand-ins; must run before importing it."""
+    os.environ["DATABASE_URL"] = database_url or f"sqlite+aiosqlite:///{workdir / 'bench.db'}"
+    os.environ["TRAEFIK_ROUTES_DIR"] = str(workdir / "routes")
+    os.environ["EMAIL_TRANSPORT"] = f"file://{workdir / 'mail'}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ.pop("HETZNER_DNS_API_TOKEN", None)
+    (workdir / "routes").mkdir()
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def create_user(run_id: str) -> str:
+    """Persist the benchmark user and return its email."""
+    from prisme_api.auth.utils import hash_password
+    from prisme_api.database import async_session
+    from prisme_api.models.user import User
+
+    email = f"bench-{run_id}@example.com"
+    async with async_session() as db:
+        db.add(
+            User(
+                email=email,
+                username=f"bench-{run_id}",
+                password_hash=hash_password(PASSWORD),
+                email_verified=True,
+                is_active=True,
+                roles=["user"],
+                failed_login_attempts=0,
+                subdomain_limit=10**9,
+            )
+        )
+        await db.commit()
+    return email
+
+
+async def seed_subdomains(email: str, run_id: str, start: int, stop: int) -> None:
+    """Give the benchmark user subdomains ``start`` .. ``stop - 1``."""
+    from sqlalchemy import insert, select
+
+    from prisme_api.database import async_session
+    from prisme_api.models.subdomain import Subdomain
+    from prisme_api.models.user import User
+
+    async with async_session() as db:
+        owner_id = (await db.execute(select(User.id).where(User.email == email))).scalar_one()
+        for chunk in itertools.batched(range(start, stop), 1000, strict=False):
+            rows = [
+                {
+                    "name": f"seed-{run_id}-{i}",
+                    "owner_id": owner_id,
+                    "status": "active",
+                    "ip_address": "10.0.0.1",
+                }
+                for i in chunk
+            ]
+            await db.execute(insert(Subdomain), rows)
+        await db.commit()
+
+
+def dns_stand_in(latency_ms: float) -> HetznerDNSService:
+    """Hetzner DNS service backed by the fake API, with optional RTT."""
+    from tests.fakes.hetzner_dns import ZONE_ID, FakeHetznerDNS
+
+    from prisme_api.services.hetzner_dns import HetznerDNSService
+
+    fake = FakeHetznerDNS()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return fake.handle(request)
+
+    return HetznerDNSService(
+        api_token="bench-token",
+        zone_id=ZONE_ID,
+        http2=False,
+        transport=httpx.MockTransport(handle),
+    )
+
+
+# ── Scenarios ───────────────────────────────────────────────────
+
+
+async def benchmark(args: argparse.Namespace, run_id: str) -> dict[str, Result]:
+    from prisme_api.api.rest.subdomain import limiter
+    from prisme_api.auth.config import auth_settings
+    from prisme_api.main import app
+
+    # Claims and activations are rate limited per user; measure the handlers
+    limiter.enabled = False
+
+    results: dict[str, Result] = {}
+    scenario = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        app.state.dns_service = dns_stand_in(args.upstream_latency_ms)
+        email = await create_user(run_id)
+
+        async def login(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+
+        results["login"] = await run_scenario(client, "login", login, **scenario)
+        session = (await login(client, "")).cookies[auth_settings.session_cookie_name]
+        client.headers["Cookie"] = f"{auth_settings.session_cookie_name}={session}"
+
+        async def me(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.get("/api/auth/me")
+
+        results["auth_me"] = await run_scenario(client, "auth_me", me, **scenario)
+
+        async def list_subdomains(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.get("/api/subdomains")
+
+        seeded = 0
+        for size in sorted(args.sizes):
+            await seed_subdomains(email, run_id, seeded, size)
+            seeded = size
+            name = f"list_subdomains[n={size}]"
+            results[name] = await run_scenario(client, name, list_subdomains, **scenario)
+
+        def subdomain(key: str) -> str:
+            return f"b{run_id}{key}"
+
+        async def claim(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.post("/api/subdomains/claim", json={"name": subdomain(key)})
+
+        async def activate(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.post(
+                f"/api/subdomains/{subdomain(key)}/activate", json={"ip_address": "10.0.0.2"}
+            )
+
+        async def release(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.post(f"/api/subdomains/{subdomain(key)}/release")
+
+        for name, call in (("claim", claim), ("activate", activate), ("release", release)):
+            results[name] = await run_scenario(client, name, call, **scenario)
+
+        async def graphql_subdomains(client: httpx.AsyncClient, key: str) -> httpx.Response:
+            return await client.post("/graphql", json={"query": GRAPHQL_SUBDOMAINS})
+
+        results["graphql_subdomains"] = await run_scenario(
+            client, "graphql_subdomains", graphql_subdomains, **scenario
+        )
+    return results
+
+
+# ── Reporting ───────────────────────────────────────────────────
+
+
+def print_results(results: dict[str, Result]) -> None:
+    print(f"{'scenario':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, r in results.items():
+        print(f"{name:<28}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.rps:>10.1f}")
+
+
+def save_baseline(name: str, results: dict[str, Result], args: argparse.Namespace) -> Path:
+    path = BASELINES_DIR / f"{name}.json"
+    path.parent.mkdir(exist_ok=True)
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "postgresql" if args.database_url else "sqlite",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "upstream_latency_ms": args.upstream_latency_ms,
+        },
+        "results": {scenario: asdict(result) for scenario, result in results.items()},
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+    return path
+
+
+def compare(name: str, results: dict[str, Result], threshold: float) -> list[str]:
+    """Print the change against a saved baseline; return regressed scenarios."""
+    baseline = json.loads((BASELINES_DIR / f"{name}.json").read_text())["results"]
+    regressed = []
+    print(f"\nAgainst baseline {name!r} (regression: >{threshold:.0%} worse)")
+    print(f"{'scenario':<28}{'p95 ms':>18}{'change':>9}{'req/s':>18}{'change':>9}")
+    for scenario, result in results.items():
+        old = baseline.get(scenario)
+        if old is None:
+            print(f"{scenario:<28}{'(new)':>18}")
+            continue
+        p95_change = result.p95_ms / old["p95_ms"] - 1 if old["p95_ms"] else 0.0
+        rps_change = result.rps / old["rps"] - 1 if old["rps"] else 0.0
+        flag = ""
+        if p95_change > threshold or rps_change < -threshold:
+            regressed.append(scenario)
+            flag = "  REGRESSION"
+        print(
+            f"{scenario:<28}{old['p95_ms']:>8.2f} -> {result.p95_ms:<6.2f}{p95_change:>+9.0%}"
+            f"{old['rps']:>8.1f} -> {result.rps:<6.1f}{rps_change:>+9.0%}{flag}"
+        )
+    return regressed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="measured per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[100, 1_000, 10_000],
+        help="comma-separated subdomain table sizes for list_subdomains",
+    )
+    parser.add_argument("--database-url", help="local PostgreSQL instead of a SQLite file")
+    parser.add_argument(
+        "--upstream-latency-ms",
+        type=float,
+        default=0.0,
+        help="simulated round trip of the Hetzner DNS stand-in",
+    )
+    parser.add_argument("--save", metavar="NAME", help="write benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="diff against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_environment(Path(workdir), args.database_url)
+        results = await benchmark(args, run_id)
+
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print_results(results)
+    if args.save:
+        print(f"\nSaved {save_baseline(args.save, results, args)}")
+    if args.compare:
+        return 1 if compare(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
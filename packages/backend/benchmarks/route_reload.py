@@ -0,0 +1,87 @@
+"""Benchmark Traefik reload cost: one file per route vs sharded files.
+
+Populates a routes directory with N routes using each backend, then
+measures a single route update: the write itself, and the work Traefik's
+file provider does afterwards (re-reading and parsing every file in the
+watched directory).
+
+Usage:
+    uv run python packages/backend/benchmarks/route_reload.py --routes 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from prisme_api.services.route_manager import ShardedTraefikRouteManager, TraefikRouteManager
+
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:  # pragma: no cover - depends on libyaml
+    from yaml import SafeLoader as Loader
+
+
+def simulate_reload(routes_dir: Path) -> int:
+    """Parse every route file like Traefik does on a change; return routers."""
+    routers = 0
+    for path in routes_dir.glob("*.yml"):
+        config = yaml.load(path.read_text(), Loader=Loader)
+        routers += len(config["http"]["routers"])
+    return routers
+
+
+async def bench(manager: TraefikRouteManager, routes: int, updates: int) -> dict[str, float]:
+    async with manager.batch():
+        for i in range(routes):
+            await manager.create_route(f"app{i}", "10.0.0.1")
+
+    write_ms: list[float] = []
+    reload_ms: list[float] = []
+    for i in range(updates):
+        started = time.perf_counter()
+        await manager.update_route(f"app{i * 7 % routes}", f"10.0.1.{i % 250}")
+        write_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        assert simulate_reload(manager.routes_dir) == routes
+        reload_ms.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "files": len(list(manager.routes_dir.glob("*.yml"))),
+        "write_ms": statistics.median(write_ms),
+        "reload_ms": statistics.median(reload_ms),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=5)
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as files_dir, tempfile.TemporaryDirectory() as shard_dir:
+        results = {
+            "per-file": await bench(TraefikRouteManager(files_dir), args.routes, args.updates),
+            f"sharded({args.shards})": await bench(
+                ShardedTraefikRouteManager(shard_dir, shards=args.shards),
+                args.routes,
+                args.updates,
+            ),
+        }
+
+    print(f"{args.routes} routes, median of {args.updates} updates")
+    print(f"{'backend':<14}{'files':>8}{'write ms':>12}{'reload ms':>12}")
+    for name, r in results.items():
+        print(f"{name:<14}{r['files']:>8}{r['write_ms']:>12.2f}{r['reload_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Add activation_jobs table
+
+Revision ID: 20261017010000
+Revises: 20261017000000
+Create Date: 2026-10-17 01:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017010000"
+down_revision = "20261017000000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activation_jobs",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("subdomain_id", sa.Integer(), nullable=False),
+        sa.Column("subdomain_name", sa.String(length=63), nullable=False),
+        sa.Column("requested_by_id", sa.Integer(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=False),
+        sa.Column("port", sa.Integer(), nullable=False, server_default="80"),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="provisioning"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["subdomain_id"],
+            ["subdomains.id"],
+            name="fk_activation_jobs_subdomain_id_subdomains",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["requested_by_id"],
+            ["users.id"],
+            name="fk_activation_jobs_requested_by_id_users",
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_activation_jobs"),
+    )
+    op.create_index("ix_activation_jobs_subdomain_id", "activation_jobs", ["subdomain_id"])
+    op.create_index(
+        "ix_activation_jobs_status_next_attempt_at",
+        "activation_jobs",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activation_jobs_status_next_attempt_at", table_name="activation_jobs")
+    op.drop_index("ix_activation_jobs_subdomain_id", table_name="activation_jobs")
+    op.drop_table("activation_jobs")
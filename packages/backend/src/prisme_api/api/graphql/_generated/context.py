@@ -9,23 +9,47 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
 
-from prisme_api.database import get_db
+from prisme_api.api.graphql.loaders import Loaders
+from prisme_api.database import get_db, get_read_db, wrote_in_request
 
 
 class Context(BaseContext):
-    """GraphQL context passed to all resolvers."""
+    """GraphQL context passed to all resolvers.
 
-    def __init__(self, db: AsyncSession) -> None:
+    Mutations use ``db`` (primary). Query resolvers and relationship loaders
+    use ``read_db``, which is the replica session when one is configured
+    unless this request has already written.
+    """
+
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
         self.db = db
+        self._read_db = read_db if read_db is not None else db
+        self._loaders: Loaders | None = None
         # Add user, auth info, etc. here
         # self.user = None
 
+    @property
+    def read_db(self) -> AsyncSession:
+        """Session for reads; the primary once this request has written."""
+        return self.db if wrote_in_request() else self._read_db
+
+    @property
+    def loaders(self) -> Loaders:
+        """Per-request batching loaders for relationship fields.
+
+        Created on first use, so after a mutation they read from the primary.
+        """
+        if self._loaders is None:
+            self._loaders = Loaders(self.read_db)
+        return self._loaders
+
 
 async def get_context(
     db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
 ) -> Context:
     """Create GraphQL context from request."""
-    return Context(db=db)
+    return Context(db=db, read_db=read_db)
 
 
 __all__ = ["Context", "get_context"]
@@ -28,7 +28,7 @@ class UserQueries:
         id: int,
     ) -> UserType | None:
         """Get a User by ID."""
-        service = UserService(info.context.db)
+        service = UserService(info.context.read_db)
         result = await service.get(id)
         if result is None:
             return None
@@ -42,7 +42,7 @@ class UserQueries:
         pagination: OffsetPaginationInput | None = None,
     ) -> Connection[UserType]:
         """List users."""
-        service = UserService(info.context.db)
+        service = UserService(info.context.read_db)
 
         page = pagination.page if pagination else 1
         page_size = pagination.page_size if pagination else 20
@@ -51,8 +51,8 @@ class UserQueries:
         # Convert GraphQL where input to service filter
         filters = _convert_where_to_filter(where) if where else None
 
-        items = await service.list(skip=skip, limit=page_size, filters=filters)
-        total = await service.count_filtered(filters=filters)
+        page_result = await service.list_with_count(skip=skip, limit=page_size, filters=filters)
+        items, total = page_result.items, page_result.total
 
         typed_items = [user_from_model(item) for item in items]
         return paginate_results(typed_items, total, page, page_size)
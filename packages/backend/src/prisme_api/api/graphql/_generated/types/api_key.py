@@ -44,9 +44,12 @@ class APIKeyType:
         """Fetch related User entities."""
         from .user import user_from_model
 
-        if self._db_user is None:
+        user = self._db_user
+        if user is None and self.userId is not None:
+            user = await info.context.loaders.user_by_id.load(self.userId)
+        if user is None:
             return None
-        return user_from_model(self._db_user)
+        return user_from_model(user)
 
 
 @strawberry.input(description="Input for creating a APIKey")
@@ -43,9 +43,12 @@ class SubdomainType:
         """Fetch related User entities."""
         from .user import user_from_model
 
-        if self._db_owner is None:
+        owner = self._db_owner
+        if owner is None and self.ownerId is not None:
+            owner = await info.context.loaders.user_by_id.load(self.ownerId)
+        if owner is None:
             return None
-        return user_from_model(self._db_owner)
+        return user_from_model(owner)
 
 
 @strawberry.input(description="Input for creating a Subdomain")
@@ -63,9 +63,10 @@ class UserType:
         """Fetch related APIKey entities."""
         from .api_key import api_key_from_model
 
-        if self._db_api_keys is None:
-            return []
-        return [api_key_from_model(item) for item in self._db_api_keys]
+        items = self._db_api_keys
+        if items is None:
+            items = await info.context.loaders.api_keys_by_user.load(self.id)
+        return [api_key_from_model(item) for item in items]
 
     @strawberry.field
     async def subdomains(
@@ -74,9 +75,10 @@ class UserType:
         """Fetch related Subdomain entities."""
         from .subdomain import subdomain_from_model
 
-        if self._db_subdomains is None:
-            return []
-        return [subdomain_from_model(item) for item in self._db_subdomains]
+        items = self._db_subdomains
+        if items is None:
+            items = await info.context.loaders.subdomains_by_owner.load(self.id)
+        return [subdomain_from_model(item) for item in items]
 
 
 @strawberry.input(description="Input for creating a User")
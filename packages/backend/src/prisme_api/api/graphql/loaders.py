@@ -0,0 +1,85 @@
+"""Per-request DataLoaders for GraphQL relationship fields.
+
+Relationship resolvers (``SubdomainType.owner``, ``UserType.subdomains``,
+``UserType.apiKeys``, ``APIKeyType.user``) go through these loaders, which
+collect every key requested while a level of the query is resolved and
+fetch them with a single ``IN`` query. Listing 100 users with their
+subdomains therefore costs one query for the users and one for all their
+subdomains, instead of 1 + 100.
+
+Loaders are created per request (see ``Context``), so their caches never
+outlive the request's database session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+from prisme_api.models.api_key import APIKey
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.models.user import User
+
+
+class Loaders:
+    """DataLoaders bound to one request's database session."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Create the loaders.
+
+        Args:
+            db: The request's async database session.
+        """
+        self.db = db
+        # Batches of different loaders can be dispatched concurrently, but an
+        # AsyncSession must not run two statements at once.
+        self._lock = asyncio.Lock()
+
+        self.user_by_id: DataLoader[int, User | None] = DataLoader(load_fn=self._load_users)
+        self.subdomains_by_owner: DataLoader[int, list[Subdomain]] = DataLoader(
+            load_fn=self._load_subdomains_by_owner
+        )
+        self.api_keys_by_user: DataLoader[int, list[APIKey]] = DataLoader(
+            load_fn=self._load_api_keys_by_user
+        )
+
+    async def _fetch(self, query: Any) -> Sequence[Any]:
+        async with self._lock:
+            result = await self.db.execute(query)
+            return result.scalars().all()
+
+    async def _load_users(self, ids: list[int]) -> list[User | None]:
+        users = await self._fetch(select(User).where(User.id.in_(ids), User.deleted_at.is_(None)))
+        by_id = {user.id: user for user in users}
+        return [by_id.get(user_id) for user_id in ids]
+
+    async def _load_subdomains_by_owner(self, owner_ids: list[int]) -> list[list[Subdomain]]:
+        subdomains = await self._fetch(
+            select(Subdomain).where(Subdomain.owner_id.in_(owner_ids)).order_by(Subdomain.id)
+        )
+        return _group(subdomains, owner_ids, lambda s: s.owner_id)
+
+    async def _load_api_keys_by_user(self, user_ids: list[int]) -> list[list[APIKey]]:
+        api_keys = await self._fetch(
+            select(APIKey).where(APIKey.user_id.in_(user_ids)).order_by(APIKey.id)
+        )
+        return _group(api_keys, user_ids, lambda k: k.user_id)
+
+
+def _group[T](
+    rows: Sequence[T], keys: list[int], key_of: Callable[[T], int | None]
+) -> list[list[T]]:
+    """Group rows by key, in the order the loader requested the keys."""
+    grouped: dict[int | None, list[T]] = defaultdict(list)
+    for row in rows:
+        grouped[key_of(row)].append(row)
+    return [grouped.get(key, []) for key in keys]
+
+
+__all__ = ["Loaders"]
@@ -18,7 +18,7 @@ from prisme_api.schemas.allowed_email_domain import (
 from prisme_api.schemas.base import PaginatedResponse
 from prisme_api.services.allowed_email_domain import AllowedEmailDomainService
 
-from .deps import DbSession, Pagination, Sorting
+from .deps import DbSession, Pagination, ReadDbSession, Sorting
 
 router = APIRouter(prefix="/allowed-email-domains", tags=["allowed-email-domains"])
 
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/allowed-email-domains", tags=["allowed-email-domains
     summary="List allowed_email_domains",
 )
 async def list_allowed_email_domains(
-    db: DbSession,
+    db: ReadDbSession,
     pagination: Pagination,
     sorting: Sorting,
     include_deleted: Annotated[bool, Query(description="Include soft-deleted records")] = False,
@@ -63,7 +63,7 @@ async def list_allowed_email_domains(
     summary="Get allowed_email_domain",
 )
 async def get_allowed_email_domain(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
 ) -> AllowedEmailDomainRead:
     """Get a allowed_email_domain by ID."""
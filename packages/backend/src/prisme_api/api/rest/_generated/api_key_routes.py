@@ -18,7 +18,7 @@ from prisme_api.schemas.api_key import (
 from prisme_api.schemas.base import PaginatedResponse
 from prisme_api.services.api_key import APIKeyService
 
-from .deps import DbSession, Pagination, Sorting
+from .deps import DbSession, Pagination, ReadDbSession, Sorting
 
 router = APIRouter(prefix="/api-keys", tags=["api-keys"])
 
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/api-keys", tags=["api-keys"])
     summary="List api_keys",
 )
 async def list_api_keys(
-    db: DbSession,
+    db: ReadDbSession,
     pagination: Pagination,
     sorting: Sorting,
     include_deleted: Annotated[bool, Query(description="Include soft-deleted records")] = False,
@@ -63,7 +63,7 @@ async def list_api_keys(
     summary="Get api_key",
 )
 async def get_api_key(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
 ) -> APIKeyRead:
     """Get a api_key by ID."""
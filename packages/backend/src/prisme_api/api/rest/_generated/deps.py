@@ -10,7 +10,7 @@ from typing import Annotated
 from fastapi import Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from prisme_api.database import get_db
+from prisme_api.database import get_db, get_read_db
 
 
 class PaginationParams:
@@ -20,11 +20,23 @@ class PaginationParams:
         self,
         page: Annotated[int, Query(ge=1, description="Page number")] = 1,
         page_size: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 20,
+        after: Annotated[
+            str | None, Query(description="Cursor: return items after this one (ignores page)")
+        ] = None,
+        before: Annotated[
+            str | None, Query(description="Cursor: return items before this one (ignores page)")
+        ] = None,
+        approximate_total: Annotated[
+            bool, Query(description="Allow an estimated total for large unfiltered lists")
+        ] = False,
     ) -> None:
         self.page = page
         self.page_size = page_size
         self.skip = (page - 1) * page_size
         self.limit = page_size
+        self.after = after
+        self.before = before
+        self.approximate_total = approximate_total
 
 
 class SortParams:
@@ -41,6 +53,8 @@ class SortParams:
 
 # Type aliases for dependency injection
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+# Read-only endpoints: replica if configured (see database.get_read_db)
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db)]
 Pagination = Annotated[PaginationParams, Depends()]
 Sorting = Annotated[SortParams, Depends()]
 
@@ -49,7 +63,9 @@ __all__ = [
     "DbSession",
     "Pagination",
     "PaginationParams",
+    "ReadDbSession",
     "SortParams",
     "Sorting",
     "get_db",
+    "get_read_db",
 ]
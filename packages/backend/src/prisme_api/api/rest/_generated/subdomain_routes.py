@@ -18,7 +18,7 @@ from prisme_api.schemas.subdomain import (
 )
 from prisme_api.services.subdomain import SubdomainService
 
-from .deps import DbSession, Pagination, Sorting
+from .deps import DbSession, Pagination, ReadDbSession, Sorting
 
 router = APIRouter(prefix="/subdomains", tags=["subdomains"])
 
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/subdomains", tags=["subdomains"])
     summary="List subdomains",
 )
 async def list_subdomains(
-    db: DbSession,
+    db: ReadDbSession,
     pagination: Pagination,
     sorting: Sorting,
     include_deleted: Annotated[bool, Query(description="Include soft-deleted records")] = False,
@@ -63,7 +63,7 @@ async def list_subdomains(
     summary="Get subdomain",
 )
 async def get_subdomain(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
 ) -> SubdomainRead:
     """Get a subdomain by ID."""
@@ -16,9 +16,10 @@ from prisme_api.schemas.user import (
     UserRead,
     UserUpdate,
 )
+from prisme_api.services.cursor import InvalidCursorError, page_cursors
 from prisme_api.services.user import UserService
 
-from .deps import DbSession, Pagination, Sorting
+from .deps import DbSession, Pagination, ReadDbSession, Sorting
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -29,7 +30,7 @@ router = APIRouter(prefix="/users", tags=["users"])
     summary="List users",
 )
 async def list_users(
-    db: DbSession,
+    db: ReadDbSession,
     pagination: Pagination,
     sorting: Sorting,
     include_deleted: Annotated[bool, Query(description="Include soft-deleted records")] = False,
@@ -37,15 +38,30 @@ async def list_users(
     """List users with pagination and filtering."""
     service = UserService(db)
 
-    items = await service.list(
-        skip=pagination.skip,
+    try:
+        page = await service.list_with_count(
+            skip=pagination.skip,
+            limit=pagination.limit,
+            sort_by=sorting.sort_by,
+            sort_order=sorting.sort_order,
+            after=pagination.after,
+            before=pagination.before,
+            include_deleted=include_deleted,
+            approximate=pagination.approximate_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    items, total = page.items, page.total
+    next_cursor, prev_cursor = page_cursors(
+        items,
         limit=pagination.limit,
         sort_by=sorting.sort_by,
         sort_order=sorting.sort_order,
-        include_deleted=include_deleted,
+        after=pagination.after,
+        before=pagination.before,
+        skip=pagination.skip,
     )
 
-    total = await service.count(include_deleted=include_deleted)
     pages = (total + pagination.page_size - 1) // pagination.page_size
 
     return PaginatedResponse(
@@ -54,6 +70,9 @@ async def list_users(
         page=pagination.page,
         page_size=pagination.page_size,
         pages=pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
@@ -63,7 +82,7 @@ async def list_users(
     summary="Get user",
 )
 async def get_user(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
 ) -> UserRead:
     """Get a user by ID."""
@@ -23,8 +23,9 @@ from prisme_api.schemas.api_key import (
 )
 from prisme_api.schemas.base import PaginatedResponse
 from prisme_api.services.api_key import APIKeyService
+from prisme_api.services.cursor import InvalidCursorError, page_cursors
 
-from ._generated.deps import DbSession, Pagination, Sorting
+from ._generated.deps import DbSession, Pagination, ReadDbSession, Sorting
 
 # Create a new router with authentication required
 router = APIRouter(
@@ -40,7 +41,7 @@ router = APIRouter(
     summary="List API keys",
 )
 async def list_api_keys(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentActiveUser,
     pagination: Pagination,
     sorting: Sorting,
@@ -53,15 +54,30 @@ async def list_api_keys(
     if "admin" not in (current_user.roles or []):
         filters = APIKeyFilter(user_id=current_user.id)
 
-    items = await service.list(
-        skip=pagination.skip,
+    try:
+        page = await service.list_with_count(
+            skip=pagination.skip,
+            limit=pagination.limit,
+            sort_by=sorting.sort_by,
+            sort_order=sorting.sort_order,
+            after=pagination.after,
+            before=pagination.before,
+            filters=filters,
+            approximate=pagination.approximate_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    items, total = page.items, page.total
+    next_cursor, prev_cursor = page_cursors(
+        items,
         limit=pagination.limit,
         sort_by=sorting.sort_by,
         sort_order=sorting.sort_order,
-        filters=filters,
+        after=pagination.after,
+        before=pagination.before,
+        skip=pagination.skip,
     )
 
-    total = await service.count_filtered(filters=filters)
     pages = (
         (total + pagination.page_size - 1) // pagination.page_size if pagination.page_size else 1
     )
@@ -72,6 +88,9 @@ async def list_api_keys(
         page=pagination.page,
         page_size=pagination.page_size,
         pages=pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
@@ -81,7 +100,7 @@ async def list_api_keys(
     summary="Get API key",
 )
 async def get_api_key(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
     current_user: CurrentActiveUser,
 ) -> APIKeyRead:
@@ -12,8 +12,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Annotated
 from urllib.parse import urlencode
 
-import httpx
-from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
@@ -21,13 +20,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from prisme_api.auth.config import auth_settings
 from prisme_api.auth.dependencies import CurrentActiveUser, create_session_jwt
+from prisme_api.auth.github_oauth import (
+    GITHUB_AUTHORIZE_URL,
+    GitHubOAuthClient,
+    GitHubOAuthError,
+)
+from prisme_api.auth.oauth_state import oauth_state_store
+from prisme_api.auth.password_pool import PasswordHashPoolSaturatedError
+from prisme_api.auth.user_cache import user_cache
 from prisme_api.auth.utils import (
     generate_token,
     generate_totp_secret,
     get_totp_uri,
-    hash_password,
+    hash_password_async,
     validate_password_strength,
-    verify_password,
+    verify_password_async,
     verify_totp,
 )
 from prisme_api.database import get_db
@@ -142,13 +149,40 @@ def _record_failed_login(user: User) -> None:
         user.locked_until = datetime.now(UTC) + timedelta(
             minutes=auth_settings.lockout_duration_minutes
         )
+    user_cache.invalidate(user.id)
 
 
 def _reset_failed_logins(user: User) -> None:
+    if user.failed_login_attempts or user.locked_until:
+        user_cache.invalidate(user.id)
     user.failed_login_attempts = 0
     user.locked_until = None
 
 
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _hash_password(password: str) -> str:
+    """Hash off the event loop; 503 when the bcrypt pool is saturated."""
+    try:
+        return await hash_password_async(password)
+    except PasswordHashPoolSaturatedError:
+        raise _password_pool_busy() from None
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify off the event loop; 503 when the bcrypt pool is saturated."""
+    try:
+        return await verify_password_async(plain_password, hashed_password)
+    except PasswordHashPoolSaturatedError:
+        raise _password_pool_busy() from None
+
+
 async def _validate_email_domain(db: AsyncSession, email: str) -> None:
     """Check email domain against whitelist."""
     try:
@@ -195,7 +229,7 @@ async def signup(
     user = User(
         email=body.email,
         username=body.username,
-        password_hash=hash_password(body.password),
+        password_hash=await _hash_password(body.password),
         email_verified=False,
         email_verification_token=token,
         email_verification_token_expires_at=datetime.now(UTC)
@@ -204,11 +238,10 @@ async def signup(
         is_active=True,
     )
     db.add(user)
+    # Queued in the same transaction as the new user
+    send_verification_email(db, body.email, token)
     await db.commit()
 
-    # Send verification email
-    send_verification_email(body.email, token)
-
     return {"message": "Account created. Please check your email to verify your address."}
 
 
@@ -245,6 +278,7 @@ async def verify_email(
     user.email_verification_token_expires_at = None
     await db.commit()
     await db.refresh(user)
+    user_cache.invalidate(user.id)
 
     # Auto-login
     token = create_session_jwt(user)
@@ -268,8 +302,8 @@ async def resend_verification(
         user.email_verification_token_expires_at = datetime.now(UTC) + timedelta(
             hours=auth_settings.email_verification_token_hours
         )
+        send_verification_email(db, body.email, token)
         await db.commit()
-        send_verification_email(body.email, token)
 
     return {"message": "If an unverified account exists, a verification email has been sent."}
 
@@ -295,7 +329,7 @@ async def login(
 
     _check_account_locked(user)
 
-    if not verify_password(body.password, user.password_hash):
+    if not await _verify_password(body.password, user.password_hash):
         _record_failed_login(user)
         await db.commit()
         raise HTTPException(
@@ -388,8 +422,8 @@ async def forgot_password(
         user.password_reset_token_expires_at = datetime.now(UTC) + timedelta(
             hours=auth_settings.password_reset_token_hours
         )
+        send_password_reset_email(db, body.email, token)
         await db.commit()
-        send_password_reset_email(body.email, token)
 
     return {"message": "If an account exists, a password reset email has been sent."}
 
@@ -422,14 +456,14 @@ async def reset_password(
             detail="Reset token has expired.",
         )
 
-    user.password_hash = hash_password(body.password)
+    user.password_hash = await _hash_password(body.password)
     user.password_reset_token = None
     user.password_reset_token_expires_at = None
     _reset_failed_logins(user)
+    send_password_changed_notification(db, user.email)
     await db.commit()
     await db.refresh(user)
-
-    send_password_changed_notification(user.email)
+    user_cache.invalidate(user.id)
 
     # Auto-login
     token = create_session_jwt(user)
@@ -451,6 +485,7 @@ async def mfa_setup(
     # Store pending secret (not yet enabled)
     current_user.mfa_secret = secret
     await db.commit()
+    user_cache.invalidate(current_user.id)
 
     uri = get_totp_uri(secret, current_user.email)
     return MFASetupResponse(totp_uri=uri, secret=secret)
@@ -477,6 +512,7 @@ async def mfa_verify_setup(
 
     current_user.mfa_enabled = True
     await db.commit()
+    user_cache.invalidate(current_user.id)
     return {"message": "MFA enabled successfully."}
 
 
@@ -487,7 +523,7 @@ async def mfa_disable(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, str]:
     """Disable MFA. Requires password verification."""
-    if not current_user.password_hash or not verify_password(
+    if not current_user.password_hash or not await _verify_password(
         body.password, current_user.password_hash
     ):
         raise HTTPException(
@@ -498,25 +534,16 @@ async def mfa_disable(
     current_user.mfa_enabled = False
     current_user.mfa_secret = None
     await db.commit()
+    user_cache.invalidate(current_user.id)
     return {"message": "MFA disabled."}
 
 
 # ── GitHub OAuth ────────────────────────────────────────────────
 
-GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
-GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
-GITHUB_USER_API = "https://api.github.com/user"
-GITHUB_EMAILS_API = "https://api.github.com/user/emails"
-
-# In-memory state store (acceptable for single-instance; use Redis if scaling)
-_oauth_states: dict[str, float] = {}
 
-
-def _cleanup_expired_states() -> None:
-    now = datetime.now(UTC).timestamp()
-    expired = [k for k, v in _oauth_states.items() if now - v > 300]
-    for k in expired:
-        _oauth_states.pop(k, None)
+def get_github_oauth(request: Request) -> GitHubOAuthClient | None:
+    """Get the app-lifetime GitHub OAuth client (None if not configured)."""
+    return getattr(request.app.state, "github_oauth", None)
 
 
 @router.get("/github/login")
@@ -528,9 +555,8 @@ async def github_login() -> RedirectResponse:
             detail="GitHub OAuth is not configured",
         )
 
-    _cleanup_expired_states()
     state = secrets.token_urlsafe(32)
-    _oauth_states[state] = datetime.now(UTC).timestamp()
+    await oauth_state_store.add(state)
 
     params = urlencode(
         {
@@ -549,6 +575,7 @@ async def github_login() -> RedirectResponse:
 @router.get("/github/callback")
 async def github_callback(
     db: Annotated[AsyncSession, Depends(get_db)],
+    github: Annotated[GitHubOAuthClient | None, Depends(get_github_oauth)],
     code: str | None = Query(None),
     state: str | None = Query(None),
     error: str | None = Query(None),
@@ -562,69 +589,29 @@ async def github_callback(
             url="/auth/callback?error=missing_params", status_code=status.HTTP_302_FOUND
         )
 
-    # Validate CSRF state
-    if state not in _oauth_states:
+    # Validate CSRF state (single use)
+    if not await oauth_state_store.consume(state):
         return RedirectResponse(
             url="/auth/callback?error=invalid_state", status_code=status.HTTP_302_FOUND
         )
-    _oauth_states.pop(state, None)
-
-    async with httpx.AsyncClient() as client:
-        # Exchange code for access token
-        token_resp = await client.post(
-            GITHUB_TOKEN_URL,
-            data={
-                "client_id": auth_settings.github_client_id,
-                "client_secret": auth_settings.github_client_secret,
-                "code": code,
-                "redirect_uri": auth_settings.github_redirect_uri,
-            },
-            headers={"Accept": "application/json"},
-        )
-        if token_resp.status_code != 200:
-            logger.error("GitHub token exchange failed: %s", token_resp.text)
-            return RedirectResponse(
-                url="/auth/callback?error=token_exchange_failed",
-                status_code=status.HTTP_302_FOUND,
-            )
 
-        token_data = token_resp.json()
-        access_token = token_data.get("access_token")
-        if not access_token:
-            return RedirectResponse(
-                url="/auth/callback?error=no_access_token",
-                status_code=status.HTTP_302_FOUND,
-            )
-
-        auth_headers = {"Authorization": f"Bearer {access_token}"}
+    if github is None:
+        return RedirectResponse(
+            url="/auth/callback?error=not_configured", status_code=status.HTTP_302_FOUND
+        )
 
-        # Get user profile
-        user_resp = await client.get(GITHUB_USER_API, headers=auth_headers)
-        if user_resp.status_code != 200:
-            return RedirectResponse(
-                url="/auth/callback?error=github_user_failed",
-                status_code=status.HTTP_302_FOUND,
-            )
-        gh_user = user_resp.json()
-
-        # Get primary verified email
-        email = gh_user.get("email")
-        if not email:
-            emails_resp = await client.get(GITHUB_EMAILS_API, headers=auth_headers)
-            if emails_resp.status_code == 200:
-                for em in emails_resp.json():
-                    if em.get("primary") and em.get("verified"):
-                        email = em["email"]
-                        break
-
-        if not email:
-            return RedirectResponse(
-                url="/auth/callback?error=no_email", status_code=status.HTTP_302_FOUND
-            )
+    try:
+        access_token = await github.exchange_code(code)
+        identity = await github.fetch_identity(access_token)
+    except GitHubOAuthError as e:
+        return RedirectResponse(
+            url=f"/auth/callback?error={e.code}", status_code=status.HTTP_302_FOUND
+        )
+    email = identity.email
 
     # Find or create user
-    username = gh_user.get("login", email.split("@")[0])
-    github_id = str(gh_user.get("id", ""))
+    username = identity.login or email.split("@")[0]
+    github_id = identity.github_id
 
     # Try finding by github_id first
     result = await db.execute(select(User).where(User.github_id == github_id))
@@ -639,6 +626,7 @@ async def github_callback(
         if not user.github_id:
             user.github_id = github_id
             await db.commit()
+            user_cache.invalidate(user.id)
     else:
         # Validate email domain
         await _validate_email_domain(db, email)
@@ -5,22 +5,35 @@ This file extends the base routes with:
 - Reserved name validation
 - Hetzner DNS integration
 - DNS propagation status endpoint
+- Traefik route and DNS zone reconcile endpoints
+- Background activation jobs, polled or streamed (server-sent events)
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
+import time
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from prisme_api.auth.dependencies import CurrentActiveUser, get_current_active_user
+from prisme_api.auth.dependencies import (
+    CurrentActiveUser,
+    get_current_active_user,
+    require_roles,
+)
+from prisme_api.config import settings
+from prisme_api.models.activation_job import ActivationJob
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.rate_limit import create_limiter
 from prisme_api.schemas.base import PaginatedResponse
 from prisme_api.schemas.subdomain import (
     SubdomainCreate,
@@ -28,14 +41,26 @@ from prisme_api.schemas.subdomain import (
     SubdomainRead,
     SubdomainUpdate,
 )
+from prisme_api.services.activation import (
+    PROVISIONING,
+    ActivationWorker,
+    cancel_activations,
+    enqueue_activation,
+    pending_activation,
+    provision_dns,
+)
+from prisme_api.services.cursor import InvalidCursorError, page_cursors
+from prisme_api.services.dns_propagation import DNSPropagationChecker
+from prisme_api.services.dns_zone import ZoneMirror, reconcile_zone
 from prisme_api.services.hetzner_dns import (
     HetznerDNSError,
     HetznerDNSService,
+    HetznerDNSUnavailableError,
     is_reserved_subdomain,
 )
 from prisme_api.services.subdomain import SubdomainService
 
-from ._generated.deps import DbSession, Pagination, Sorting
+from ._generated.deps import DbSession, Pagination, ReadDbSession, Sorting
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +74,7 @@ def get_user_key(request: Request) -> str:
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=get_user_key, enabled="sqlite" not in os.environ.get("DATABASE_URL", ""))
+limiter = create_limiter(get_user_key, enabled="sqlite" not in os.environ.get("DATABASE_URL", ""))
 
 # Subdomain validation pattern
 SUBDOMAIN_PATTERN = re.compile(r"^[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?$")
@@ -109,6 +134,17 @@ router = APIRouter(
 )
 
 
+class ResolverStatus(BaseModel):
+    """What a single resolver currently answers for a subdomain."""
+
+    resolver: str
+    propagated: bool
+    ips: list[str]
+    ttl: int | None
+    latency_ms: float | None
+    error: str | None
+
+
 class PropagationStatus(BaseModel):
     """DNS propagation status response."""
 
@@ -117,6 +153,45 @@ class PropagationStatus(BaseModel):
     status: str
     dns_record_id: str | None
     propagation: dict[str, bool]
+    resolvers: list[ResolverStatus] = []
+    # What the zone holds for the name, per the local mirror (None if unknown)
+    zone_ip_address: str | None = None
+
+
+class RouteSyncResponse(BaseModel):
+    """Result (or plan, for a dry run) of a Traefik route reconcile."""
+
+    created: list[str]
+    updated: list[str]
+    deleted: list[str]
+    unchanged: int
+    dry_run: bool
+
+
+class ActivationJobRead(BaseModel):
+    """State of a background activation."""
+
+    id: str
+    subdomain: str
+    status: str
+    ip_address: str
+    port: int
+    attempts: int
+    error: str | None
+    created_at: datetime
+    completed_at: datetime | None
+
+
+class ZoneSyncResponse(BaseModel):
+    """Result (or plan, for a dry run) of a DNS zone reconcile."""
+
+    created: list[str]
+    updated: list[str]
+    deleted: list[str]
+    relinked: list[str]
+    failed: list[str]
+    unchanged: int
+    dry_run: bool
 
 
 class SubdomainClaimRequest(BaseModel):
@@ -132,19 +207,102 @@ class SubdomainActivateRequest(BaseModel):
     port: int = 80
 
 
-def get_dns_service() -> HetznerDNSService | None:
-    """Get the Hetzner DNS service if configured.
+def get_dns_service(request: Request) -> HetznerDNSService | None:
+    """Get the app-lifetime Hetzner DNS service.
 
-    Returns None if environment variables are not set (for local development).
+    The service is created once in the application lifespan and shares one
+    pooled HTTP client across requests. Returns None if DNS is not
+    configured (for local development). Override this dependency in tests.
     """
-    try:
-        return HetznerDNSService()
-    except HetznerDNSError:
-        logger.warning(
-            "Hetzner DNS not configured - DNS operations will be skipped. "
-            "Set HETZNER_DNS_API_TOKEN and HETZNER_DNS_ZONE_ID to enable."
+    return getattr(request.app.state, "dns_service", None)
+
+
+DNSService = Annotated[HetznerDNSService | None, Depends(get_dns_service)]
+
+
+def get_propagation_checker(request: Request) -> DNSPropagationChecker | None:
+    """Get the app-lifetime DNS propagation checker."""
+    return getattr(request.app.state, "dns_propagation", None)
+
+
+PropagationChecker = Annotated[DNSPropagationChecker | None, Depends(get_propagation_checker)]
+
+
+def get_zone_mirror(request: Request) -> ZoneMirror | None:
+    """Get the app-lifetime DNS zone mirror (None if DNS is not configured)."""
+    reconciler = getattr(request.app.state, "dns_zone", None)
+    return reconciler.mirror if reconciler is not None else None
+
+
+DNSZone = Annotated[ZoneMirror | None, Depends(get_zone_mirror)]
+
+
+def get_activation_worker(request: Request) -> ActivationWorker | None:
+    """Get the app-lifetime background activation worker."""
+    return getattr(request.app.state, "activation_worker", None)
+
+
+Activations = Annotated[ActivationWorker | None, Depends(get_activation_worker)]
+
+
+def _job_read(job: ActivationJob) -> ActivationJobRead:
+    return ActivationJobRead(
+        id=job.id,
+        subdomain=job.subdomain_name,
+        status=job.status,
+        ip_address=job.ip_address,
+        port=job.port,
+        attempts=job.attempts,
+        error=job.last_error,
+        created_at=job.created_at,
+        completed_at=job.completed_at,
+    )
+
+
+async def _get_activatable_subdomain(
+    service: SubdomainService,
+    name: str,
+    activate_request: SubdomainActivateRequest,
+    current_user: CurrentActiveUser,
+) -> Subdomain:
+    """Validate an activation request and load the subdomain it targets."""
+    # Validate IP address format first
+    ip_error = validate_ip_address(activate_request.ip_address)
+    if ip_error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ip_error,
         )
-        return None
+
+    # Validate port
+    port_error = validate_port(activate_request.port)
+    if port_error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=port_error,
+        )
+
+    # Get subdomain by name
+    subdomain = await service.get_by_name(name.lower())
+    if not subdomain:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Subdomain '{name}' not found",
+        )
+
+    # Check ownership for non-admin users
+    if "admin" not in (current_user.roles or []) and subdomain.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+    if subdomain.status == "suspended":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Subdomain is suspended",
+        )
+    return subdomain
 
 
 @router.get(
@@ -153,7 +311,7 @@ def get_dns_service() -> HetznerDNSService | None:
     summary="List subdomains",
 )
 async def list_subdomains(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentActiveUser,
     pagination: Pagination,
     sorting: Sorting,
@@ -166,15 +324,30 @@ async def list_subdomains(
     if "admin" not in (current_user.roles or []):
         filters = SubdomainFilter(owner_id=current_user.id)
 
-    items = await service.list(
-        skip=pagination.skip,
+    try:
+        page = await service.list_with_count(
+            skip=pagination.skip,
+            limit=pagination.limit,
+            sort_by=sorting.sort_by,
+            sort_order=sorting.sort_order,
+            after=pagination.after,
+            before=pagination.before,
+            filters=filters,
+            approximate=pagination.approximate_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    items, total = page.items, page.total
+    next_cursor, prev_cursor = page_cursors(
+        items,
         limit=pagination.limit,
         sort_by=sorting.sort_by,
         sort_order=sorting.sort_order,
-        filters=filters,
+        after=pagination.after,
+        before=pagination.before,
+        skip=pagination.skip,
     )
 
-    total = await service.count_filtered(filters=filters)
     pages = (
         (total + pagination.page_size - 1) // pagination.page_size if pagination.page_size else 1
     )
@@ -185,6 +358,9 @@ async def list_subdomains(
         page=pagination.page,
         page_size=pagination.page_size,
         pages=pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
@@ -194,7 +370,7 @@ async def list_subdomains(
     summary="Get subdomain",
 )
 async def get_subdomain(
-    db: DbSession,
+    db: ReadDbSession,
     id: int,
     current_user: CurrentActiveUser,
 ) -> SubdomainRead:
@@ -298,6 +474,81 @@ async def claim_subdomain(
     return SubdomainRead.model_validate(result)
 
 
+@router.post(
+    "/routes/reconcile",
+    response_model=RouteSyncResponse,
+    dependencies=[Depends(require_roles("admin"))],
+    summary="Reconcile Traefik routes with active subdomains",
+)
+async def reconcile_routes(
+    db: DbSession,
+    dry_run: Annotated[bool, Query(description="Only report the diff")] = False,
+    verify: Annotated[bool, Query(description="Re-hash route files on disk")] = False,
+) -> RouteSyncResponse:
+    """Bring the Traefik route files in line with the active subdomains.
+
+    Only routes whose content differs are rewritten. Admin only.
+    """
+    from prisme_api.services.route_manager import get_route_manager
+
+    route_manager = get_route_manager()
+    if route_manager is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Route management is not configured",
+        )
+
+    active = await SubdomainService(db).active_routes()
+    result = await route_manager.sync_routes(active, dry_run=dry_run, verify=verify)
+    return RouteSyncResponse(
+        created=result.created,
+        updated=result.updated,
+        deleted=result.deleted,
+        unchanged=result.unchanged,
+        dry_run=result.dry_run,
+    )
+
+
+@router.post(
+    "/dns/reconcile",
+    response_model=ZoneSyncResponse,
+    dependencies=[Depends(require_roles("admin"))],
+    summary="Reconcile the DNS zone with active subdomains",
+)
+async def reconcile_dns_zone(
+    db: DbSession,
+    zone: DNSZone,
+    dry_run: Annotated[bool, Query(description="Only report the diff")] = False,
+) -> ZoneSyncResponse:
+    """Re-read the whole DNS zone and repair it to match the subdomains.
+
+    Creates missing A records, updates stale ones, deletes orphaned ones
+    and stores the record IDs found or created. Admin only.
+    """
+    if zone is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="DNS is not configured",
+        )
+
+    try:
+        result = await reconcile_zone(zone, db, dry_run=dry_run)
+    except HetznerDNSError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to read DNS zone: {e!s}",
+        ) from e
+    return ZoneSyncResponse(
+        created=result.created,
+        updated=result.updated,
+        deleted=result.deleted,
+        relinked=result.relinked,
+        failed=result.failed,
+        unchanged=result.unchanged,
+        dry_run=result.dry_run,
+    )
+
+
 @router.post(
     "/{name}/activate",
     response_model=SubdomainRead,
@@ -310,75 +561,53 @@ async def activate_subdomain(
     name: str,
     activate_request: SubdomainActivateRequest,
     current_user: CurrentActiveUser,
+    dns_service: DNSService,
+    propagation_checker: PropagationChecker,
+    zone: DNSZone,
 ) -> SubdomainRead:
     """Activate a subdomain by setting its IP address and creating DNS record.
 
-    This creates an A record pointing to the provided IP address.
-    Users can only activate their own subdomains.
+    This creates an A record pointing to the provided IP address, waiting
+    on Hetzner DNS. ``POST /{name}/activations`` does the same in the
+    background. Users can only activate their own subdomains.
     """
-    # Validate IP address format first
-    ip_error = validate_ip_address(activate_request.ip_address)
-    if ip_error:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ip_error,
-        )
-
-    # Validate port
-    port_error = validate_port(activate_request.port)
-    if port_error:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=port_error,
-        )
-
     service = SubdomainService(db)
+    subdomain = await _get_activatable_subdomain(service, name, activate_request, current_user)
 
-    # Get subdomain by name
-    subdomain = await service.get_by_name(name.lower())
-    if not subdomain:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Subdomain '{name}' not found",
-        )
-
-    # Check ownership for non-admin users
-    if "admin" not in (current_user.roles or []) and subdomain.owner_id != current_user.id:
+    # A queued job finishing later would overwrite this activation
+    job = await pending_activation(db, subdomain.id)
+    if job is not None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied",
-        )
-
-    if subdomain.status == "suspended":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Subdomain is suspended",
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Activation {job.id} of '{subdomain.name}' is still in progress",
         )
 
     # Create or update DNS record
-    dns_service = get_dns_service()
     dns_record_id = subdomain.dns_record_id
 
     if dns_service:
         try:
-            if dns_record_id:
-                # Update existing record
-                await dns_service.update_a_record(dns_record_id, activate_request.ip_address)
-                logger.info(f"DNS record updated for {name}: {activate_request.ip_address}")
-            else:
-                # Create new record
-                dns_record_id = await dns_service.create_a_record(
-                    name.lower(), activate_request.ip_address
-                )
-                logger.info(f"DNS record created for {name}: {activate_request.ip_address}")
+            dns_record_id = await provision_dns(
+                dns_service,
+                name.lower(),
+                dns_record_id,
+                activate_request.ip_address,
+                zone=zone,
+                propagation_checker=propagation_checker,
+            )
+        except HetznerDNSUnavailableError as e:
+            logger.warning(f"DNS unavailable for {name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(max(1, round(e.retry_after)))},
+            ) from e
         except HetznerDNSError as e:
             logger.error(f"DNS error for {name}: {e}")
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail=f"Failed to update DNS record: {e!s}",
             ) from e
-        finally:
-            await dns_service.close()
 
     # Update subdomain
     update_data = SubdomainUpdate(
@@ -413,14 +642,21 @@ async def activate_subdomain(
     summary="Get subdomain DNS propagation status",
 )
 async def get_subdomain_status(
-    db: DbSession,
+    db: ReadDbSession,
     name: str,
     current_user: CurrentActiveUser,
+    dns_service: DNSService,
+    propagation_checker: PropagationChecker,
+    zone: DNSZone,
 ) -> PropagationStatus:
     """Check DNS propagation status for a subdomain.
 
     Returns the current status and whether the DNS record has propagated
-    to major DNS resolvers. Users can only check their own subdomains.
+    to major DNS resolvers, along with each resolver's answer, TTL and
+    latency. Results are cached briefly, so polling this endpoint does not
+    re-query the resolvers every time. The zone's own record comes from the
+    local zone mirror, without calling Hetzner. Users can only check their
+    own subdomains.
     """
     service = SubdomainService(db)
 
@@ -438,19 +674,175 @@ async def get_subdomain_status(
             detail="Access denied",
         )
 
-    propagation = {}
-    if subdomain.ip_address:
-        dns_service = get_dns_service()
-        if dns_service:
-            propagation = dns_service.check_propagation(name.lower(), subdomain.ip_address)
-            await dns_service.close()
+    zone_record = zone.lookup(subdomain.name) if zone else None
+
+    resolvers: list[ResolverStatus] = []
+    if subdomain.ip_address and dns_service and propagation_checker:
+        results = await propagation_checker.check(f"{subdomain.name}.{dns_service.DOMAIN}")
+        resolvers = [
+            ResolverStatus(
+                resolver=result.resolver,
+                propagated=result.resolves_to(subdomain.ip_address),
+                ips=list(result.ips),
+                ttl=result.ttl,
+                latency_ms=result.latency_ms,
+                error=result.error,
+            )
+            for result in results
+        ]
 
     return PropagationStatus(
         subdomain=subdomain.name,
         ip_address=subdomain.ip_address,
         status=subdomain.status,
         dns_record_id=subdomain.dns_record_id,
-        propagation=propagation,
+        propagation={r.resolver: r.propagated for r in resolvers},
+        resolvers=resolvers,
+        zone_ip_address=zone_record.value if zone_record else None,
+    )
+
+
+@router.post(
+    "/{name}/activations",
+    response_model=ActivationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Activate a subdomain in the background",
+)
+@limiter.limit("10/hour")
+async def start_activation(
+    request: Request,
+    response: Response,
+    db: DbSession,
+    name: str,
+    activate_request: SubdomainActivateRequest,
+    current_user: CurrentActiveUser,
+    worker: Activations,
+) -> ActivationJobRead:
+    """Accept an activation and provision DNS and the route in the background.
+
+    Validates the request, records an activation job in ``provisioning``
+    state and returns it at once, without waiting on Hetzner DNS. Poll the
+    job at the ``Location`` URL or stream its progress from ``/events``.
+    Repeating a request while its job is still provisioning returns that
+    job. Users can only activate their own subdomains.
+    """
+    service = SubdomainService(db)
+    subdomain = await _get_activatable_subdomain(service, name, activate_request, current_user)
+
+    job = await pending_activation(db, subdomain.id)
+    if job is None:
+        job = enqueue_activation(
+            db,
+            subdomain,
+            activate_request.ip_address,
+            activate_request.port,
+            requested_by_id=current_user.id,
+        )
+        await db.commit()
+        if worker is not None:
+            worker.wake()
+        logger.info(f"Activation {job.id} queued for {subdomain.name} by user {current_user.id}")
+    elif (job.ip_address, job.port) != (activate_request.ip_address, activate_request.port):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Activation {job.id} of '{subdomain.name}' is still in progress",
+        )
+
+    response.headers["Location"] = str(request.url_for("get_activation", job_id=job.id))
+    return _job_read(job)
+
+
+async def _get_visible_job(
+    db: DbSession, job_id: str, current_user: CurrentActiveUser
+) -> ActivationJob:
+    job = await db.get(ActivationJob, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Activation not found",
+        )
+
+    # Check ownership for non-admin users
+    if "admin" not in (current_user.roles or []) and job.requested_by_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+    return job
+
+
+@router.get(
+    "/activations/{job_id}",
+    response_model=ActivationJobRead,
+    summary="Get a background activation",
+)
+async def get_activation(
+    db: DbSession,
+    job_id: str,
+    current_user: CurrentActiveUser,
+) -> ActivationJobRead:
+    """Get the state of a background activation.
+
+    Reads the primary, not the replica, so polling right after the job was
+    queued or finished sees the latest state.
+    """
+    return _job_read(await _get_visible_job(db, job_id, current_user))
+
+
+@router.get(
+    "/activations/{job_id}/events",
+    summary="Stream a background activation's progress",
+    response_class=StreamingResponse,
+)
+async def stream_activation(
+    db: DbSession,
+    job_id: str,
+    current_user: CurrentActiveUser,
+    worker: Activations,
+) -> StreamingResponse:
+    """Stream job states as server-sent events until the job finishes.
+
+    Sends a ``status`` event with the job (as in ``GET /activations/{id}``)
+    now and whenever it changes, and ends once the job has succeeded or
+    failed, or after ``activation_events_timeout`` seconds.
+    """
+    job = await _get_visible_job(db, job_id, current_user)
+    if worker is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Background activation is not running",
+        )
+    # The request's session is only closed once the response has been sent;
+    # return its connection to the pool now rather than after the stream
+    await db.close()
+
+    async def events() -> AsyncIterator[str]:
+        current: ActivationJob | None = job
+        last_event = None
+        last_sent = started = time.monotonic()
+        while current is not None:
+            event = f"event: status\ndata: {_job_read(current).model_dump_json()}\n\n"
+            now = time.monotonic()
+            if event != last_event:
+                yield event
+                last_event, last_sent = event, now
+            elif now - last_sent >= 15:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = now
+            if (
+                current.status != PROVISIONING
+                or now - started >= settings.activation_events_timeout
+            ):
+                return
+            await asyncio.sleep(settings.activation_events_poll_interval)
+            # Each poll uses a short session of its own
+            current = await worker.get(job_id)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -463,6 +855,8 @@ async def release_subdomain(
     db: DbSession,
     name: str,
     current_user: CurrentActiveUser,
+    dns_service: DNSService,
+    zone: DNSZone,
 ) -> None:
     """Release a subdomain and delete its DNS record.
 
@@ -485,6 +879,11 @@ async def release_subdomain(
             detail="Access denied",
         )
 
+    # Stop pending activations, then pick up anything one finished meanwhile
+    if await cancel_activations(db, subdomain.id, "Subdomain was released"):
+        await db.commit()
+        await db.refresh(subdomain)
+
     # Delete Traefik route first
     from prisme_api.services.route_manager import get_route_manager
 
@@ -496,17 +895,15 @@ async def release_subdomain(
             logger.error(f"Failed to delete route for {name}: {e}")
 
     # Delete DNS record if exists
-    if subdomain.dns_record_id:
-        dns_service = get_dns_service()
-        if dns_service:
-            try:
-                await dns_service.delete_a_record(subdomain.dns_record_id)
-                logger.info(f"DNS record deleted for {name}")
-            except HetznerDNSError as e:
-                logger.error(f"Failed to delete DNS record for {name}: {e}")
-                # Continue with release even if DNS deletion fails
-            finally:
-                await dns_service.close()
+    if subdomain.dns_record_id and dns_service:
+        try:
+            await dns_service.delete_a_record(subdomain.dns_record_id)
+            if zone:
+                zone.record_deleted(subdomain.dns_record_id)
+            logger.info(f"DNS record deleted for {name}")
+        except HetznerDNSError as e:
+            logger.error(f"Failed to delete DNS record for {name}: {e}")
+            # Continue with release even if DNS deletion fails
 
     # Instead of deleting, update to released status with cooldown
     cooldown_days = 30
@@ -532,6 +929,8 @@ async def delete_subdomain(
     db: DbSession,
     id: int,
     current_user: CurrentActiveUser,
+    dns_service: DNSService,
+    zone: DNSZone,
     hard: Annotated[bool, Query(description="Permanently delete")] = False,
 ) -> None:
     """Delete a subdomain - users can only delete their own."""
@@ -551,19 +950,31 @@ async def delete_subdomain(
             detail="Access denied",
         )
 
+    if await cancel_activations(db, existing.id, "Subdomain was deleted"):
+        await db.commit()
+        await db.refresh(existing)
+
     # Delete DNS record if exists
-    if existing.dns_record_id:
-        dns_service = get_dns_service()
-        if dns_service:
-            try:
-                await dns_service.delete_a_record(existing.dns_record_id)
-                logger.info(f"DNS record deleted for subdomain {id}")
-            except HetznerDNSError as e:
-                logger.error(f"Failed to delete DNS record for subdomain {id}: {e}")
-            finally:
-                await dns_service.close()
+    if existing.dns_record_id and dns_service:
+        try:
+            await dns_service.delete_a_record(existing.dns_record_id)
+            if zone:
+                zone.record_deleted(existing.dns_record_id)
+            logger.info(f"DNS record deleted for subdomain {id}")
+        except HetznerDNSError as e:
+            logger.error(f"Failed to delete DNS record for subdomain {id}: {e}")
 
     await service.delete(id=id, soft=not hard)
 
 
-__all__ = ["router"]
+__all__ = [
+    "Activations",
+    "DNSService",
+    "DNSZone",
+    "PropagationChecker",
+    "get_activation_worker",
+    "get_dns_service",
+    "get_propagation_checker",
+    "get_zone_mirror",
+    "router",
+]
@@ -32,10 +32,30 @@ class AuthSettings(BaseSettings):
     email_from: str = "MadeWithPris.me <noreply@madewithpris.me>"
     frontend_url: str = "http://localhost:5173"
 
+    # Email delivery: "resend", "smtp://host:port" or "file:///dir"
+    # (see services/email_transport.py), sent from the outbox worker
+    email_transport: str = "resend"
+    email_outbox_concurrency: int = 4
+    email_outbox_batch_size: int = 20
+    email_outbox_poll_interval: float = 1.0
+    email_outbox_max_attempts: int = 8
+
     # Account lockout
     max_failed_login_attempts: int = 5
     lockout_duration_minutes: int = 15
 
+    # Authenticated-user cache (0 TTL disables). Invalidation is per worker,
+    # so the TTL bounds how long other workers serve a changed user
+    user_cache_max_size: int = 1024
+    user_cache_ttl_seconds: float = 5.0
+
+    # Email-domain allowlist snapshot (see services/email_domain_allowlist.py)
+    email_domain_allowlist_ttl_seconds: float = 30.0
+
+    # bcrypt worker pool (see auth/password_pool.py)
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+
     # Token expiry
     email_verification_token_hours: int = 24
     password_reset_token_hours: int = 1
@@ -44,6 +64,10 @@ class AuthSettings(BaseSettings):
     github_client_id: str = ""
     github_client_secret: str = ""
     github_redirect_uri: str = ""
+    github_oauth_timeout: float = 10.0
+    github_oauth_connect_timeout: float = 3.0
+    # Seconds an issued OAuth state stays valid (see auth/oauth_state.py)
+    oauth_state_ttl_seconds: float = 300.0
 
 
 @lru_cache
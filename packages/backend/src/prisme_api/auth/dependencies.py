@@ -15,6 +15,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from prisme_api.auth.config import auth_settings
+from prisme_api.auth.user_cache import user_cache
 from prisme_api.database import get_db
 from prisme_api.models.user import User
 
@@ -90,6 +91,10 @@ async def get_current_user(
 ) -> User:
     """Get current authenticated user from self-issued JWT session.
 
+    Hot sessions are served from the in-process user cache; the cached
+    snapshot is merged into ``db`` without a query so routes can still
+    modify and commit the returned user.
+
     Args:
         session_token: JWT session token from cookie
         db: Database session
@@ -114,12 +119,23 @@ async def get_current_user(
     except jwt.InvalidTokenError:
         raise credentials_exception from None
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
+    try:
+        uid = int(user_id)
+    except ValueError:
+        raise credentials_exception from None
+
+    cached = user_cache.get(uid)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    version = user_cache.version(uid)
+    result = await db.execute(select(User).where(User.id == uid))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise credentials_exception
 
+    user_cache.put(user, version)
     return user
 
 
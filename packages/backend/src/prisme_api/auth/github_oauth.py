@@ -0,0 +1,179 @@
+"""GitHub OAuth client.
+
+One pooled ``httpx.AsyncClient`` lives for the whole application (see
+``create_github_oauth_client``), so logins reuse keep-alive connections to
+github.com and api.github.com instead of paying TCP and TLS setup each time.
+After the code exchange, the profile and the email list are fetched
+concurrently, saving a full round trip per login.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import httpx
+
+from prisme_api.auth.config import auth_settings
+
+logger = logging.getLogger(__name__)
+
+GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
+GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
+GITHUB_USER_API = "https://api.github.com/user"
+GITHUB_EMAILS_API = "https://api.github.com/user/emails"
+
+
+class GitHubOAuthError(Exception):
+    """GitHub OAuth step failed.
+
+    Attributes:
+        code: Short error code passed to the frontend callback page.
+    """
+
+    def __init__(self, code: str, message: str | None = None) -> None:
+        super().__init__(message or code)
+        self.code = code
+
+
+@dataclass(frozen=True)
+class GitHubIdentity:
+    """The parts of a GitHub account used to sign in."""
+
+    github_id: str
+    login: str | None
+    email: str
+
+
+class GitHubOAuthClient:
+    """Exchanges OAuth codes and reads the signed-in GitHub user."""
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        redirect_uri: str,
+        *,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            client_id: GitHub OAuth app client ID.
+            client_secret: GitHub OAuth app client secret.
+            redirect_uri: Callback URL registered with the OAuth app.
+            timeout: Read/write/pool timeout for each request, in seconds.
+            connect_timeout: Connection setup timeout, in seconds.
+            max_connections: Maximum concurrent connections in the pool.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            transport: Custom httpx transport (tests use a fake GitHub).
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            headers={"Accept": "application/json"},
+            transport=transport,
+        )
+
+    async def exchange_code(self, code: str) -> str:
+        """Exchange an authorization code for an access token.
+
+        Raises:
+            GitHubOAuthError: ``token_exchange_failed`` or ``no_access_token``.
+        """
+        try:
+            response = await self._client.post(
+                GITHUB_TOKEN_URL,
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "code": code,
+                    "redirect_uri": self.redirect_uri,
+                },
+            )
+        except httpx.HTTPError as e:
+            raise GitHubOAuthError("token_exchange_failed", str(e)) from e
+        if response.status_code != 200:
+            logger.error(f"GitHub token exchange failed: {response.text}")
+            raise GitHubOAuthError("token_exchange_failed", response.text)
+
+        access_token = response.json().get("access_token")
+        if not access_token:
+            raise GitHubOAuthError("no_access_token")
+        return access_token
+
+    async def fetch_identity(self, access_token: str) -> GitHubIdentity:
+        """Fetch the user's profile and email list concurrently.
+
+        The profile email is used when public; otherwise the primary
+        verified address from the email list.
+
+        Raises:
+            GitHubOAuthError: ``github_user_failed`` or ``no_email``.
+        """
+        headers = {"Authorization": f"Bearer {access_token}"}
+        user_resp, emails_resp = await asyncio.gather(
+            self._client.get(GITHUB_USER_API, headers=headers),
+            self._client.get(GITHUB_EMAILS_API, headers=headers),
+            return_exceptions=True,
+        )
+        if isinstance(user_resp, BaseException) or user_resp.status_code != 200:
+            raise GitHubOAuthError("github_user_failed")
+        gh_user = user_resp.json()
+
+        email = gh_user.get("email")
+        if not email and isinstance(emails_resp, httpx.Response) and emails_resp.status_code == 200:
+            for em in emails_resp.json():
+                if em.get("primary") and em.get("verified"):
+                    email = em["email"]
+                    break
+        if not email:
+            raise GitHubOAuthError("no_email")
+
+        return GitHubIdentity(
+            github_id=str(gh_user.get("id", "")),
+            login=gh_user.get("login"),
+            email=email,
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP client connection."""
+        await self._client.aclose()
+
+
+def create_github_oauth_client() -> GitHubOAuthClient | None:
+    """Create the app-lifetime GitHub OAuth client if configured.
+
+    Called once from the application lifespan. Returns None when
+    GITHUB_CLIENT_ID is not set.
+    """
+    if not auth_settings.github_client_id:
+        return None
+    return GitHubOAuthClient(
+        auth_settings.github_client_id,
+        auth_settings.github_client_secret,
+        auth_settings.github_redirect_uri,
+        timeout=auth_settings.github_oauth_timeout,
+        connect_timeout=auth_settings.github_oauth_connect_timeout,
+    )
+
+
+__all__ = [
+    "GITHUB_AUTHORIZE_URL",
+    "GitHubIdentity",
+    "GitHubOAuthClient",
+    "GitHubOAuthError",
+    "create_github_oauth_client",
+]
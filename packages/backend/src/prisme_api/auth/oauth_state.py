@@ -0,0 +1,140 @@
+"""Store for OAuth CSRF ``state`` values.
+
+The GitHub login redirect issues a random state and the callback must find
+it again exactly once. With several uvicorn workers the callback usually
+lands on a different process than the login, so production uses the Redis
+store, where the state is consumed with an atomic ``GETDEL``. The in-memory
+store remains for single-process development; it expires states through a
+min-heap ordered by expiry, so cleanup costs O(log n) per expired state
+instead of a scan over every pending login.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OAuthStateStore(ABC):
+    """Issued-but-unused OAuth states with a fixed time to live."""
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def add(self, state: str) -> None:
+        """Remember a newly issued state."""
+
+    @abstractmethod
+    async def consume(self, state: str) -> bool:
+        """Remove ``state`` and return True if it was issued and has not expired.
+
+        A state can be consumed only once, even by concurrent callbacks.
+        """
+
+    async def close(self) -> None:
+        """Release connections held by the store."""
+        return None
+
+
+class MemoryOAuthStateStore(OAuthStateStore):
+    """Per-process store; only suitable for a single worker."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            ttl_seconds: Seconds a state stays valid.
+            clock: Monotonic time source (injectable for tests).
+        """
+        super().__init__(ttl_seconds)
+        self._clock = clock
+        self._states: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _expire(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, state = heapq.heappop(heap)
+            # Consumed states stay in the heap; skip those
+            if self._states.get(state) == expires_at:
+                del self._states[state]
+
+    async def add(self, state: str) -> None:
+        now = self._clock()
+        self._expire(now)
+        expires_at = now + self.ttl_seconds
+        self._states[state] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, state))
+
+    async def consume(self, state: str) -> bool:
+        now = self._clock()
+        self._expire(now)
+        expires_at = self._states.pop(state, None)
+        return expires_at is not None and expires_at > now
+
+
+class RedisOAuthStateStore(OAuthStateStore):
+    """Store shared by every worker through Redis key expiry."""
+
+    KEY_PREFIX = "oauth_state:"
+
+    def __init__(self, url: str, ttl_seconds: float = 300.0) -> None:
+        """Initialize the store; Redis is connected to on first use.
+
+        Args:
+            url: Redis URL, e.g. ``redis://redis:6379/0``.
+            ttl_seconds: Seconds a state stays valid.
+        """
+        super().__init__(ttl_seconds)
+        self._redis = Redis.from_url(url)
+
+    async def add(self, state: str) -> None:
+        await self._redis.set(
+            self.KEY_PREFIX + state, b"1", ex=max(1, round(self.ttl_seconds)), nx=True
+        )
+
+    async def consume(self, state: str) -> bool:
+        return await self._redis.getdel(self.KEY_PREFIX + state) is not None
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_oauth_state_store() -> OAuthStateStore:
+    """Create the OAuth state store: Redis when ``REDIS_URL`` is set."""
+    ttl_seconds = auth_settings.oauth_state_ttl_seconds
+    if settings.redis_url:
+        return RedisOAuthStateStore(settings.redis_url, ttl_seconds=ttl_seconds)
+    logger.info("REDIS_URL not set - OAuth states are kept in process memory")
+    return MemoryOAuthStateStore(ttl_seconds=ttl_seconds)
+
+
+# Singleton instance
+oauth_state_store = create_oauth_state_store()
+
+
+__all__ = [
+    "MemoryOAuthStateStore",
+    "OAuthStateStore",
+    "RedisOAuthStateStore",
+    "create_oauth_state_store",
+    "oauth_state_store",
+]
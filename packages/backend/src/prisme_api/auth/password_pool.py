@@ -0,0 +1,133 @@
+"""Bounded worker pool for bcrypt hashing.
+
+bcrypt is deliberately slow (~200-300 ms per hash), and running it inline in
+an async route blocks the event loop for every other request on the worker.
+The pool runs hashing on a dedicated, size-limited thread pool (bcrypt
+releases the GIL while hashing) and rejects work once too many calls are
+waiting, so a login burst degrades into fast 503s instead of a stalled
+worker. Queue depth and rejections are exported as the
+``password_hash_in_flight``, ``password_hash_queued`` and
+``password_hash_rejected_total`` metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.metrics import (
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUED,
+    PASSWORD_HASH_REJECTED,
+)
+
+
+class PasswordHashPoolSaturatedError(Exception):
+    """Raised when the hashing pool has no room for more work."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class PasswordHashPoolStats:
+    """Point-in-time pool counters."""
+
+    workers: int
+    max_queue: int
+    in_flight: int
+    queued: int
+    completed: int
+    rejected: int
+
+
+class PasswordHashPool:
+    """Size-limited executor with queue-depth tracking and backpressure."""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Number of hashing threads.
+            max_queue: Calls allowed to wait for a free thread before new
+                calls are rejected with PasswordHashPoolSaturatedError.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="bcrypt",
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool.
+
+        Raises:
+            PasswordHashPoolSaturatedError: If all workers are busy and the
+                wait queue is full.
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHashPoolSaturatedError("Password hashing pool is saturated")
+
+        self._set_pending(self._pending + 1)
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._set_pending(self._pending - 1)
+        self._completed += 1
+        return result
+
+    def _set_pending(self, pending: int) -> None:
+        # Calls beyond max_workers wait in the executor's queue
+        previous_in_flight = min(self._pending, self.max_workers)
+        in_flight = min(pending, self.max_workers)
+        PASSWORD_HASH_IN_FLIGHT.inc(in_flight - previous_in_flight)
+        PASSWORD_HASH_QUEUED.inc((pending - in_flight) - (self._pending - previous_in_flight))
+        self._pending = pending
+
+    def stats(self) -> PasswordHashPoolStats:
+        """Return queue depth and throughput counters."""
+        in_flight = min(self._pending, self.max_workers)
+        return PasswordHashPoolStats(
+            workers=self.max_workers,
+            max_queue=self.max_queue,
+            in_flight=in_flight,
+            queued=self._pending - in_flight,
+            completed=self._completed,
+            rejected=self._rejected,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (waits for running hashes)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Singleton instance
+password_hash_pool = PasswordHashPool(
+    max_workers=auth_settings.password_hash_workers,
+    max_queue=auth_settings.password_hash_max_queue,
+)
+
+
+__all__ = [
+    "PasswordHashPool",
+    "PasswordHashPoolSaturatedError",
+    "PasswordHashPoolStats",
+    "password_hash_pool",
+]
@@ -0,0 +1,199 @@
+"""In-process cache of authenticated users.
+
+Every authenticated request resolves its user in ``get_current_user``. Hot
+sessions (dashboard polling) would otherwise load the same ``users`` row on
+every call, so this module keeps a bounded, TTL-limited cache of detached
+user snapshots keyed by user id.
+
+Each cached entry carries the cache *version* of its user at the time the
+row was read. ``invalidate`` bumps the version, so a load that raced with a
+write can never repopulate the cache with the pre-write row.
+
+The cache and its versions are per process. Invalidation is not broadcast
+to other uvicorn workers, so after a role removal, deactivation, password
+reset or MFA change another worker may keep serving the old user for up to
+``user_cache_ttl_seconds``. That TTL is the security bound of the cache and
+defaults to a few seconds: enough to absorb polling bursts, short enough
+that a revoked user is locked out almost at once.
+
+Hits and misses are exported as ``user_cache_lookups_total``.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.metrics import USER_CACHE_INVALIDATIONS, USER_CACHE_LOOKUPS
+from prisme_api.models.user import User
+
+
+@dataclass(frozen=True)
+class UserCacheStats:
+    """Point-in-time cache counters."""
+
+    hits: int
+    misses: int
+    invalidations: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    version: int
+    user: User
+    expires_at: float
+
+
+def _snapshot(user: User) -> User:
+    """Build a detached copy of a user holding only its column values."""
+    data = {attr.key: copy.deepcopy(getattr(user, attr.key)) for attr in inspect(User).column_attrs}
+    snapshot = User(**data)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+class UserCache:
+    """Bounded LRU + TTL cache of detached ``User`` snapshots."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached users (LRU eviction).
+            ttl_seconds: Lifetime of an entry, and so the longest another
+                worker may serve a changed user. ``0`` disables the cache.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        # Last version handed out per invalidated user. Bounded like the
+        # entries: only loads still in flight can observe an old version.
+        self._versions: OrderedDict[int, int] = OrderedDict()
+        self._counter = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def version(self, user_id: int) -> int:
+        """Return the current version of a user.
+
+        Read this *before* querying the database and pass it to ``put`` so a
+        concurrent invalidation discards the (possibly stale) result.
+        """
+        return self._versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> User | None:
+        """Return the cached snapshot for a user, or None on a miss.
+
+        The returned object is detached; callers attach it to their session
+        with ``AsyncSession.merge(user, load=False)``.
+        """
+        entry = self._entries.get(user_id)
+        if (
+            entry is None
+            or entry.expires_at <= self._clock()
+            or entry.version != self.version(user_id)
+        ):
+            if entry is not None:
+                del self._entries[user_id]
+            self._misses += 1
+            USER_CACHE_LOOKUPS.labels("miss").inc()
+            return None
+
+        self._entries.move_to_end(user_id)
+        self._hits += 1
+        USER_CACHE_LOOKUPS.labels("hit").inc()
+        return entry.user
+
+    def put(self, user: User, version: int) -> None:
+        """Cache a freshly loaded user.
+
+        Args:
+            user: User loaded from the database.
+            version: Result of ``version(user.id)`` taken before the query.
+        """
+        if not self.enabled or version != self.version(user.id):
+            return
+
+        self._entries[user.id] = _Entry(
+            version=version,
+            user=_snapshot(user),
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user and bump its version.
+
+        Call this whenever an auth-relevant field of the user changes
+        (password, lockout, MFA, roles, active flag, deletion).
+        """
+        self._counter += 1
+        self._versions[user_id] = self._counter
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > max(self.max_size, 1) * 4:
+            self._versions.popitem(last=False)
+        self._entries.pop(user_id, None)
+        self._invalidations += 1
+        USER_CACHE_INVALIDATIONS.inc()
+
+    def invalidate_many(self, user_ids: list[int]) -> None:
+        """Invalidate several users at once."""
+        for user_id in user_ids:
+            self.invalidate(user_id)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+
+    def stats(self) -> UserCacheStats:
+        """Return hit/miss counters and current size."""
+        return UserCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            evictions=self._evictions,
+            size=len(self._entries),
+        )
+
+
+# Singleton instance
+user_cache = UserCache(
+    max_size=auth_settings.user_cache_max_size,
+    ttl_seconds=auth_settings.user_cache_ttl_seconds,
+)
+
+
+__all__ = ["UserCache", "UserCacheStats", "user_cache"]
@@ -11,6 +11,8 @@ import secrets
 import bcrypt
 import pyotp
 
+from prisme_api.auth.password_pool import password_hash_pool
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
@@ -22,6 +24,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt worker pool.
+
+    Raises:
+        PasswordHashPoolSaturatedError: If the pool is saturated.
+    """
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool.
+
+    Raises:
+        PasswordHashPoolSaturatedError: If the pool is saturated.
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
 def validate_password_strength(password: str) -> str | None:
     """Validate password strength. Returns error message or None if valid."""
     if len(password) < 8:
@@ -20,6 +20,29 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./data.db"
 
+    # Database pool (see db_pool.py). Pool size and overflow default per
+    # environment, sized for 4 uvicorn workers.
+    db_pool_size: int | None = None
+    db_max_overflow: int | None = None
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg prepared statements (0 behind PgBouncer in transaction mode)
+    db_statement_cache_size: int = 100
+    db_statement_timeout_ms: int = 30_000
+    # Extra asyncpg server_settings, e.g. {"idle_in_transaction_session_timeout": "60000"}
+    db_server_settings: dict[str, str] = {}
+    db_sqlite_busy_timeout_ms: int = 5000
+
+    # Read replica (DATABASE_READ_URL): after a write, a client's reads stay
+    # on the primary for this long
+    read_your_writes_seconds: float = 5.0
+
+    # Debug mode: warn when a request runs more SQL statements than this, or
+    # one statement this many times (likely N+1), see middleware/query_budget.py
+    query_budget: int | None = 25
+    query_repeat_threshold: int = 5
+
     # API
     secret_key: str = "change-me-in-production"
     debug: bool = False
@@ -28,6 +51,61 @@ class Settings(BaseSettings):
     base_domain: str = "madewithpris.me"  # Production domain on GoDaddy
     environment: str = "development"
 
+    # Hetzner DNS client pool
+    hetzner_dns_max_connections: int = 20
+    hetzner_dns_max_keepalive_connections: int = 10
+    hetzner_dns_keepalive_expiry: float = 30.0
+    hetzner_dns_http2: bool = True
+    hetzner_dns_timeout: float = 30.0
+    # Bulk record operations: records per request, concurrent requests
+    hetzner_dns_bulk_chunk_size: int = 100
+    hetzner_dns_bulk_concurrency: int = 4
+    # Retries of 429/5xx/transport errors (jittered exponential backoff, at
+    # least Retry-After), and the circuit breaker that fails fast after
+    # this many consecutive failures, for reset_timeout seconds
+    hetzner_dns_max_retries: int = 3
+    hetzner_dns_retry_base_delay: float = 0.5
+    hetzner_dns_retry_max_delay: float = 10.0
+    hetzner_dns_breaker_threshold: int = 5
+    hetzner_dns_breaker_reset_timeout: float = 30.0
+    # Zone mirror (see services/dns_zone.py): full-zone reconcile every N
+    # seconds (0 disables). Drift is only logged; dns_zone_repair opts in to
+    # creating, updating and deleting records
+    dns_zone_reconcile_interval: float = 900.0
+    dns_zone_repair: bool = False
+    dns_zone_page_size: int = 100
+    # Rows changed this recently are not repaired (an activation may be
+    # between its DNS write and its commit); also the re-check delay
+    dns_zone_settle_seconds: float = 5.0
+
+    # Background activations (see services/activation.py): jobs provisioned
+    # at once, idle poll interval, attempts and backoff between them
+    activation_concurrency: int = 4
+    activation_poll_interval: float = 1.0
+    activation_max_attempts: int = 6
+    activation_retry_base_delay: float = 2.0
+    activation_retry_max_delay: float = 300.0
+    # Activation event streams re-read the job this often, and end after
+    activation_events_poll_interval: float = 0.5
+    activation_events_timeout: float = 300.0
+
+    # DNS propagation checks (resolvers as "host" or "host:port")
+    dns_propagation_resolvers: list[str] = [
+        "1.1.1.1",  # Cloudflare
+        "8.8.8.8",  # Google
+        "213.133.100.98",  # Hetzner
+    ]
+    dns_propagation_timeout: float = 2.0
+    dns_propagation_cache_ttl: float = 10.0
+
+    # Redis (shared state between workers)
+    redis_url: str = ""
+
+    # Rate limiting: "sqlite:///path.db" shares counters between the workers
+    # of one host, "redis://..." across hosts. Empty uses redis_url if set.
+    rate_limit_storage_uri: str = ""
+    rate_limit_strategy: str = "sliding-window-counter"
+
     # Email (Resend)
     resend_api_key: str = ""
     email_from: str = "MadeWithPris.me <noreply@madewithpris.me>"
@@ -1,32 +1,67 @@
 """Async database configuration.
 
 ⚠️ AUTO-GENERATED BY PRISM - DO NOT EDIT
+
+Reads can optionally go to a replica (``DATABASE_READ_URL``) through
+``get_read_db``. Read-your-writes: a request that has written anything
+through the ORM, and every request from a client carrying a fresh
+``READ_YOUR_WRITES_COOKIE`` (set by ``ReadYourWritesMiddleware`` after a
+write), is served from the primary instead.
 """
 
 from __future__ import annotations
 
 import os
+import time
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
+from typing import Annotated, Any
+
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .config import settings
+from .db_pool import engine_options, install_sqlite_pragmas
+
+
+def _async_url(url: str) -> str:
+    # Convert postgresql:// to postgresql+asyncpg:// for async support
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    # Pool and driver options from settings, see db_pool.py; ``name`` labels
+    # the pool's metrics
+    new_engine = create_async_engine(
+        url,
+        echo=os.environ.get("DEBUG", "").lower() == "true",
+        pool_logging_name=name,
+        **engine_options(url, settings),
+    )
+    if url.startswith("sqlite"):
+        install_sqlite_pragmas(new_engine)
+    return new_engine
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # Get database URL from environment
-_raw_url = os.environ.get(
-    "DATABASE_URL",
-    "sqlite+aiosqlite:///:memory:",
+DATABASE_URL = _async_url(
+    os.environ.get(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///:memory:",
+    )
 )
 
-# Convert postgresql:// to postgresql+asyncpg:// for async support
-if _raw_url.startswith("postgresql://"):
-    DATABASE_URL = _raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-else:
-    DATABASE_URL = _raw_url
-
 # Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=os.environ.get("DEBUG", "").lower() == "true",
-)
+engine = _create_engine(DATABASE_URL, "primary")
 
 # Session factory
 async_session = async_sessionmaker(
@@ -35,6 +70,19 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Optional read replica; without one every read goes to the primary
+READ_DATABASE_URL = _async_url(os.environ.get("DATABASE_READ_URL", "")) or None
+
+read_engine: AsyncEngine | None = None
+async_read_session: async_sessionmaker[AsyncSession] | None = None
+if READ_DATABASE_URL:
+    read_engine = _create_engine(READ_DATABASE_URL, "replica")
+    async_read_session = async_sessionmaker(
+        read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
 
 async def get_db() -> AsyncGenerator[AsyncSession]:
     """Get async database session."""
@@ -42,4 +90,108 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
         yield session
 
 
-__all__ = ["async_session", "engine", "get_db"]
+# ── Read-your-writes ────────────────────────────────────────────
+
+READ_YOUR_WRITES_COOKIE = "prisme_primary_until"
+
+
+class WriteTracker:
+    """Whether the current request has written to the database."""
+
+    __slots__ = ("wrote",)
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+_write_tracker: ContextVar[WriteTracker | None] = ContextVar("db_write_tracker", default=None)
+
+# Process-wide pin for callers without a request (MCP tools)
+_primary_until = 0.0
+
+
+def track_writes() -> WriteTracker:
+    """Start tracking writes for the current request (see the middleware)."""
+    tracker = WriteTracker()
+    _write_tracker.set(tracker)
+    return tracker
+
+
+def wrote_in_request() -> bool:
+    """Whether the current request has flushed or executed a write."""
+    tracker = _write_tracker.get()
+    return tracker is not None and tracker.wrote
+
+
+def _mark_write() -> None:
+    tracker = _write_tracker.get()
+    if tracker is not None:
+        tracker.wrote = True
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    _mark_write()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        _mark_write()
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """Whether reads for this request must see the primary."""
+    if wrote_in_request():
+        return True
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, "")) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncGenerator[AsyncSession]:
+    """Get a session for read-only endpoints.
+
+    Uses the replica when one is configured, unless the request is pinned
+    to the primary (``pinned_to_primary``); then the request's primary
+    session is returned.
+    """
+    if async_read_session is None or pinned_to_primary(request):
+        yield db
+        return
+    async with async_read_session() as session:
+        yield session
+
+
+def pin_primary(seconds: float = settings.read_your_writes_seconds) -> None:
+    """Send ``read_session`` reads to the primary for the next ``seconds``."""
+    global _primary_until
+    _primary_until = max(_primary_until, time.monotonic() + seconds)
+
+
+def read_session() -> AsyncSession:
+    """Create a read session outside a request (replica unless pinned)."""
+    if async_read_session is None or time.monotonic() < _primary_until:
+        return async_session()
+    return async_read_session()
+
+
+__all__ = [
+    "READ_YOUR_WRITES_COOKIE",
+    "WriteTracker",
+    "async_read_session",
+    "async_session",
+    "engine",
+    "get_db",
+    "get_read_db",
+    "pin_primary",
+    "pinned_to_primary",
+    "read_engine",
+    "read_session",
+    "track_writes",
+    "wrote_in_request",
+]
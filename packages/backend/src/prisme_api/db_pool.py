@@ -0,0 +1,223 @@
+"""Engine and connection-pool configuration.
+
+``engine_options`` turns ``Settings`` into keyword arguments for
+``create_async_engine``:
+
+- PostgreSQL (asyncpg) gets a sized queue pool, ``pool_recycle`` and
+  ``pool_pre_ping``, asyncpg's prepared-statement cache size and
+  ``server_settings`` such as ``statement_timeout``. Unless overridden, the
+  pool size follows ``POOL_DEFAULTS`` for the current environment. Those are
+  sized for ``uvicorn --workers 4``: 4 x (pool_size + max_overflow) stays
+  below PostgreSQL's default ``max_connections`` of 100, leaving room for
+  migrations, the outbox worker and psql sessions.
+- SQLite gets WAL journaling and the pragmas in ``SQLITE_PRAGMAS`` on every
+  new connection (``install_sqlite_pragmas``).
+
+File-backed databases use ``InstrumentedQueuePool``, which records how long
+each checkout waited for a connection and how often it timed out.
+``pool_stats`` returns those counters together with the pool's current
+size and overflow, and the same figures are exported as ``db_pool_*``
+Prometheus metrics labelled with the engine's ``pool_logging_name``, so
+pool exhaustion under load is visible.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from prisme_api.config import Settings
+from prisme_api.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+)
+
+logger = logging.getLogger(__name__)
+
+# (pool_size, max_overflow) per worker, for 4 uvicorn workers
+POOL_DEFAULTS: dict[str, tuple[int, int]] = {
+    "production": (10, 10),
+    "staging": (5, 5),
+    "development": (5, 5),
+}
+
+# Applied to every new SQLite connection
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    # Durable at checkpoints; safe with WAL and much faster than FULL
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    # Negative values are KiB: 64 MiB page cache
+    "cache_size": -64_000,
+}
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time connection pool counters."""
+
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+    @property
+    def wait_seconds_avg(self) -> float:
+        """Mean time a checkout waited for a connection."""
+        return self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait times and timeouts."""
+
+    # Checkouts slower than this are logged
+    slow_checkout_seconds = 1.0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def _metrics_name(self) -> str:
+        return self.logging_name or "default"
+
+    def _report_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self._metrics_name).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self._metrics_name).set(max(self.overflow(), 0))
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self._report_usage()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            DB_POOL_TIMEOUTS.labels(self._metrics_name).inc()
+            logger.error(
+                f"Database pool exhausted: {self.checkedout()} connections checked out, "
+                f"overflow {self.overflow()}"
+            )
+            raise
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        DB_POOL_CHECKOUT_WAIT.labels(self._metrics_name).observe(waited)
+        self._report_usage()
+        if waited >= self.slow_checkout_seconds:
+            logger.warning(f"Waited {waited:.2f}s for a database connection")
+        return connection
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+def engine_options(url: str, settings: Settings) -> dict[str, Any]:
+    """Build ``create_async_engine`` keyword arguments for ``url``.
+
+    Args:
+        url: The async database URL.
+        settings: Application settings.
+
+    Returns:
+        Keyword arguments (excluding the URL).
+    """
+    options: dict[str, Any] = {}
+
+    if _is_sqlite(url):
+        # In-memory databases keep SQLAlchemy's single-connection pool
+        if not _is_memory_sqlite(url):
+            options["poolclass"] = InstrumentedQueuePool
+        options["connect_args"] = {"timeout": settings.db_sqlite_busy_timeout_ms / 1000}
+        return options
+
+    default_size, default_overflow = POOL_DEFAULTS.get(
+        settings.environment, POOL_DEFAULTS["development"]
+    )
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size if settings.db_pool_size is not None else default_size,
+        max_overflow=(
+            settings.db_max_overflow if settings.db_max_overflow is not None else default_overflow
+        ),
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+    if url.startswith("postgresql+asyncpg"):
+        server_settings = {"application_name": "prisme-api"}
+        if settings.db_statement_timeout_ms:
+            server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+        server_settings.update(settings.db_server_settings)
+        options["connect_args"] = {
+            # asyncpg's own cache and SQLAlchemy's adapter cache; both must be
+            # 0 behind PgBouncer in transaction mode
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": server_settings,
+        }
+
+    return options
+
+
+def install_sqlite_pragmas(engine: AsyncEngine) -> None:
+    """Apply ``SQLITE_PRAGMAS`` to every new connection of a SQLite engine."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    """Return counters for ``engine``'s pool, or None if it isn't instrumented."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return None
+    return PoolStats(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.checkouts,
+        timeouts=pool.timeouts,
+        wait_seconds_total=pool.wait_seconds_total,
+        wait_seconds_max=pool.wait_seconds_max,
+    )
+
+
+__all__ = [
+    "POOL_DEFAULTS",
+    "SQLITE_PRAGMAS",
+    "InstrumentedQueuePool",
+    "PoolStats",
+    "engine_options",
+    "install_sqlite_pragmas",
+    "pool_stats",
+]
@@ -8,12 +8,25 @@ from __future__ import annotations
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from .auth.github_oauth import create_github_oauth_client
+from .auth.oauth_state import oauth_state_store
+from .auth.password_pool import password_hash_pool
 from .config import settings
-from .database import engine
+from .database import async_session, engine, read_engine
+from .db_pool import pool_stats
+from .metrics import MetricsMiddleware, mark_process_dead, metrics_response
+from .middleware.query_budget import QueryBudgetMiddleware
+from .middleware.read_your_writes import ReadYourWritesMiddleware
+from .services.activation import create_activation_worker
+from .services.dns_propagation import create_propagation_checker
+from .services.dns_zone import create_zone_reconciler
+from .services.email_outbox import create_email_outbox_worker
+from .services.hetzner_dns import create_dns_service
 
 # Import routers - uses relative imports within the package
 try:
@@ -43,9 +56,46 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
             await conn.run_sync(Base.metadata.create_all)
     except ImportError:
         logging.warning("Models not found. Run 'prism generate' to generate code from your spec.")
+
+    # Long-lived outbound clients, shared by all requests
+    app.state.dns_service = create_dns_service()
+    app.state.dns_propagation = create_propagation_checker()
+    app.state.github_oauth = create_github_oauth_client()
+
+    # In-memory copy of the DNS zone, reconciled with the subdomains periodically
+    app.state.dns_zone = create_zone_reconciler(app.state.dns_service, async_session)
+    if app.state.dns_zone is not None:
+        app.state.dns_zone.start()
+
+    # Provisions DNS and routes for activations accepted with 202
+    app.state.activation_worker = create_activation_worker(
+        async_session,
+        app.state.dns_service,
+        zone=app.state.dns_zone.mirror if app.state.dns_zone is not None else None,
+        propagation_checker=app.state.dns_propagation,
+    )
+    app.state.activation_worker.start()
+
+    # Delivers queued transactional emails in the background
+    app.state.email_outbox = create_email_outbox_worker(async_session)
+    app.state.email_outbox.start()
+
     yield
     # Shutdown
+    await app.state.email_outbox.stop()
+    await app.state.activation_worker.stop()
+    if app.state.dns_zone is not None:
+        await app.state.dns_zone.stop()
+    if app.state.dns_service is not None:
+        await app.state.dns_service.close()
+    if app.state.github_oauth is not None:
+        await app.state.github_oauth.close()
+    await oauth_state_store.close()
+    password_hash_pool.shutdown()
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+    mark_process_dead()
 
 
 app = FastAPI(
@@ -64,6 +114,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep a client's reads on the primary right after it writes (no-op without a replica)
+app.add_middleware(ReadYourWritesMiddleware, pin_seconds=settings.read_your_writes_seconds)
+
+# Report per-request SQL statement counts and likely N+1 queries while debugging
+if settings.debug:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        budget=settings.query_budget,
+        repeat_threshold=settings.query_repeat_threshold,
+    )
+
+# Per-route request, query and latency metrics, exposed at /metrics
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/health")
 async def health_check():
@@ -71,6 +135,21 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+async def db_pool_health():
+    """Connection pool counters (checkout waits, timeouts, overflow)."""
+    stats = pool_stats(engine)
+    if stats is None:
+        return {"pool": None}
+    return {"pool": {**asdict(stats), "wait_seconds_avg": stats.wait_seconds_avg}}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics (all workers when PROMETHEUS_MULTIPROC_DIR is set)."""
+    return metrics_response(request)
+
+
 # Include routers if generated
 if HAS_REST:
     app.include_router(rest_router, prefix="/api")
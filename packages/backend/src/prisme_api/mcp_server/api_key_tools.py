@@ -12,7 +12,7 @@ from typing import Any
 from fastmcp import FastMCP
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from prisme_api.database import async_session
+from prisme_api.database import async_session, pin_primary, read_session
 from prisme_api.schemas.api_key import APIKeyCreate, APIKeyUpdate
 from prisme_api.services.api_key import APIKeyService
 
@@ -27,6 +27,15 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+    # Keep the following reads on the primary until the replica catches up
+    pin_primary()
+
+
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[AsyncSession]:
+    """Get read-only database session for MCP tools (replica if configured)."""
+    async with read_session() as session:
+        yield session
 
 
 def register_api_key_tools(mcp: FastMCP) -> None:
@@ -45,7 +54,7 @@ def register_api_key_tools(mcp: FastMCP) -> None:
         Returns:
             Dictionary with items, total count, and pagination info.
         """
-        async with get_db() as db:
+        async with get_read_db() as db:
             service = APIKeyService(db)
             skip = (page - 1) * min(page_size, 100)
             limit = min(page_size, 100)
@@ -72,7 +81,7 @@ def register_api_key_tools(mcp: FastMCP) -> None:
         Returns:
             The api_key data or None if not found.
         """
-        async with get_db() as db:
+        async with get_read_db() as db:
             service = APIKeyService(db)
             result = await service.get(id)
             if result is None:
@@ -12,7 +12,7 @@ from typing import Any
 from fastmcp import FastMCP
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from prisme_api.database import async_session
+from prisme_api.database import async_session, pin_primary, read_session
 from prisme_api.schemas.user import UserCreate, UserFilter, UserUpdate
 from prisme_api.services.user import UserService
 
@@ -27,6 +27,15 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+    # Keep the following reads on the primary until the replica catches up
+    pin_primary()
+
+
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[AsyncSession]:
+    """Get read-only database session for MCP tools (replica if configured)."""
+    async with read_session() as session:
+        yield session
 
 
 def register_user_tools(mcp: FastMCP) -> None:
@@ -49,7 +58,7 @@ def register_user_tools(mcp: FastMCP) -> None:
         Returns:
             Dictionary with items, total count, and pagination info.
         """
-        async with get_db() as db:
+        async with get_read_db() as db:
             service = UserService(db)
             skip = (page - 1) * min(page_size, 100)
             limit = min(page_size, 100)
@@ -84,7 +93,7 @@ def register_user_tools(mcp: FastMCP) -> None:
         Returns:
             The user data or None if not found.
         """
-        async with get_db() as db:
+        async with get_read_db() as db:
             service = UserService(db)
             result = await service.get(id)
             if result is None:
@@ -0,0 +1,306 @@
+"""Prometheus metrics.
+
+``MetricsMiddleware`` records request counts, latency histograms and
+in-flight requests per route template (``/api/subdomains/{id}``, not the
+raw path). SQLAlchemy cursor events attribute every query and its duration
+to the route that issued it, so ``/metrics`` shows which endpoints drive
+database load. Outbound calls to Hetzner DNS (``InstrumentedTransport``)
+and Resend (``observe_outbound``) are counted and timed as well, along with
+retries and circuit breaker state (see ``resilience.py``).
+
+Multi-worker: when ``PROMETHEUS_MULTIPROC_DIR`` is set, prometheus_client
+writes samples to per-process files in that directory and ``/metrics``
+aggregates all workers. The directory must exist and be emptied before
+uvicorn starts (see ``Dockerfile.backend.prod``). Without it, each process
+reports only its own counters.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Route label for requests that matched no route (keeps cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+# Route label for queries issued outside a request (outbox worker, startup)
+NO_ROUTE = "<background>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed, by the route that issued them.",
+    ["route", "operation"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time, by the route that issued it.",
+    ["route"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["pool"],
+    buckets=(*QUERY_BUCKETS, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up because the pool was exhausted.",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+OUTBOUND_REQUESTS = Counter(
+    "outbound_requests_total",
+    "Calls to third-party APIs; status is the HTTP code or 'error'.",
+    ["service", "method", "status"],
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of calls to third-party APIs.",
+    ["service"],
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOUND_RETRIES = Counter(
+    "outbound_retries_total",
+    "Retried calls to third-party APIs; reason is the HTTP code or 'error'.",
+    ["service", "reason"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state per upstream: 0 closed, 1 half-open, 2 open.",
+    ["service"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by the state entered.",
+    ["service", "state"],
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "bcrypt calls running on the hashing pool.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued",
+    "bcrypt calls waiting for a free hashing thread.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "bcrypt calls rejected because the hashing pool was saturated.",
+)
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups_total",
+    "Authenticated-user cache lookups, by result (hit or miss).",
+    ["result"],
+)
+USER_CACHE_INVALIDATIONS = Counter(
+    "user_cache_invalidations_total",
+    "Users dropped from the authenticated-user cache after a change.",
+)
+
+# ASGI scope of the request being handled; the router stores the matched
+# route in it, so queries can be attributed after routing
+_current_scope: ContextVar[Scope | None] = ContextVar("metrics_scope", default=None)
+
+
+def route_label(scope: Scope | None) -> str:
+    """Route template for a request scope, e.g. ``/api/subdomains/{id}``."""
+    if scope is None:
+        return NO_ROUTE
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    # Routes of an included router may carry only their own path; the
+    # router prefixes (static in this app) are the leading segments of the
+    # request path
+    segments = scope["path"].split("/")
+    own = len(template.split("/")) - 1
+    if ":path}" in template or own >= len(segments):
+        return template
+    return "/".join(segments[:-own]) + template
+
+
+class MetricsMiddleware:
+    """Record per-route request metrics."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        token = _current_scope.set(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.labels(method).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_IN_FLIGHT.labels(method).dec()
+            _current_scope.reset(token)
+
+
+# ── Database ────────────────────────────────────────────────────
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    route = route_label(_current_scope.get())
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        operation = "OTHER"
+    DB_QUERIES.labels(route, operation).inc()
+    DB_QUERY_LATENCY.labels(route).observe(elapsed)
+
+
+# ── Outbound calls ──────────────────────────────────────────────
+
+
+@contextmanager
+def observe_outbound(service: str, method: str) -> Iterator[None]:
+    """Count and time a third-party call that has no HTTP status to report."""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        OUTBOUND_LATENCY.labels(service).observe(time.perf_counter() - start)
+        OUTBOUND_REQUESTS.labels(service, method, status).inc()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport wrapper that records ``outbound_*`` metrics."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, service: str) -> None:
+        self._transport = transport
+        self.service = service
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            OUTBOUND_LATENCY.labels(self.service).observe(time.perf_counter() - start)
+            OUTBOUND_REQUESTS.labels(self.service, request.method, status).inc()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# ── Exposition ──────────────────────────────────────────────────
+
+
+def multiprocess_enabled() -> bool:
+    """Whether samples are shared between worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_response(request: Request) -> Response:
+    """Render all metrics in the Prometheus text format."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges on shutdown (multiprocess mode)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+__all__ = [
+    "InstrumentedTransport",
+    "MetricsMiddleware",
+    "mark_process_dead",
+    "metrics_response",
+    "multiprocess_enabled",
+    "observe_outbound",
+    "route_label",
+]
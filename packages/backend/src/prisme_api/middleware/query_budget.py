@@ -0,0 +1,181 @@
+"""Per-request SQL statement budget and N+1 detection.
+
+``count_queries`` records every statement executed (on any engine) while it
+is active, through SQLAlchemy's ``before_cursor_execute`` event. A
+``QueryLog`` groups statements by their normalized text, so an endpoint
+that runs the same SELECT once per row - an N+1 - shows up as one statement
+repeated many times with different parameters.
+
+- ``QueryBudgetMiddleware`` (debug mode, see ``main.py``) counts each
+  request, reports the count in an ``X-Query-Count`` header and logs a
+  warning when a request exceeds ``settings.query_budget`` or repeats a
+  statement ``settings.query_repeat_threshold`` times.
+- ``query_budget`` (the ``query_budget`` fixture in tests) raises
+  ``QueryBudgetExceededError`` instead, so integration tests can pin the
+  number of statements an endpoint may issue.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+# Statements run this often in one request are reported as an N+1
+DEFAULT_REPEAT_THRESHOLD = 5
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Expanded IN lists: (?, ?, ?), ($1, $2), (%(id_1)s, %(id_2)s)
+_PLACEHOLDER = r"(?:\?|\$\d+|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+
+
+class QueryBudgetExceededError(AssertionError):
+    """A block of code issued more statements than its budget allows."""
+
+    pass
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape, dropping literal values.
+
+    Statements that differ only in parameters (including the length of an
+    expanded ``IN`` list) normalize to the same string.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(?)", normalized)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    return _NUMBER_LITERAL.sub("?", normalized)
+
+
+@dataclass
+class QueryLog:
+    """Statements executed while ``count_queries`` was active."""
+
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed (an ``executemany`` counts once)."""
+        return len(self.statements)
+
+    def repeated(self, threshold: int = DEFAULT_REPEAT_THRESHOLD) -> dict[str, int]:
+        """Normalized statements executed at least ``threshold`` times."""
+        counts = Counter(normalize_statement(statement) for statement in self.statements)
+        return {statement: n for statement, n in counts.most_common() if n >= threshold}
+
+    def problems(
+        self, budget: int | None, repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD
+    ) -> list[str]:
+        """Describe budget overruns and repeated statements (empty if none)."""
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} SQL statements, budget is {budget}")
+        for statement, n in self.repeated(repeat_threshold).items():
+            problems.append(f"possible N+1: {n}x {statement}")
+        return problems
+
+
+# Logs of the enclosing count_queries blocks (they may nest)
+_active_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    for log in _active_logs.get():
+        log.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Record the SQL statements executed inside the block."""
+    log = QueryLog()
+    token = _active_logs.set((*_active_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@contextmanager
+def query_budget(
+    max_queries: int | None, *, repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD
+) -> Iterator[QueryLog]:
+    """Fail if the block exceeds ``max_queries`` statements or repeats one.
+
+    Args:
+        max_queries: Maximum number of statements, or None for no limit.
+        repeat_threshold: How often one normalized statement may run before
+            it counts as an N+1.
+
+    Raises:
+        QueryBudgetExceededError: On exit, if the budget was exceeded or a
+            statement was repeated ``repeat_threshold`` times.
+    """
+    with count_queries() as log:
+        yield log
+    problems = log.problems(max_queries, repeat_threshold)
+    if problems:
+        executed = "\n".join(f"  {statement}" for statement in log.statements)
+        raise QueryBudgetExceededError("; ".join(problems) + f"\nExecuted:\n{executed}")
+
+
+class QueryBudgetMiddleware:
+    """Count statements per request and warn about budget overruns and N+1s."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int | None = None,
+        repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD,
+    ) -> None:
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as log:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)[QUERY_COUNT_HEADER] = str(log.count)
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        for problem in log.problems(self.budget, self.repeat_threshold):
+            logger.warning(f"{scope['method']} {scope['path']}: {problem}")
+
+
+__all__ = [
+    "DEFAULT_REPEAT_THRESHOLD",
+    "QUERY_COUNT_HEADER",
+    "QueryBudgetExceededError",
+    "QueryBudgetMiddleware",
+    "QueryLog",
+    "count_queries",
+    "normalize_statement",
+    "query_budget",
+]
@@ -0,0 +1,52 @@
+"""Read-your-writes pinning for the read replica.
+
+Tracks whether a request wrote to the database (see
+``prisme_api.database.track_writes``). If it did, the response sets a
+short-lived ``READ_YOUR_WRITES_COOKIE`` so the client's following reads
+(``get_read_db``) go to the primary until the replica has caught up. No
+cookie is set when no replica is configured.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from prisme_api import database
+from prisme_api.database import READ_YOUR_WRITES_COOKIE, track_writes
+
+
+class ReadYourWritesMiddleware:
+    """Pin clients to the primary for ``pin_seconds`` after they write."""
+
+    def __init__(self, app: ASGIApp, pin_seconds: float = 5.0) -> None:
+        self.app = app
+        self.pin_seconds = pin_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = track_writes()
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and tracker.wrote
+                and database.async_read_session is not None
+            ):
+                until = time.time() + self.pin_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={until:.3f}; Max-Age={int(self.pin_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+__all__ = ["ReadYourWritesMiddleware"]
@@ -1,15 +1,21 @@
 """SQLAlchemy models."""
 
+from .activation_job import ActivationJob
 from .allowed_email_domain import AllowedEmailDomain
 from .api_key import APIKey
 from .base import Base
+from .email_outbox import EmailOutbox
+from .job_lease import JobLease
 from .subdomain import Subdomain
 from .user import User
 
 __all__ = [
     "APIKey",
+    "ActivationJob",
     "AllowedEmailDomain",
     "Base",
+    "EmailOutbox",
+    "JobLease",
     "Subdomain",
     "User",
 ]
@@ -0,0 +1,45 @@
+"""SQLAlchemy model for ActivationJob."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class ActivationJob(Base, TimestampMixin):
+    """Subdomain activation accepted by the API and provisioned in the background.
+
+    Rows are inserted by ``POST /subdomains/{name}/activations`` and
+    processed by ``services.activation.ActivationWorker``, which creates the
+    DNS record and Traefik route and then activates the subdomain.
+    """
+
+    __tablename__ = "activation_jobs"
+    __table_args__ = (
+        Index("ix_activation_jobs_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    # Random hex ID, handed to the client for polling
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    subdomain_id: Mapped[int] = mapped_column(
+        ForeignKey("subdomains.id", ondelete="CASCADE"), index=True
+    )
+    subdomain_name: Mapped[str] = mapped_column(String(63))
+    requested_by_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    ip_address: Mapped[str] = mapped_column(String(45))
+    port: Mapped[int] = mapped_column(Integer, default=80)
+    # provisioning -> succeeded | failed
+    status: Mapped[str] = mapped_column(String(20), default="provisioning")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # Due time of the next attempt, or lease expiry while an attempt runs
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
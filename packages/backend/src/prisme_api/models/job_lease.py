@@ -0,0 +1,26 @@
+"""SQLAlchemy model for JobLease."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class JobLease(Base, TimestampMixin):
+    """Lease that lets one process run a singleton background job.
+
+    Every uvicorn worker runs the same background loops; a loop that must
+    not run concurrently (such as the DNS zone repair) takes the lease
+    named after it first. See ``services.job_lease``.
+    """
+
+    __tablename__ = "job_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # host:pid of the process holding the lease
+    holder: Mapped[str] = mapped_column(String(255))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
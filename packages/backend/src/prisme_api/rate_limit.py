@@ -0,0 +1,246 @@
+"""Rate limiter backed by storage shared between worker processes.
+
+slowapi's default in-memory storage keeps counters per process, so with
+``uvicorn --workers 4`` every limit is effectively multiplied by four. The
+limiter built here stores counters in:
+
+- ``redis://...`` - shared across hosts; limits' Redis storage evaluates
+  each sliding-window check in a single Lua script (one round trip).
+- ``sqlite:///path/to/file.db`` - shared by the workers of one host via a
+  WAL-mode SQLite file (``SQLiteStorage`` below).
+- ``memory://`` - per process; only suitable for a single worker.
+
+All limits use the sliding-window-counter strategy by default.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from math import floor
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+from slowapi import Limiter
+from starlette.requests import Request
+
+from prisme_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expired counters are deleted after this many writes
+PURGE_INTERVAL = 1000
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """limits storage keeping counters in a SQLite file.
+
+    Every check runs in one ``BEGIN IMMEDIATE`` transaction, so reading the
+    previous/current window counters and incrementing the current one is
+    atomic across processes sharing the file.
+
+    Registered for the ``sqlite://`` scheme; paths follow SQLAlchemy's
+    convention (``sqlite:///relative.db``, ``sqlite:////absolute.db``).
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        timeout: float = 5.0,
+        **options: float | str | bool,
+    ) -> None:
+        """Initialize the storage; the database is opened on first use.
+
+        Args:
+            uri: ``sqlite:///path`` URI of the counters database.
+            wrap_exceptions: Wrap sqlite errors in ``limits.errors.StorageError``.
+            timeout: Seconds to wait for another process's write lock.
+        """
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1][1:] or ":memory:"
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._writes = 0
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be shared with a forked child process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _transaction[T](self, fn: Callable[[sqlite3.Connection, float], T]) -> T:
+        """Run ``fn(conn, now)`` inside a write transaction."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn, time.time())
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (time.time(),))
+            return result
+
+    def _read[T](self, fn: Callable[[sqlite3.Connection, float], T]) -> T:
+        with self._lock:
+            return fn(self._connection(), time.time())
+
+    @staticmethod
+    def _incr(conn: sqlite3.Connection, now: float, key: str, expiry: float, amount: int) -> int:
+        row = conn.execute(
+            "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expires_at <= ? THEN excluded.count "
+            "ELSE count + excluded.count END, "
+            "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END "
+            "RETURNING count",
+            (key, amount, now + expiry, now, now),
+        ).fetchone()
+        return row[0]
+
+    @staticmethod
+    def _counts(conn: sqlite3.Connection, now: float, *keys: str) -> dict[str, int]:
+        placeholders = ", ".join("?" for _ in keys)
+        rows = conn.execute(
+            f"SELECT key, count FROM rate_limits WHERE key IN ({placeholders}) AND expires_at > ?",
+            (*keys, now),
+        ).fetchall()
+        return dict(rows)
+
+    def _window(
+        self, conn: sqlite3.Connection, now: float, key: str, expiry: int
+    ) -> tuple[str, int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        counts = self._counts(conn, now, previous_key, current_key)
+        previous_count = counts.get(previous_key, 0)
+        current_count = counts.get(current_key, 0)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return current_key, previous_count, previous_ttl, current_count, current_ttl
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._transaction(lambda conn, now: self._incr(conn, now, key, expiry, amount))
+
+    def get(self, key: str) -> int:
+        return self._read(lambda conn, now: self._counts(conn, now, key).get(key, 0))
+
+    def get_expiry(self, key: str) -> float:
+        def expiry(conn: sqlite3.Connection, now: float) -> float:
+            row = conn.execute(
+                "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            return row[0] if row else now
+
+        return self._read(expiry)
+
+    def check(self) -> bool:
+        try:
+            self._read(lambda conn, now: conn.execute("SELECT 1").fetchone())
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self) -> int | None:
+        return self._transaction(lambda conn, now: conn.execute("DELETE FROM rate_limits").rowcount)
+
+    def clear(self, key: str) -> None:
+        self._transaction(
+            lambda conn, now: conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+        )
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+
+        def acquire(conn: sqlite3.Connection, now: float) -> bool:
+            current_key, previous_count, previous_ttl, current_count, _ = self._window(
+                conn, now, key, expiry
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted_count) + amount > limit:
+                return False
+            # The current window's counter becomes the previous one, so it
+            # must outlive its own window by another full window
+            self._incr(conn, now, current_key, 2 * expiry, amount)
+            return True
+
+        return self._transaction(acquire)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        return self._read(lambda conn, now: self._window(conn, now, key, expiry)[1:])
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        def clear(conn: sqlite3.Connection, now: float) -> None:
+            previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+            conn.execute("DELETE FROM rate_limits WHERE key IN (?, ?)", (previous_key, current_key))
+
+        self._transaction(clear)
+
+
+def rate_limit_storage_uri() -> str:
+    """Storage URI for rate limit counters.
+
+    ``RATE_LIMIT_STORAGE_URI`` wins; otherwise the app's Redis (``REDIS_URL``)
+    is used when configured, and per-process memory as a last resort.
+    """
+    return settings.rate_limit_storage_uri or settings.redis_url or "memory://"
+
+
+def create_limiter(key_func: Callable[[Request], str], *, enabled: bool = True) -> Limiter:
+    """Create a slowapi limiter using the shared storage backend.
+
+    Args:
+        key_func: Returns the rate limit key for a request.
+        enabled: Disable to skip all limit checks (e.g. under tests).
+
+    Returns:
+        The configured limiter.
+    """
+    storage_uri = rate_limit_storage_uri()
+    if enabled and storage_uri.startswith("memory://"):
+        logger.warning("Rate limits use in-memory storage and are enforced per worker process")
+    return Limiter(
+        key_func=key_func,
+        enabled=enabled,
+        storage_uri=storage_uri,
+        strategy=settings.rate_limit_strategy,
+        # Keep limiting per process if the shared storage becomes unreachable
+        in_memory_fallback_enabled=not storage_uri.startswith("memory://"),
+    )
+
+
+__all__ = [
+    "SQLiteStorage",
+    "create_limiter",
+    "rate_limit_storage_uri",
+]
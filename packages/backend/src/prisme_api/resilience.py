@@ -0,0 +1,168 @@
+"""Retry backoff and circuit breaking for outbound API calls.
+
+``backoff_delay`` spaces out retries with jittered exponential backoff, and
+``parse_retry_after`` reads the ``Retry-After`` header an upstream sends
+with 429 and 503 responses, so a retry never comes earlier than it asked.
+
+``CircuitBreaker`` stops calling an upstream that keeps failing. After
+``failure_threshold`` consecutive failures it opens and rejects calls with
+``CircuitOpenError`` - without waiting on a timeout - for
+``reset_timeout`` seconds. It then lets a single probe call through
+(half-open): success closes the circuit, failure opens it again. State
+changes are exported as the ``circuit_breaker_state`` gauge and the
+``circuit_breaker_transitions_total`` counter.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from prisme_api.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values for each state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Call rejected without contacting the upstream: the circuit is open."""
+
+    def __init__(self, service: str, retry_after: float) -> None:
+        super().__init__(f"{service} circuit is open, retry in {retry_after:.0f}s")
+        self.service = service
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Delay before retry number ``attempt`` (0 for the first retry)."""
+    delay = min(max_delay, base_delay * 2**attempt)
+    # Jitter on the upper half spreads out retries of concurrent callers
+    return delay * random.uniform(0.5, 1.0)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait according to a ``Retry-After`` header.
+
+    Accepts both forms (delay in seconds, HTTP date). Returns None if the
+    header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream service.
+
+    Not thread-safe; meant for calls made from one event loop.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed breaker.
+
+        Args:
+            service: Upstream name, used as the metrics label.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a probe.
+            clock: Monotonic time source (tests pass a fake clock).
+        """
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        CIRCUIT_BREAKER_STATE.labels(service).set(STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit turns half-open after ``reset_timeout``."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def before_call(self) -> None:
+        """Admit a call, or reject it while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight.
+        """
+        state = self.state
+        if state == OPEN:
+            raise CircuitOpenError(self.service, self.retry_after)
+        if state == HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.service, self.reset_timeout)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a healthy response; closes a half-open circuit."""
+        self._probe_in_flight = False
+        self._failures = 0
+        if self._state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call; may open the circuit."""
+        self._probe_in_flight = False
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            if self._state != OPEN:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Forget an admitted call that ended without an outcome (cancelled)."""
+        self._probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        previous, self._state = self._state, state
+        CIRCUIT_BREAKER_STATE.labels(self.service).set(STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(self.service, state).inc()
+        log = logger.warning if state == OPEN else logger.info
+        log(f"{self.service} circuit {previous} -> {state}")
+
+
+__all__ = [
+    "CLOSED",
+    "HALF_OPEN",
+    "OPEN",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "backoff_delay",
+    "parse_retry_after",
+]
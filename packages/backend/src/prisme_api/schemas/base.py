@@ -20,13 +20,21 @@ class SchemaBase(BaseModel):
 
 
 class PaginatedResponse[T](BaseModel):
-    """Paginated response wrapper."""
+    """Paginated response wrapper.
+
+    ``next_cursor``/``prev_cursor`` are opaque keyset cursors; pass them as
+    ``after``/``before`` to fetch the adjacent page at constant cost.
+    ``total_is_estimate`` is set when ``total`` is a planner estimate.
+    """
 
     items: list[T]
     total: int
     page: int
     page_size: int
     pages: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    total_is_estimate: bool = False
 
     @property
     def has_next(self) -> bool:
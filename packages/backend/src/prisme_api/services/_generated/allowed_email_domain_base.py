@@ -40,6 +40,8 @@ class AllowedEmailDomainServiceBase(
         filters: AllowedEmailDomainFilter | None = None,
         sort_by: str | None = None,
         sort_order: str = "asc",
+        after: str | None = None,
+        before: str | None = None,
         include_deleted: bool = False,
         load_relationships: list[str] | None = None,
     ) -> Sequence[AllowedEmailDomain]:
@@ -51,11 +53,17 @@ class AllowedEmailDomainServiceBase(
             filters: Filter parameters.
             sort_by: Field to sort by.
             sort_order: Sort order ('asc' or 'desc').
+            after: Cursor to return records after (keyset pagination).
+            before: Cursor to return records before (keyset pagination).
             include_deleted: Whether to include soft-deleted records.
             load_relationships: List of relationship names to eagerly load.
 
         Returns:
             List of AllowedEmailDomain records.
+
+        Raises:
+            InvalidCursorError: If a cursor is invalid or the sort column is
+                nullable.
         """
         query = select(self.model)
 
@@ -73,18 +81,20 @@ class AllowedEmailDomainServiceBase(
                 if hasattr(self.model, rel_name):
                     query = query.options(selectinload(getattr(self.model, rel_name)))
 
-        # Apply sorting
-        if sort_by and hasattr(self.model, sort_by):
-            column = getattr(self.model, sort_by)
-            if sort_order.lower() == "desc":
-                column = column.desc()
-            query = query.order_by(column)
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        # Apply sorting and pagination
+        query, backwards = self._paginate(
+            query,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            after=after,
+            before=before,
+        )
 
         result = await self.db.execute(query)
-        return result.scalars().all()
+        items = result.scalars().all()
+        return items[::-1] if backwards else items
 
     async def count_filtered(
         self,
@@ -5,20 +5,38 @@
 
 from __future__ import annotations
 
+import sqlite3
 from abc import ABC
 from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 from pydantic import BaseModel
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import delete, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from prisme_api.services.cursor import apply_keyset
+
 if TYPE_CHECKING:
     pass
 
 
+# Planner estimates are only used for tables at least this large; below it
+# an exact count is cheap enough.
+ESTIMATE_MIN_ROWS = 10_000
+
+
+@dataclass
+class PageResult[ModelT]:
+    """A page of records together with the total number of matches."""
+
+    items: Sequence[ModelT]
+    total: int
+    total_is_estimate: bool = False
+
+
 @runtime_checkable
 class ModelProtocol(Protocol):
     """Protocol for SQLAlchemy models used in services."""
@@ -76,11 +94,69 @@ class ServiceBase[ModelT: ModelProtocol, CreateSchemaT: BaseModel, UpdateSchemaT
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    def _paginate(
+        self,
+        query: Any,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: str | None = None,
+        sort_order: str = "asc",
+        after: str | None = None,
+        before: str | None = None,
+    ) -> tuple[Any, bool]:
+        """Apply sorting and offset or keyset pagination to a query.
+
+        Results are always ordered by ``(sort_by, id)`` so offset pages and
+        cursor pages agree. With a cursor, ``skip`` is ignored.
+
+        Args:
+            query: The SQLAlchemy query.
+            skip: Number of records to skip (offset pagination).
+            limit: Maximum number of records to return.
+            sort_by: Field to sort by.
+            sort_order: Sort order ('asc' or 'desc').
+            after: Cursor to return records after (keyset pagination).
+            before: Cursor to return records before (keyset pagination).
+
+        Returns:
+            Tuple of (query, reversed); reverse the rows if ``reversed``.
+
+        Raises:
+            InvalidCursorError: If a cursor is invalid or the sort column is
+                nullable.
+        """
+        if after or before:
+            query, backwards = apply_keyset(
+                query,
+                self.model,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                after=after,
+                before=before,
+            )
+            return query.limit(limit), backwards
+
+        id_column = self.model.id  # type: ignore[attr-defined]
+        descending = sort_order.lower() == "desc"
+        if sort_by and hasattr(self.model, sort_by):
+            column = getattr(self.model, sort_by)
+            if descending:
+                query = query.order_by(column.desc(), id_column.desc())
+            else:
+                query = query.order_by(column, id_column)
+        else:
+            query = query.order_by(id_column.desc() if descending else id_column)
+
+        return query.offset(skip).limit(limit), False
+
     async def get_multi(
         self,
         *,
         skip: int = 0,
         limit: int = 100,
+        after: str | None = None,
+        before: str | None = None,
         include_deleted: bool = False,
         load_relationships: list[str] | None = None,
     ) -> Sequence[ModelT]:
@@ -89,6 +165,8 @@ class ServiceBase[ModelT: ModelProtocol, CreateSchemaT: BaseModel, UpdateSchemaT
         Args:
             skip: Number of records to skip.
             limit: Maximum number of records to return.
+            after: Cursor to return records after (keyset pagination).
+            before: Cursor to return records before (keyset pagination).
             include_deleted: Whether to include soft-deleted records.
             load_relationships: List of relationship names to eagerly load.
 
@@ -107,9 +185,10 @@ class ServiceBase[ModelT: ModelProtocol, CreateSchemaT: BaseModel, UpdateSchemaT
                 if hasattr(self.model, rel_name):
                     query = query.options(selectinload(getattr(self.model, rel_name)))
 
-        query = query.offset(skip).limit(limit)
+        query, backwards = self._paginate(query, skip=skip, limit=limit, after=after, before=before)
         result = await self.db.execute(query)
-        return result.scalars().all()
+        items = result.scalars().all()
+        return items[::-1] if backwards else items
 
     async def count(
         self,
@@ -132,6 +211,126 @@ class ServiceBase[ModelT: ModelProtocol, CreateSchemaT: BaseModel, UpdateSchemaT
         result = await self.db.execute(query)
         return result.scalar_one()
 
+    async def list_with_count(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Any = None,
+        sort_by: str | None = None,
+        sort_order: str = "asc",
+        after: str | None = None,
+        before: str | None = None,
+        include_deleted: bool = False,
+        load_relationships: list[str] | None = None,
+        approximate: bool = False,
+    ) -> PageResult[ModelT]:
+        """List records and count all matches in a single statement.
+
+        Adds ``count(*) OVER ()`` to the page query so the total comes back
+        with the rows (Postgres, SQLite >= 3.25). Falls back to a separate
+        count query for other backends, for keyset pages (the cursor
+        condition would narrow the window) and for empty pages (no row to
+        carry the total).
+
+        Args:
+            skip: Number of records to skip.
+            limit: Maximum number of records to return.
+            filters: Filter parameters (applied via ``_apply_filters``).
+            sort_by: Field to sort by.
+            sort_order: Sort order ('asc' or 'desc').
+            after: Cursor to return records after (keyset pagination).
+            before: Cursor to return records before (keyset pagination).
+            include_deleted: Whether to include soft-deleted records.
+            load_relationships: List of relationship names to eagerly load.
+            approximate: For unfiltered lists on Postgres, use the planner's
+                row estimate (which includes soft-deleted rows) instead of
+                counting large tables.
+
+        Returns:
+            PageResult with the records and the total.
+
+        Raises:
+            InvalidCursorError: If a cursor is invalid or the sort column is
+                nullable.
+        """
+        query = select(self.model)
+
+        soft_delete = hasattr(self.model, "deleted_at") and not include_deleted
+        if soft_delete:
+            query = query.where(self.model.deleted_at.is_(None))  # type: ignore[attr-defined]
+
+        if filters is not None and hasattr(self, "_apply_filters"):
+            query = self._apply_filters(query, filters)
+
+        if load_relationships:
+            for rel_name in load_relationships:
+                if hasattr(self.model, rel_name):
+                    query = query.options(selectinload(getattr(self.model, rel_name)))
+
+        pagination = {
+            "skip": skip,
+            "limit": limit,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "after": after,
+            "before": before,
+        }
+
+        estimate = None
+        if approximate and filters is None:
+            estimate = await self._estimated_count()
+
+        if estimate is None and not (after or before) and self._supports_window_count():
+            windowed, _ = self._paginate(
+                query.add_columns(func.count().over().label("total")), **pagination
+            )
+            rows = (await self.db.execute(windowed)).all()
+            if rows:
+                return PageResult(items=[row[0] for row in rows], total=rows[0].total)
+
+        paged, backwards = self._paginate(query, **pagination)
+        items = (await self.db.execute(paged)).scalars().all()
+        if backwards:
+            items = items[::-1]
+
+        if estimate is not None:
+            return PageResult(items=items, total=estimate, total_is_estimate=True)
+
+        if hasattr(self, "count_filtered"):
+            total = await self.count_filtered(filters=filters, include_deleted=include_deleted)
+        else:
+            total = await self.count(include_deleted=include_deleted)
+        return PageResult(items=items, total=total)
+
+    def _supports_window_count(self) -> bool:
+        """Whether the database supports ``count(*) OVER ()``."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return True
+        if dialect == "sqlite":
+            return sqlite3.sqlite_version_info >= (3, 25, 0)
+        return False
+
+    async def _estimated_count(self) -> int | None:
+        """Planner row estimate for the table (Postgres only).
+
+        Returns:
+            The estimate, or None if unavailable or the table is small
+            enough (or never analyzed) that an exact count is preferable.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        result = await self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": self.model.__table__.name},
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < ESTIMATE_MIN_ROWS:
+            return None
+        return int(estimate)
+
     async def create(
         self,
         *,
@@ -373,4 +572,4 @@ class ServiceBase[ModelT: ModelProtocol, CreateSchemaT: BaseModel, UpdateSchemaT
         ...
 
 
-__all__ = ["ModelProtocol", "ServiceBase"]
+__all__ = ["ESTIMATE_MIN_ROWS", "ModelProtocol", "PageResult", "ServiceBase"]
@@ -0,0 +1,481 @@
+"""Subdomain activation: DNS provisioning and the background pipeline.
+
+``provision_dns`` creates or updates a subdomain's A record; the
+synchronous activate endpoint calls it inline.
+
+The asynchronous pipeline keeps Hetzner's latency out of the request.
+``enqueue_activation`` adds an ``ActivationJob`` in ``provisioning`` state
+to the caller's session and the endpoint answers 202 with the job ID.
+``ActivationWorker`` runs in the application lifespan and, for each due
+job, provisions the DNS record, writes the Traefik route and then
+activates the subdomain. No database session is held while it waits on
+Hetzner. Failed attempts are retried with jittered exponential backoff
+until ``max_attempts``. Jobs are claimed with a conditional UPDATE that
+also sets a lease, as in the email outbox, so several processes never run
+the same job at once.
+
+Releasing or deleting a subdomain cancels its pending jobs
+(``cancel_activations``). The final UPDATEs are conditional on the job
+still provisioning and the subdomain being neither released nor
+suspended, so an attempt that loses that race fails and removes the DNS
+record and route it wrote instead of reactivating the subdomain.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from prisme_api.config import settings
+from prisme_api.models.activation_job import ActivationJob
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.services.dns_propagation import DNSPropagationChecker
+from prisme_api.services.dns_zone import ZoneMirror
+from prisme_api.services.hetzner_dns import (
+    HetznerDNSError,
+    HetznerDNSService,
+    HetznerDNSUnavailableError,
+)
+
+logger = logging.getLogger(__name__)
+
+PROVISIONING = "provisioning"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Subdomain states an activation must not override
+INACTIVE_STATUSES = ("released", "suspended")
+
+
+class ActivationError(Exception):
+    """Activation cannot succeed; the job fails without further retries."""
+
+    pass
+
+
+async def provision_dns(
+    dns_service: HetznerDNSService,
+    name: str,
+    record_id: str | None,
+    ip_address: str,
+    *,
+    zone: ZoneMirror | None = None,
+    propagation_checker: DNSPropagationChecker | None = None,
+) -> str:
+    """Point a subdomain's A record at ``ip_address``.
+
+    Updates the record if the subdomain has one, otherwise creates it, and
+    tells the zone mirror and propagation cache about the change.
+
+    Args:
+        dns_service: The Hetzner DNS service
+        name: Subdomain name (lowercase)
+        record_id: The subdomain's current record ID, if any
+        ip_address: The new IPv4 address
+        zone: Zone mirror to keep current
+        propagation_checker: Propagation cache to invalidate
+
+    Returns:
+        The record ID
+
+    Raises:
+        HetznerDNSError: If the record could not be written
+    """
+    if record_id:
+        await dns_service.update_a_record(record_id, ip_address, subdomain=name)
+        logger.info(f"DNS record updated for {name}: {ip_address}")
+    else:
+        record_id = await dns_service.create_a_record(name, ip_address)
+        logger.info(f"DNS record created for {name}: {ip_address}")
+    if zone is not None:
+        zone.record_written(record_id, name, ip_address)
+    if propagation_checker is not None:
+        propagation_checker.invalidate(f"{name}.{dns_service.DOMAIN}")
+    return record_id
+
+
+def enqueue_activation(
+    db: AsyncSession,
+    subdomain: Subdomain,
+    ip_address: str,
+    port: int,
+    *,
+    requested_by_id: int | None = None,
+) -> ActivationJob:
+    """Queue an activation in the caller's transaction.
+
+    Args:
+        db: The request's database session.
+        subdomain: The subdomain to activate.
+        ip_address: IPv4 address for the A record and route.
+        port: Port the route forwards to.
+        requested_by_id: The user asking for the activation.
+
+    Returns:
+        The new job, in ``provisioning`` state.
+    """
+    now = datetime.now(UTC)
+    job = ActivationJob(
+        id=uuid.uuid4().hex,
+        subdomain_id=subdomain.id,
+        subdomain_name=subdomain.name,
+        requested_by_id=requested_by_id,
+        ip_address=ip_address,
+        port=port,
+        status=PROVISIONING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    return job
+
+
+async def pending_activation(db: AsyncSession, subdomain_id: int) -> ActivationJob | None:
+    """The subdomain's activation still in ``provisioning`` state, if any."""
+    result = await db.execute(
+        select(ActivationJob)
+        .where(ActivationJob.subdomain_id == subdomain_id, ActivationJob.status == PROVISIONING)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def cancel_activations(db: AsyncSession, subdomain_id: int, reason: str) -> int:
+    """Fail a subdomain's pending activations in the caller's transaction.
+
+    Args:
+        db: The request's database session.
+        subdomain_id: The subdomain being released or deleted.
+        reason: Stored as the jobs' error.
+
+    Returns:
+        Number of jobs cancelled.
+    """
+    result = await db.execute(
+        update(ActivationJob)
+        .where(ActivationJob.subdomain_id == subdomain_id, ActivationJob.status == PROVISIONING)
+        .values(status=FAILED, completed_at=datetime.now(UTC), last_error=reason)
+    )
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
+
+
+class ActivationWorker:
+    """Background provisioning of activation jobs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        dns_service: HetznerDNSService | None,
+        *,
+        zone: ZoneMirror | None = None,
+        propagation_checker: DNSPropagationChecker | None = None,
+        concurrency: int = 4,
+        batch_size: int = 20,
+        poll_interval: float = 1.0,
+        max_attempts: int = 6,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        lease: float = 120.0,
+    ) -> None:
+        """Initialize the worker.
+
+        Args:
+            session_factory: Creates database sessions (e.g. ``async_session``).
+            dns_service: Hetzner DNS service (None skips DNS, as in development).
+            zone: Zone mirror to keep current.
+            propagation_checker: Propagation cache to invalidate.
+            concurrency: Maximum jobs provisioned at once.
+            batch_size: Jobs claimed per poll.
+            poll_interval: Seconds to wait when no job is due.
+            max_attempts: Attempts before a job is marked failed.
+            base_delay: Backoff after the first failure, in seconds.
+            max_delay: Upper bound for the backoff, in seconds.
+            lease: Seconds a claimed job is reserved for this worker.
+        """
+        self._session_factory = session_factory
+        self.dns_service = dns_service
+        self.zone = zone
+        self.propagation_checker = propagation_checker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retrying a job that has failed ``attempts`` times."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def get(self, job_id: str) -> ActivationJob | None:
+        """Read a job in a short-lived session of its own."""
+        async with self._session_factory() as db:
+            return await db.get(ActivationJob, job_id)
+
+    async def _claim(self) -> list[ActivationJob]:
+        now = datetime.now(UTC)
+        due = (
+            select(ActivationJob.id)
+            .where(ActivationJob.status == PROVISIONING, ActivationJob.next_attempt_at <= now)
+            .order_by(ActivationJob.next_attempt_at)
+            .limit(self.batch_size)
+        )
+        async with self._session_factory() as db:
+            # Re-checked on the row, so a job another worker leased meanwhile is skipped
+            result = await db.execute(
+                update(ActivationJob)
+                .where(
+                    ActivationJob.id.in_(due.scalar_subquery()),
+                    ActivationJob.status == PROVISIONING,
+                    ActivationJob.next_attempt_at <= now,
+                )
+                .values(
+                    attempts=ActivationJob.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=self.lease),
+                )
+                .returning(ActivationJob)
+                .execution_options(synchronize_session=False)
+            )
+            jobs = list(result.scalars().all())
+            await db.commit()
+        return jobs
+
+    async def _provision(self, job: ActivationJob) -> None:
+        """Run one attempt of a job and record its outcome."""
+        async with self._session_factory() as db:
+            subdomain = await db.get(Subdomain, job.subdomain_id)
+            initial_record_id = subdomain.dns_record_id if subdomain else None
+        record_id = initial_record_id
+
+        error: str | None = None
+        retry_after = 0.0
+        permanent = False
+        try:
+            if subdomain is None or subdomain.status in INACTIVE_STATUSES:
+                state = subdomain.status if subdomain else "deleted"
+                raise ActivationError(f"Subdomain '{job.subdomain_name}' is {state}")
+
+            if self.dns_service is not None:
+                async with self._semaphore:
+                    record_id = await provision_dns(
+                        self.dns_service,
+                        job.subdomain_name,
+                        record_id,
+                        job.ip_address,
+                        zone=self.zone,
+                        propagation_checker=self.propagation_checker,
+                    )
+
+            from prisme_api.services.route_manager import get_route_manager
+
+            route_manager = get_route_manager()
+            if route_manager is not None:
+                await route_manager.create_route(job.subdomain_name, job.ip_address, job.port)
+        except ActivationError as e:
+            error, permanent = str(e), True
+        except HetznerDNSUnavailableError as e:
+            error, retry_after = str(e), e.retry_after
+        except Exception as e:
+            # HetznerDNSError, route write failures and anything unexpected
+            if not isinstance(e, HetznerDNSError):
+                logger.exception(f"Activation {job.id} of {job.subdomain_name} failed")
+            error = str(e) or type(e).__name__
+        new_record_id = record_id if record_id != initial_record_id else None
+
+        if error is None:
+            if await self._complete(job, record_id):
+                logger.info(f"Activation {job.id}: {job.subdomain_name} -> {job.ip_address}")
+                return
+            # Released, suspended or deleted while the DNS record and route were written
+            logger.warning(f"Activation {job.id} cancelled: {job.subdomain_name} changed meanwhile")
+            await self._undo(job, new_record_id, route=True)
+            error = f"Subdomain '{job.subdomain_name}' was released during activation"
+            permanent, new_record_id = True, None
+
+        now = datetime.now(UTC)
+        async with self._session_factory() as db:
+            if new_record_id:
+                # Keep a record created by this attempt, so a retry updates it
+                kept = await db.execute(
+                    update(Subdomain)
+                    .where(
+                        Subdomain.id == job.subdomain_id,
+                        Subdomain.status.notin_(INACTIVE_STATUSES),
+                    )
+                    .values(dns_record_id=new_record_id)
+                )
+                if not kept.rowcount:  # type: ignore[attr-defined]
+                    permanent = True
+                else:
+                    new_record_id = None
+            if permanent or job.attempts >= self.max_attempts:
+                logger.error(f"Activation {job.id} failed after {job.attempts} attempts")
+                values: dict[str, object] = {
+                    "status": FAILED,
+                    "completed_at": now,
+                    "last_error": error,
+                }
+            else:
+                delay = max(self.backoff(job.attempts), retry_after)
+                logger.warning(
+                    f"Activation {job.id} attempt {job.attempts} failed, "
+                    f"retry in {delay:.0f}s: {error}"
+                )
+                values = {
+                    "last_error": error,
+                    "next_attempt_at": now + timedelta(seconds=delay),
+                }
+            # A job cancelled meanwhile keeps its cancellation reason
+            await db.execute(
+                update(ActivationJob)
+                .where(ActivationJob.id == job.id, ActivationJob.status == PROVISIONING)
+                .values(**values)
+            )
+            await db.commit()
+        if new_record_id:
+            # The subdomain went away: nothing would ever reference this record
+            await self._undo(job, new_record_id, route=False)
+
+    async def _complete(self, job: ActivationJob, record_id: str | None) -> bool:
+        """Activate the subdomain and mark the job succeeded, in one transaction.
+
+        Returns:
+            False if the job was cancelled or the subdomain released,
+            suspended or deleted meanwhile (nothing is changed then)
+        """
+        now = datetime.now(UTC)
+        async with self._session_factory() as db:
+            job_updated = await db.execute(
+                update(ActivationJob)
+                .where(ActivationJob.id == job.id, ActivationJob.status == PROVISIONING)
+                .values(status=SUCCEEDED, completed_at=now, last_error=None)
+            )
+            if not job_updated.rowcount:  # type: ignore[attr-defined]
+                return False
+            activated = await db.execute(
+                update(Subdomain)
+                .where(
+                    Subdomain.id == job.subdomain_id,
+                    Subdomain.status.notin_(INACTIVE_STATUSES),
+                )
+                .values(
+                    ip_address=job.ip_address,
+                    port=job.port,
+                    status="active",
+                    dns_record_id=record_id,
+                )
+            )
+            if not activated.rowcount:  # type: ignore[attr-defined]
+                await db.rollback()
+                return False
+            await db.commit()
+        return True
+
+    async def _undo(self, job: ActivationJob, record_id: str | None, *, route: bool) -> None:
+        """Remove the route and new DNS record of an activation that lost a race."""
+        from prisme_api.services.route_manager import get_route_manager
+
+        route_manager = get_route_manager()
+        try:
+            if route and route_manager is not None:
+                await route_manager.delete_route(job.subdomain_name)
+            if record_id and self.dns_service is not None:
+                await self.dns_service.delete_a_record(record_id)
+                if self.zone is not None:
+                    self.zone.record_deleted(record_id)
+        except Exception:
+            # Left for the route and zone reconcilers
+            logger.exception(f"Failed to undo activation {job.id} of {job.subdomain_name}")
+
+    async def run_once(self) -> int:
+        """Claim and provision one batch of due jobs.
+
+        Returns:
+            Number of jobs processed (succeeded, rescheduled or failed).
+        """
+        jobs = await self._claim()
+        if jobs:
+            await asyncio.gather(*(self._provision(job) for job in jobs))
+        return len(jobs)
+
+    def wake(self) -> None:
+        """Poll immediately instead of waiting for the next interval."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Activation poll failed")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling after the batch in progress."""
+        if self._task is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+
+def create_activation_worker(
+    session_factory: Callable[[], AsyncSession],
+    dns_service: HetznerDNSService | None,
+    *,
+    zone: ZoneMirror | None = None,
+    propagation_checker: DNSPropagationChecker | None = None,
+) -> ActivationWorker:
+    """Create the app-lifetime activation worker from settings."""
+    return ActivationWorker(
+        session_factory,
+        dns_service,
+        zone=zone,
+        propagation_checker=propagation_checker,
+        concurrency=settings.activation_concurrency,
+        poll_interval=settings.activation_poll_interval,
+        max_attempts=settings.activation_max_attempts,
+        base_delay=settings.activation_retry_base_delay,
+        max_delay=settings.activation_retry_max_delay,
+    )
+
+
+__all__ = [
+    "FAILED",
+    "INACTIVE_STATUSES",
+    "PROVISIONING",
+    "SUCCEEDED",
+    "ActivationError",
+    "ActivationWorker",
+    "cancel_activations",
+    "create_activation_worker",
+    "enqueue_activation",
+    "pending_activation",
+    "provision_dns",
+]
@@ -1,6 +1,8 @@
 """Service for AllowedEmailDomain.
 
-Manages email domain whitelist for user signups.
+Manages email domain whitelist for user signups. Checks are answered from
+the in-process snapshot in ``email_domain_allowlist``; every write through
+this service invalidates it.
 """
 
 from __future__ import annotations
@@ -11,6 +13,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from prisme_api.models.allowed_email_domain import AllowedEmailDomain
+from prisme_api.schemas.allowed_email_domain import AllowedEmailDomainUpdate
+from prisme_api.services.email_domain_allowlist import email_domain_allowlist
 
 from ._generated.allowed_email_domain_base import AllowedEmailDomainServiceBase
 
@@ -49,6 +53,10 @@ class AllowedEmailDomainService(AllowedEmailDomainServiceBase):
     async def is_domain_allowed(self, email: str) -> bool:
         """Check if an email address is from an allowed domain.
 
+        Exact entries match the domain itself; ``*.example.edu`` entries
+        match any subdomain of ``example.edu``. Served from the cached
+        allowlist snapshot, so a warm check runs no queries.
+
         Args:
             email: Full email address (e.g., 'user@example.com')
 
@@ -58,19 +66,14 @@ class AllowedEmailDomainService(AllowedEmailDomainServiceBase):
         if "@" not in email:
             return False
 
-        domain = email.split("@")[1].lower()
-        allowed = await self.get_by_domain(domain)
-
-        if allowed and allowed.is_active:
-            return True
+        domain = email.split("@")[1]
+        snapshot = await email_domain_allowlist.get(self.db)
 
-        # Also check if whitelist is empty (allow all in that case)
-        count = await self.count()
-        if count == 0:
+        if snapshot.allow_all:
             logger.warning("Email domain whitelist is empty - allowing all domains")
             return True
 
-        return False
+        return snapshot.allows(domain)
 
     async def list_active_domains(self) -> list[str]:
         """Get list of all active allowed domains.
@@ -82,5 +85,29 @@ class AllowedEmailDomainService(AllowedEmailDomainServiceBase):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def update_many(self, *, ids: list[int], data: AllowedEmailDomainUpdate) -> int:
+        """Update multiple domains and invalidate the allowlist snapshot."""
+        count = await super().update_many(ids=ids, data=data)
+        email_domain_allowlist.invalidate()
+        return count
+
+    async def delete_many(self, *, ids: list[int], soft: bool = True) -> int:
+        """Delete multiple domains and invalidate the allowlist snapshot."""
+        count = await super().delete_many(ids=ids, soft=soft)
+        email_domain_allowlist.invalidate()
+        return count
+
+    async def after_create(self, obj: AllowedEmailDomain) -> None:
+        """Invalidate the allowlist snapshot."""
+        email_domain_allowlist.invalidate()
+
+    async def after_update(self, obj: AllowedEmailDomain) -> None:
+        """Invalidate the allowlist snapshot."""
+        email_domain_allowlist.invalidate()
+
+    async def after_delete(self, obj: AllowedEmailDomain) -> None:
+        """Invalidate the allowlist snapshot."""
+        email_domain_allowlist.invalidate()
+
 
 __all__ = ["AllowedEmailDomainService"]
@@ -0,0 +1,234 @@
+"""Keyset (cursor) pagination helpers.
+
+Offset pagination makes the database scan and discard every row before the
+requested page, so deep pages get slower the further an admin scrolls.
+Keyset pagination instead seeks directly past the last row seen, using the
+``(sort column, id)`` pair as a unique, ordered key:
+
+    WHERE (created_at, id) > (:last_created_at, :last_id)
+    ORDER BY created_at, id
+    LIMIT :page_size
+
+Cursors are opaque URL-safe strings encoding the sort specification and
+the key of a boundary row. Only non-nullable columns can be used as the
+sort key, because NULLs break the tuple comparison: offset pages sorted by
+a nullable column carry no cursors, and a cursor request for such a sort
+is rejected.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, literal, tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or does not fit the request."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Decoded cursor: sort specification plus the boundary row's key."""
+
+    sort_by: str
+    sort_order: str
+    value: Any
+    id: int
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursorError("Invalid cursor value")
+    return value
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode a cursor as an opaque URL-safe string."""
+    payload = {
+        "s": cursor.sort_by,
+        "o": cursor.sort_order,
+        "v": _encode_value(cursor.value),
+        "i": cursor.id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: If the token is not a valid cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        return Cursor(
+            sort_by=payload["s"],
+            sort_order=payload["o"],
+            value=_decode_value(payload["v"]),
+            id=int(payload["i"]),
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def keyset_sortable(model: Any, sort_by: str | None) -> bool:
+    """Whether pages sorted by ``sort_by`` can be walked with cursors."""
+    columns = model.__table__.columns
+    return not sort_by or sort_by not in columns or not columns[sort_by].nullable
+
+
+def _sort_spec(model: Any, sort_by: str | None, sort_order: str) -> tuple[str, str]:
+    """Normalize the sort specification used for keyset pagination.
+
+    Unknown sort fields fall back to ``id``, matching the offset path which
+    ignores them.
+
+    Raises:
+        InvalidCursorError: If the sort column is nullable.
+    """
+    order = "desc" if sort_order.lower() == "desc" else "asc"
+    if not sort_by or sort_by == "id" or sort_by not in model.__table__.columns:
+        return "id", order
+    if not keyset_sortable(model, sort_by):
+        raise InvalidCursorError(
+            f"Cannot paginate with a cursor when sorting by nullable field '{sort_by}'"
+        )
+    return sort_by, order
+
+
+def apply_keyset(
+    query: Any,
+    model: Any,
+    *,
+    sort_by: str | None,
+    sort_order: str,
+    after: str | None = None,
+    before: str | None = None,
+) -> tuple[Any, bool]:
+    """Add keyset filtering and ordering to a select.
+
+    With ``before``, the query walks backwards (inverted comparison and
+    order); the caller must reverse the fetched rows.
+
+    Args:
+        query: The SQLAlchemy select (filters already applied, no ordering).
+        model: The mapped model class.
+        sort_by: Field to sort by (None sorts by id).
+        sort_order: 'asc' or 'desc'.
+        after: Return rows after this cursor.
+        before: Return rows before this cursor.
+
+    Returns:
+        Tuple of (query, reversed) where ``reversed`` tells the caller to
+        reverse the result rows.
+
+    Raises:
+        InvalidCursorError: If both cursors are given, a cursor is invalid
+            or was issued for a different sort, or the sort column is nullable.
+    """
+    if after and before:
+        raise InvalidCursorError("Use either 'after' or 'before', not both")
+
+    field, order = _sort_spec(model, sort_by, sort_order)
+    token = after or before
+    backwards = before is not None
+    descending = (order == "desc") != backwards
+
+    id_column = model.id
+    if field == "id":
+        key = id_column
+        order_by = [id_column.desc() if descending else id_column.asc()]
+    else:
+        column = getattr(model, field)
+        key = tuple_(column, id_column)
+        order_by = [
+            column.desc() if descending else column.asc(),
+            id_column.desc() if descending else id_column.asc(),
+        ]
+
+    if token:
+        cursor = decode_cursor(token)
+        if (cursor.sort_by, cursor.sort_order) != (field, order):
+            raise InvalidCursorError("Cursor was issued for a different sort order")
+        bound: ColumnElement[Any]
+        if field == "id":
+            bound = literal(cursor.id, type_=id_column.type)
+        else:
+            bound = tuple_(literal(cursor.value, type_=column.type), cursor.id)
+        query = query.where(key < bound if descending else key > bound)
+
+    return query.order_by(*order_by), backwards
+
+
+def cursor_for(item: Any, *, sort_by: str | None, sort_order: str) -> str:
+    """Build the cursor pointing at ``item`` for the given sort."""
+    field, order = _sort_spec(type(item), sort_by, sort_order)
+    return encode_cursor(Cursor(field, order, getattr(item, field), item.id))
+
+
+def page_cursors(
+    items: Sequence[Any],
+    *,
+    limit: int,
+    sort_by: str | None,
+    sort_order: str,
+    after: str | None = None,
+    before: str | None = None,
+    skip: int = 0,
+) -> tuple[str | None, str | None]:
+    """Compute the (next, prev) cursors for a fetched page.
+
+    A full page is assumed to have a successor, so the last page may be
+    followed by one empty page. Pages sorted by a nullable field have no
+    cursors; they are only reachable with ``skip``.
+
+    Returns:
+        Tuple of (next_cursor, prev_cursor); either may be None.
+    """
+    if not items or not keyset_sortable(type(items[0]), sort_by):
+        return None, None
+
+    full_page = len(items) >= limit
+    has_next = full_page if before is None else True
+    has_prev = full_page if before is not None else bool(after or skip)
+
+    next_cursor = (
+        cursor_for(items[-1], sort_by=sort_by, sort_order=sort_order) if has_next else None
+    )
+    prev_cursor = cursor_for(items[0], sort_by=sort_by, sort_order=sort_order) if has_prev else None
+    return next_cursor, prev_cursor
+
+
+__all__ = [
+    "Cursor",
+    "InvalidCursorError",
+    "apply_keyset",
+    "cursor_for",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_sortable",
+    "page_cursors",
+]
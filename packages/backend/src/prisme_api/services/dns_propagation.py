@@ -0,0 +1,280 @@
+"""DNS propagation checker.
+
+Sends raw UDP DNS A queries to each configured resolver concurrently and
+reports what every resolver currently answers for a name. Results are kept
+in a short-lived cache so frontend polling of the status endpoint does not
+turn into a query storm against public resolvers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import socket
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from prisme_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+DNS_PORT = 53
+TYPE_A = 1
+CLASS_IN = 1
+
+# Response codes worth reporting by name
+RCODE_NAMES = {
+    1: "FORMERR",
+    2: "SERVFAIL",
+    3: "NXDOMAIN",
+    4: "NOTIMP",
+    5: "REFUSED",
+}
+
+
+class DNSQueryError(Exception):
+    """Malformed or unusable DNS response."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class ResolverResult:
+    """Answer from a single resolver.
+
+    Attributes:
+        resolver: Resolver address as configured (``host`` or ``host:port``).
+        ips: IPv4 addresses in the answer section (empty if none).
+        ttl: Lowest TTL among the A records, None if there were none.
+        latency_ms: Round-trip time, None if the query failed.
+        error: Timeout/rcode/parse error description, None on success.
+    """
+
+    resolver: str
+    ips: tuple[str, ...] = ()
+    ttl: int | None = None
+    latency_ms: float | None = None
+    error: str | None = None
+
+    def resolves_to(self, ip_address: str) -> bool:
+        """Return True if this resolver answers with ``ip_address``."""
+        return ip_address in self.ips
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    results: list[ResolverResult] = field(default_factory=list)
+
+
+def parse_resolver(resolver: str) -> tuple[str, int]:
+    """Split ``host``, ``host:port`` or ``[v6]:port`` into host and port."""
+    if resolver.startswith("["):
+        host, _, rest = resolver[1:].partition("]")
+        return host, int(rest.lstrip(":") or DNS_PORT)
+    if resolver.count(":") == 1:
+        host, port = resolver.split(":")
+        return host, int(port)
+    return resolver, DNS_PORT
+
+
+def build_query(query_id: int, name: str) -> bytes:
+    """Encode a recursive A/IN query for ``name``."""
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    qname = b"".join(
+        bytes([len(label)]) + label
+        for label in (part.encode("idna") for part in name.rstrip(".").split("."))
+    )
+    return header + qname + b"\x00" + struct.pack("!HH", TYPE_A, CLASS_IN)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    """Return the offset just past the (possibly compressed) name at ``offset``."""
+    while True:
+        if offset >= len(data):
+            raise DNSQueryError("Truncated name")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            # A compression pointer always ends the name
+            return offset + 2
+        if length == 0:
+            return offset + 1
+        offset += length + 1
+
+
+def parse_response(data: bytes, query_id: int) -> tuple[list[str], int | None]:
+    """Decode the A records of a DNS response.
+
+    Returns:
+        Tuple of (IPv4 addresses, lowest TTL or None).
+
+    Raises:
+        DNSQueryError: On ID mismatch, truncation, error rcodes (other than
+            NXDOMAIN, which yields no addresses) or malformed data.
+    """
+    if len(data) < 12:
+        raise DNSQueryError("Response shorter than header")
+    resp_id, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    if resp_id != query_id:
+        raise DNSQueryError("Response ID mismatch")
+    if flags & 0x0200:
+        raise DNSQueryError("Truncated response")
+
+    rcode = flags & 0x000F
+    if rcode == 3:
+        return [], None
+    if rcode:
+        raise DNSQueryError(RCODE_NAMES.get(rcode, f"rcode {rcode}"))
+
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+
+    ips: list[str] = []
+    ttls: list[int] = []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        if offset + 10 > len(data):
+            raise DNSQueryError("Truncated answer")
+        rtype, rclass, ttl, rdlength = struct.unpack("!HHIH", data[offset : offset + 10])
+        offset += 10
+        rdata = data[offset : offset + rdlength]
+        if len(rdata) != rdlength:
+            raise DNSQueryError("Truncated record data")
+        offset += rdlength
+        # CNAME chains come back alongside the final A records; skip them
+        if rtype == TYPE_A and rclass == CLASS_IN and rdlength == 4:
+            ips.append(socket.inet_ntoa(rdata))
+            ttls.append(ttl)
+
+    return ips, min(ttls) if ttls else None
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    """Resolve a future with the first datagram received."""
+
+    def __init__(self, future: asyncio.Future[bytes]) -> None:
+        self.future = future
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class DNSPropagationChecker:
+    """Query several resolvers concurrently with per-resolver timeouts."""
+
+    def __init__(
+        self,
+        resolvers: list[str],
+        timeout: float = 2.0,
+        cache_ttl: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the checker.
+
+        Args:
+            resolvers: Resolver addresses (``host`` or ``host:port``).
+            timeout: Seconds to wait for each resolver.
+            cache_ttl: Seconds a completed check is served from cache.
+                Zero disables caching.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.resolvers = list(resolvers)
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self._clock = clock
+        self._cache: dict[str, _CacheEntry] = {}
+        self._inflight: dict[str, asyncio.Task[list[ResolverResult]]] = {}
+
+    async def check(self, fqdn: str) -> list[ResolverResult]:
+        """Return every resolver's current answer for ``fqdn``.
+
+        Concurrent calls for the same name share one round of queries, and
+        the results are reused for ``cache_ttl`` seconds.
+        """
+        key = fqdn.lower().rstrip(".")
+        now = self._clock()
+        entry = self._cache.get(key)
+        if entry is not None and entry.expires_at > now:
+            return entry.results
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._check_all(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        results = await asyncio.shield(task)
+        if self.cache_ttl > 0:
+            self._cache[key] = _CacheEntry(self._clock() + self.cache_ttl, results)
+        self._prune()
+        return results
+
+    def invalidate(self, fqdn: str) -> None:
+        """Drop cached results for ``fqdn`` (e.g. after its record changed)."""
+        self._cache.pop(fqdn.lower().rstrip("."), None)
+
+    async def _check_all(self, fqdn: str) -> list[ResolverResult]:
+        return list(
+            await asyncio.gather(*(self.query(resolver, fqdn) for resolver in self.resolvers))
+        )
+
+    async def query(self, resolver: str, fqdn: str) -> ResolverResult:
+        """Send one A query to ``resolver``; never raises."""
+        host, port = parse_resolver(resolver)
+        query_id = random.getrandbits(16)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.create_future()
+        transport = None
+        started = time.perf_counter()
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _QueryProtocol(future), remote_addr=(host, port)
+            )
+            transport.sendto(build_query(query_id, fqdn))
+            data = await asyncio.wait_for(future, self.timeout)
+            latency_ms = (time.perf_counter() - started) * 1000
+            ips, ttl = parse_response(data, query_id)
+        except TimeoutError:
+            return ResolverResult(resolver, error="timeout")
+        except (OSError, DNSQueryError) as e:
+            logger.debug(f"DNS query to {resolver} for {fqdn} failed: {e}")
+            return ResolverResult(resolver, error=str(e) or type(e).__name__)
+        finally:
+            if transport is not None:
+                transport.close()
+
+        return ResolverResult(resolver, ips=tuple(ips), ttl=ttl, latency_ms=round(latency_ms, 2))
+
+    def _prune(self) -> None:
+        now = self._clock()
+        for key in [k for k, e in self._cache.items() if e.expires_at <= now]:
+            del self._cache[key]
+
+
+def create_propagation_checker() -> DNSPropagationChecker:
+    """Create the app-lifetime propagation checker from settings."""
+    return DNSPropagationChecker(
+        resolvers=settings.dns_propagation_resolvers,
+        timeout=settings.dns_propagation_timeout,
+        cache_ttl=settings.dns_propagation_cache_ttl,
+    )
+
+
+__all__ = [
+    "DNSPropagationChecker",
+    "DNSQueryError",
+    "ResolverResult",
+    "build_query",
+    "create_propagation_checker",
+    "parse_resolver",
+    "parse_response",
+]
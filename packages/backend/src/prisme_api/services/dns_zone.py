@@ -0,0 +1,466 @@
+"""Local mirror of the Hetzner DNS zone and full-zone reconcile.
+
+``ZoneMirror`` pages through the zone once per ``refresh`` and keeps its A
+records indexed by name and by ID. Request handlers report their own
+writes (``record_written`` / ``record_deleted``), so between refreshes the
+mirror stays current and status lookups read the zone from memory instead
+of calling Hetzner.
+
+``ZoneMirror.diff`` compares the mirror with the subdomain rows:
+
+- missing: active subdomains without an A record (created)
+- stale: A records pointing at another IP than the subdomain's (updated)
+- orphaned: A records for released subdomains, left behind when a release
+  failed to delete its record, and duplicates (deleted)
+- relinked: subdomains whose stored ``dns_record_id`` is not the record
+  found in the zone (ID rewritten)
+
+Only names the app once held are deleted: A records for names no
+subdomain row has (infrastructure or hand-made records in the shared
+zone) are left alone, as are names the zone uses for itself (the apex,
+reserved names such as ``www`` or ``api``, and anything with a dot) and
+subdomains with a write in flight (see ``reconcile_zone``). ``sync``
+applies a diff with the bulk record calls, and ``ZoneReconciler``
+refreshes and diffs in the background every ``interval`` seconds. It only
+logs the drift unless ``dns_zone_repair`` is on; then the worker holding
+the ``dns_zone_repair`` lease repairs, while every uvicorn worker
+refreshes its own mirror.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from prisme_api.config import settings
+from prisme_api.services.hetzner_dns import (
+    ARecord,
+    DNSRecord,
+    HetznerDNSService,
+    is_reserved_subdomain,
+)
+from prisme_api.services.job_lease import acquire_lease, process_id, release_lease
+from prisme_api.services.subdomain import SubdomainService
+
+logger = logging.getLogger(__name__)
+
+
+def is_managed_name(name: str) -> bool:
+    """Whether an A record name can belong to a user's subdomain."""
+    return name not in ("@", "*") and "." not in name and not is_reserved_subdomain(name)
+
+
+@dataclass
+class ZoneDiff:
+    """Differences between the zone and the subdomain rows."""
+
+    missing: list[ARecord] = field(default_factory=list)
+    stale: list[ARecord] = field(default_factory=list)
+    orphaned: list[DNSRecord] = field(default_factory=list)
+    # Subdomain name -> ID of its record in the zone
+    relinked: dict[str, str] = field(default_factory=dict)
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """True if any record or stored record ID needs repair."""
+        return bool(self.missing or self.stale or self.orphaned or self.relinked)
+
+
+@dataclass
+class ZoneSyncResult:
+    """Outcome (or, for a dry run, plan) of a zone reconcile."""
+
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    relinked: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    dry_run: bool = False
+    # Subdomain name -> record ID to store (created and relinked records)
+    record_ids: dict[str, str] = field(default_factory=dict)
+
+
+class ZoneMirror:
+    """In-memory index of the zone's A records."""
+
+    def __init__(self, dns_service: HetznerDNSService, *, page_size: int = 100) -> None:
+        """Initialize an empty mirror.
+
+        Args:
+            dns_service: Service used to page through and repair the zone.
+            page_size: Records per page when listing the zone.
+        """
+        self.dns_service = dns_service
+        self.page_size = page_size
+        self.refreshed_at: float | None = None
+        self._by_id: dict[str, DNSRecord] = {}
+        self._by_name: dict[str, list[DNSRecord]] = {}
+        self._refresh_lock = asyncio.Lock()
+        # Writes reported while a refresh is listing the zone, replayed on top
+        self._concurrent_writes: list[tuple[str, DNSRecord | None]] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the zone has been listed at least once."""
+        return self.refreshed_at is not None
+
+    # ── Lookups ─────────────────────────────────────────────────
+
+    def get(self, record_id: str) -> DNSRecord | None:
+        """Get an A record by ID."""
+        return self._by_id.get(record_id)
+
+    def lookup(self, name: str) -> DNSRecord | None:
+        """Get the A record for a subdomain name (the first, if duplicated)."""
+        records = self._by_name.get(name.lower())
+        return records[0] if records else None
+
+    # ── Keeping the mirror current ──────────────────────────────
+
+    async def refresh(self) -> None:
+        """Re-list the whole zone and replace the index.
+
+        Raises:
+            HetznerDNSError: If the zone cannot be listed (the index is kept)
+        """
+        async with self._refresh_lock:
+            writes: list[tuple[str, DNSRecord | None]] = []
+            self._concurrent_writes = writes
+            try:
+                records = await self.dns_service.list_records(page_size=self.page_size)
+            finally:
+                self._concurrent_writes = None
+
+            self._by_id = {}
+            self._by_name = {}
+            for record in records:
+                if record.type == "A":
+                    self._index(record)
+            for record_id, written in writes:
+                self._apply(record_id, written)
+            self.refreshed_at = time.monotonic()
+        logger.info(f"DNS zone mirror refreshed: {len(self._by_id)} A records")
+
+    def record_written(self, record_id: str, name: str, ip_address: str, ttl: int = 300) -> None:
+        """Record an A record created or updated through the API."""
+        record = DNSRecord(
+            id=record_id,
+            name=name.lower(),
+            type="A",
+            value=ip_address,
+            ttl=ttl,
+            zone_id=self.dns_service.zone_id or "",
+        )
+        self._apply(record_id, record)
+
+    def record_deleted(self, record_id: str) -> None:
+        """Record an A record deleted through the API."""
+        self._apply(record_id, None)
+
+    def _apply(self, record_id: str, record: DNSRecord | None) -> None:
+        if self._concurrent_writes is not None:
+            self._concurrent_writes.append((record_id, record))
+        self._unindex(record_id)
+        if record is not None:
+            self._index(record)
+
+    def _index(self, record: DNSRecord) -> None:
+        self._by_id[record.id] = record
+        self._by_name.setdefault(record.name, []).append(record)
+
+    def _unindex(self, record_id: str) -> None:
+        old = self._by_id.pop(record_id, None)
+        if old is None:
+            return
+        remaining = [r for r in self._by_name.get(old.name, []) if r.id != record_id]
+        if remaining:
+            self._by_name[old.name] = remaining
+        else:
+            self._by_name.pop(old.name, None)
+
+    # ── Reconcile ───────────────────────────────────────────────
+
+    def diff(self, subdomains: list[dict]) -> ZoneDiff:
+        """Compare the mirror with the subdomain rows.
+
+        Args:
+            subdomains: Dicts with 'name', 'status', 'ip_address',
+                'dns_record_id' and optionally 'busy' keys, as returned by
+                SubdomainService.dns_targets. Busy subdomains and their
+                records are left alone.
+
+        Returns:
+            What has to change for the zone to match the active subdomains
+        """
+        diff = ZoneDiff()
+        # Records of released names are left over from the app's own writes;
+        # a name no row has may be anyone's record in the shared zone
+        released = {
+            s["name"] for s in subdomains if s["status"] == "released" and not s.get("busy")
+        }
+
+        for subdomain in subdomains:
+            name = subdomain["name"]
+            records = self._by_name.get(name, [])
+            if subdomain.get("busy"):
+                continue
+            if subdomain["status"] != "active" or not subdomain["ip_address"]:
+                # Reserved and suspended subdomains keep whatever they have;
+                # released ones are handled below
+                continue
+            if not records:
+                diff.missing.append(ARecord(name, subdomain["ip_address"]))
+                continue
+
+            # Prefer the record the row points at; other records are duplicates
+            keep = next((r for r in records if r.id == subdomain["dns_record_id"]), records[0])
+            diff.orphaned.extend(r for r in records if r is not keep)
+            if keep.id != subdomain["dns_record_id"]:
+                diff.relinked[name] = keep.id
+            if keep.value != subdomain["ip_address"]:
+                diff.stale.append(ARecord(name, subdomain["ip_address"], record_id=keep.id))
+            elif keep.id == subdomain["dns_record_id"]:
+                diff.unchanged += 1
+
+        for name, records in self._by_name.items():
+            if name in released and is_managed_name(name):
+                diff.orphaned.extend(records)
+        return diff
+
+    async def sync(self, subdomains: list[dict], *, dry_run: bool = False) -> ZoneSyncResult:
+        """Repair the zone so it matches the active subdomains.
+
+        Missing records are created and stale ones updated with the bulk
+        endpoints, orphans are deleted. Failures are reported per record
+        rather than raised. The caller stores ``record_ids`` on the rows.
+
+        Args:
+            subdomains: As for ``diff``
+            dry_run: Only report what would change
+
+        Returns:
+            The names changed (or to change) and the record IDs to store
+        """
+        diff = self.diff(subdomains)
+        result = ZoneSyncResult(unchanged=diff.unchanged, dry_run=dry_run)
+        if dry_run:
+            result.created = [r.subdomain for r in diff.missing]
+            result.updated = [r.subdomain for r in diff.stale]
+            result.deleted = [r.name for r in diff.orphaned]
+            result.relinked = list(diff.relinked)
+            return result
+
+        result.relinked = list(diff.relinked)
+        result.record_ids.update(diff.relinked)
+        stale_ids = {r.record_id: r for r in diff.stale}
+        orphan_ids = {r.id: r for r in diff.orphaned}
+
+        created, updated, deleted = await asyncio.gather(
+            self.dns_service.bulk_create_a_records(diff.missing),
+            self.dns_service.bulk_update_a_records(diff.stale),
+            self.dns_service.bulk_delete(list(orphan_ids)),
+        )
+        for record, outcome in zip(diff.missing, created, strict=True):
+            if outcome.ok and outcome.record_id:
+                self.record_written(outcome.record_id, record.subdomain, record.ip_address)
+                result.created.append(record.subdomain)
+                result.record_ids[record.subdomain] = outcome.record_id
+            else:
+                result.failed.append(f"{record.subdomain}: {outcome.error}")
+        for outcome in updated:
+            record = stale_ids[outcome.key]
+            if outcome.ok:
+                self.record_written(outcome.key, record.subdomain, record.ip_address)
+                result.updated.append(record.subdomain)
+            else:
+                result.failed.append(f"{record.subdomain}: {outcome.error}")
+        for outcome in deleted:
+            orphan = orphan_ids[outcome.key]
+            if outcome.ok:
+                self.record_deleted(outcome.key)
+                result.deleted.append(orphan.name)
+            else:
+                result.failed.append(f"{orphan.name}: {outcome.error}")
+        return result
+
+
+async def reconcile_zone(
+    mirror: ZoneMirror,
+    db: AsyncSession,
+    *,
+    dry_run: bool = False,
+    settle_seconds: float | None = None,
+) -> ZoneSyncResult:
+    """Refresh the mirror, repair the zone and store new record IDs.
+
+    The zone is listed before the rows are read, so a row whose activation
+    has written DNS but not yet committed looks stale. Rows updated within
+    ``settle_seconds`` or with a background activation in progress are
+    skipped. When there is something to repair, the rows are read again
+    after ``settle_seconds`` and every row that changed meanwhile is
+    skipped as well. Record IDs are only stored on rows that still hold the
+    ID read at the start.
+
+    Args:
+        mirror: The app-lifetime zone mirror
+        db: Session used to read the subdomains and write record IDs
+        dry_run: Only report what would change
+        settle_seconds: Defaults to ``settings.dns_zone_settle_seconds``
+
+    Raises:
+        HetznerDNSError: If the zone cannot be listed
+    """
+    if settle_seconds is None:
+        settle_seconds = settings.dns_zone_settle_seconds
+    await mirror.refresh()
+    service = SubdomainService(db)
+    targets = await service.dns_targets(settle_seconds)
+    if not dry_run and settle_seconds > 0 and mirror.diff(targets).changed:
+        # End the read transaction so the second read sees new commits
+        await db.commit()
+        await asyncio.sleep(settle_seconds)
+        current = {t["name"]: t for t in await service.dns_targets(settle_seconds)}
+        names = {t["name"] for t in targets}
+        targets = [t if current.get(t["name"]) == t else {**t, "busy": True} for t in targets]
+        targets += [{**t, "busy": True} for name, t in current.items() if name not in names]
+
+    result = await mirror.sync(targets, dry_run=dry_run)
+    if not dry_run:
+        expected = {t["name"]: t["dns_record_id"] for t in targets}
+        await service.set_dns_record_ids(result.record_ids, expected)
+    return result
+
+
+class ZoneReconciler:
+    """Background full-zone reconcile.
+
+    Repairs run in one process at a time: each run first takes or renews
+    the ``dns_zone_repair`` lease. The other processes only refresh their
+    mirrors.
+    """
+
+    LEASE_NAME = "dns_zone_repair"
+
+    def __init__(
+        self,
+        mirror: ZoneMirror,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        interval: float = 900.0,
+        repair: bool = False,
+    ) -> None:
+        """Initialize the reconciler.
+
+        Args:
+            mirror: The zone mirror to refresh.
+            session_factory: Creates database sessions (e.g. ``async_session``).
+            interval: Seconds between reconciles; 0 disables the
+                background loop (the mirror is then only loaded by
+                ``reconcile_zone`` calls, e.g. the admin endpoint).
+            repair: Repair drift; if False (the default), only refresh
+                the mirror and log the drift.
+        """
+        self.mirror = mirror
+        self._session_factory = session_factory
+        self.interval = interval
+        self.repair = repair
+        self.holder = process_id()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+
+    async def run_once(self) -> ZoneSyncResult | None:
+        """Refresh the mirror and reconcile the zone once.
+
+        Returns:
+            The reconcile result, or None if another process holds the
+            repair lease (the mirror is only refreshed)
+        """
+        async with self._session_factory() as db:
+            # Outlives the jittered interval, so the holder keeps it between runs
+            ttl = max(self.interval * 1.5, 60.0)
+            if self.repair and not await acquire_lease(db, self.LEASE_NAME, self.holder, ttl):
+                await self.mirror.refresh()
+                return None
+            result = await reconcile_zone(self.mirror, db, dry_run=not self.repair)
+        if result.created or result.updated or result.deleted or result.relinked:
+            action = "would repair" if result.dry_run else "repaired"
+            logger.warning(
+                f"DNS zone drift {action}: created={result.created} "
+                f"updated={result.updated} deleted={result.deleted} "
+                f"relinked={result.relinked}"
+            )
+        for failure in result.failed:
+            logger.error(f"DNS zone repair failed for {failure}")
+        return result
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("DNS zone reconcile failed")
+            # Jitter keeps the workers of several processes from reconciling in step
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), self.interval * random.uniform(0.8, 1.2)
+                )
+            except TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start reconciling in the background (the first run loads the mirror)."""
+        if self._task is None and self.interval > 0:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop after the reconcile in progress."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+            if self.repair:
+                try:
+                    async with self._session_factory() as db:
+                        await release_lease(db, self.LEASE_NAME, self.holder)
+                except Exception:
+                    logger.exception("Failed to release the DNS zone repair lease")
+
+
+def create_zone_reconciler(
+    dns_service: HetznerDNSService | None,
+    session_factory: Callable[[], AsyncSession],
+) -> ZoneReconciler | None:
+    """Create the app-lifetime zone mirror and its reconciler.
+
+    Called once from the application lifespan. Returns None if DNS is not
+    configured.
+    """
+    if dns_service is None:
+        return None
+    mirror = ZoneMirror(dns_service, page_size=settings.dns_zone_page_size)
+    return ZoneReconciler(
+        mirror,
+        session_factory,
+        interval=settings.dns_zone_reconcile_interval,
+        repair=settings.dns_zone_repair,
+    )
+
+
+__all__ = [
+    "ZoneDiff",
+    "ZoneMirror",
+    "ZoneReconciler",
+    "ZoneSyncResult",
+    "create_zone_reconciler",
+    "is_managed_name",
+    "reconcile_zone",
+]
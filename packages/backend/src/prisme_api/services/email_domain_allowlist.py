@@ -0,0 +1,212 @@
+"""In-process snapshot of the signup email-domain allowlist.
+
+Signup and GitHub account creation check every new email against the
+``allowed_email_domains`` table. Rather than querying it on each check, this
+module loads all rows with one query into an immutable ``AllowlistSnapshot``
+and answers from memory until the snapshot expires or is invalidated.
+
+Entries are either exact domains (``example.com``), held in a frozenset, or
+wildcards (``*.example.edu``), held in a trie keyed by reversed labels
+(``edu`` -> ``example``). A wildcard matches any subdomain of its suffix but
+not the suffix itself, so lookups cost one step per label of the email
+domain regardless of how many entries exist.
+
+Each snapshot is stamped with the cache *version* it was loaded under.
+``invalidate`` bumps the version, so a load that raced with a write is never
+installed. ``AllowedEmailDomainService`` invalidates after every create,
+update and delete, which covers the REST, GraphQL and MCP mutations.
+
+The snapshot is per process; the TTL bounds how long another uvicorn worker
+may use an allowlist that predates a change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.models.allowed_email_domain import AllowedEmailDomain
+
+WILDCARD_PREFIX = "*."
+
+
+def normalize_domain(domain: str) -> str:
+    """Lower-case a domain and drop surrounding whitespace and a trailing dot."""
+    return domain.strip().lower().rstrip(".")
+
+
+@dataclass
+class _LabelNode:
+    children: dict[str, _LabelNode] = field(default_factory=dict)
+    wildcard: bool = False
+
+
+class DomainSuffixTrie:
+    """Wildcard entries keyed by reversed domain labels."""
+
+    def __init__(self, suffixes: Iterable[str] = ()) -> None:
+        self._root = _LabelNode()
+        self._size = 0
+        for suffix in suffixes:
+            self.add(suffix)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, suffix: str) -> None:
+        """Allow every subdomain of ``suffix`` (e.g. ``example.edu``)."""
+        node = self._root
+        for label in reversed(suffix.split(".")):
+            node = node.children.setdefault(label, _LabelNode())
+        if not node.wildcard:
+            node.wildcard = True
+            self._size += 1
+
+    def matches(self, domain: str) -> bool:
+        """Whether ``domain`` is a strict subdomain of an added suffix."""
+        labels = domain.split(".")
+        node = self._root
+        for depth, label in enumerate(reversed(labels), start=1):
+            child = node.children.get(label)
+            if child is None:
+                return False
+            if child.wildcard and depth < len(labels):
+                return True
+            node = child
+        return False
+
+
+@dataclass(frozen=True)
+class AllowlistSnapshot:
+    """Immutable view of the allowlist at one point in time."""
+
+    version: int
+    domains: frozenset[str]
+    wildcards: DomainSuffixTrie
+    # No rows at all (active or not): every domain is allowed
+    allow_all: bool
+    expires_at: float
+
+    @classmethod
+    def build(
+        cls, rows: Iterable[tuple[str, bool]], *, version: int, expires_at: float
+    ) -> AllowlistSnapshot:
+        """Build a snapshot from ``(domain, is_active)`` rows."""
+        domains: set[str] = set()
+        wildcards = DomainSuffixTrie()
+        total = 0
+        for domain, is_active in rows:
+            total += 1
+            if not is_active:
+                continue
+            domain = normalize_domain(domain)
+            if domain.startswith(WILDCARD_PREFIX):
+                wildcards.add(domain.removeprefix(WILDCARD_PREFIX))
+            else:
+                domains.add(domain)
+        return cls(
+            version=version,
+            domains=frozenset(domains),
+            wildcards=wildcards,
+            allow_all=total == 0,
+            expires_at=expires_at,
+        )
+
+    def allows(self, domain: str) -> bool:
+        """Whether signups from ``domain`` are allowed."""
+        if self.allow_all:
+            return True
+        domain = normalize_domain(domain)
+        return domain in self.domains or self.wildcards.matches(domain)
+
+
+class EmailDomainAllowlist:
+    """TTL-limited, version-stamped cache of one ``AllowlistSnapshot``."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Lifetime of a snapshot. ``0`` reloads on every check.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._snapshot: AllowlistSnapshot | None = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    @property
+    def version(self) -> int:
+        """Current cache version; bumped by every ``invalidate``."""
+        return self._version
+
+    def current(self) -> AllowlistSnapshot | None:
+        """Return the cached snapshot if it is still valid."""
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or snapshot.version != self._version
+            or snapshot.expires_at <= self._clock()
+        ):
+            return None
+        return snapshot
+
+    async def get(self, db: AsyncSession) -> AllowlistSnapshot:
+        """Return a valid snapshot, loading it with ``db`` if needed.
+
+        Concurrent callers on a cold cache wait for a single load.
+        """
+        snapshot = self.current()
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self.current()
+            if snapshot is not None:
+                return snapshot
+
+            version = self._version
+            result = await db.execute(
+                select(AllowedEmailDomain.domain, AllowedEmailDomain.is_active)
+            )
+            self.loads += 1
+            snapshot = AllowlistSnapshot.build(
+                result.all(),
+                version=version,
+                expires_at=self._clock() + self.ttl_seconds,
+            )
+            if version == self._version and self.ttl_seconds > 0:
+                self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; call after any change to the allowlist table."""
+        self._version += 1
+        self._snapshot = None
+
+
+# Singleton instance
+email_domain_allowlist = EmailDomainAllowlist(
+    ttl_seconds=auth_settings.email_domain_allowlist_ttl_seconds,
+)
+
+
+__all__ = [
+    "AllowlistSnapshot",
+    "DomainSuffixTrie",
+    "EmailDomainAllowlist",
+    "email_domain_allowlist",
+    "normalize_domain",
+]
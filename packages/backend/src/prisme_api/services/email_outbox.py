@@ -0,0 +1,279 @@
+"""Transactional email outbox.
+
+Request handlers never talk to the email provider. ``enqueue_email`` adds
+an ``EmailOutbox`` row to the caller's session, so the email is committed
+(or rolled back) together with the change that triggered it, and the
+handler returns without waiting on a third-party API.
+
+``EmailOutboxWorker`` runs in the application lifespan and delivers due
+rows through an ``EmailTransport`` with bounded concurrency. Failed sends
+are retried with jittered exponential backoff until ``max_attempts``.
+Rows are claimed with a conditional UPDATE that also sets a lease, so the
+workers of several uvicorn processes never send the same row at once, and
+rows left behind by a crashed process are retried when their lease expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.models.email_outbox import EmailOutbox
+from prisme_api.services.email_transport import (
+    EmailMessage,
+    EmailTransport,
+    create_email_transport,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def enqueue_email(
+    db: AsyncSession,
+    to: str,
+    subject: str,
+    html: str,
+    text: str,
+    *,
+    idempotency_key: str | None = None,
+) -> EmailOutbox:
+    """Queue an email in the caller's transaction.
+
+    The row is only added to the session; it is delivered once the caller
+    commits.
+
+    Args:
+        db: The request's database session.
+        to: Recipient address.
+        subject: Subject line.
+        html: HTML body.
+        text: Plain-text body.
+        idempotency_key: Key identifying this email at the provider
+            (generated if omitted).
+
+    Returns:
+        The pending outbox row.
+    """
+    row = EmailOutbox(
+        idempotency_key=idempotency_key or uuid.uuid4().hex,
+        to=to,
+        subject=subject,
+        html=html,
+        text=text,
+        status=PENDING,
+        attempts=0,
+        next_attempt_at=datetime.now(UTC),
+    )
+    db.add(row)
+    return row
+
+
+class EmailOutboxWorker:
+    """Background delivery of outbox rows."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        transport: EmailTransport,
+        *,
+        sender: str,
+        concurrency: int = 4,
+        batch_size: int = 20,
+        poll_interval: float = 1.0,
+        max_attempts: int = 8,
+        base_delay: float = 5.0,
+        max_delay: float = 3600.0,
+        lease: float = 120.0,
+    ) -> None:
+        """Initialize the worker.
+
+        Args:
+            session_factory: Creates database sessions (e.g. ``async_session``).
+            transport: Delivery backend.
+            sender: ``From`` address for every message.
+            concurrency: Maximum sends in flight.
+            batch_size: Rows claimed per poll.
+            poll_interval: Seconds to wait when the outbox is drained.
+            max_attempts: Attempts before a row is marked failed.
+            base_delay: Backoff after the first failure, in seconds.
+            max_delay: Upper bound for the backoff, in seconds.
+            lease: Seconds a claimed row is reserved for this worker.
+        """
+        self._session_factory = session_factory
+        self.transport = transport
+        self.sender = sender
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before retrying a row that has failed ``attempts`` times."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        # Full jitter on the upper half spreads out retries of a failed batch
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _claim(self) -> list[EmailOutbox]:
+        now = datetime.now(UTC)
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status.in_((PENDING, SENDING)),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(self.batch_size)
+        )
+        async with self._session_factory() as db:
+            # The due-check is repeated on the row itself, so a row claimed by
+            # another worker in the meantime (lease in the future) is skipped
+            result = await db.execute(
+                update(EmailOutbox)
+                .where(
+                    EmailOutbox.id.in_(due.scalar_subquery()),
+                    EmailOutbox.status.in_((PENDING, SENDING)),
+                    EmailOutbox.next_attempt_at <= now,
+                )
+                .values(
+                    status=SENDING,
+                    attempts=EmailOutbox.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=self.lease),
+                )
+                .returning(EmailOutbox)
+                .execution_options(synchronize_session=False)
+            )
+            rows = list(result.scalars().all())
+            await db.commit()
+        return rows
+
+    async def _deliver(self, row: EmailOutbox) -> dict[str, object]:
+        """Send one row and return the column values recording the outcome."""
+        message = EmailMessage(
+            sender=self.sender,
+            to=row.to,
+            subject=row.subject,
+            html=row.html,
+            text=row.text,
+            idempotency_key=row.idempotency_key,
+        )
+        async with self._semaphore:
+            try:
+                provider_id = await self.transport.send(message)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                return {
+                    "status": SENT,
+                    "sent_at": datetime.now(UTC),
+                    "provider_message_id": provider_id,
+                    "last_error": None,
+                }
+
+        if row.attempts >= self.max_attempts:
+            logger.error(f"Giving up on email {row.id} to {row.to} after {row.attempts} attempts")
+            return {"status": FAILED, "last_error": error}
+
+        delay = self.backoff(row.attempts)
+        logger.warning(f"Email {row.id} attempt {row.attempts} failed, retry in {delay:.0f}s")
+        return {
+            "status": PENDING,
+            "last_error": error,
+            "next_attempt_at": datetime.now(UTC) + timedelta(seconds=delay),
+        }
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch of due rows.
+
+        Returns:
+            Number of rows processed (sent, rescheduled or failed).
+        """
+        rows = await self._claim()
+        if not rows:
+            return 0
+
+        outcomes = await asyncio.gather(*(self._deliver(row) for row in rows))
+        # Record the whole batch in one transaction. If this is lost, the
+        # leases expire and the rows are resent under the same idempotency key.
+        async with self._session_factory() as db:
+            for row, values in zip(rows, outcomes, strict=True):
+                await db.execute(
+                    update(EmailOutbox).where(EmailOutbox.id == row.id).values(**values)
+                )
+            await db.commit()
+        return len(rows)
+
+    def wake(self) -> None:
+        """Poll immediately instead of waiting for the next interval."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Email outbox poll failed")
+                processed = 0
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling after the batch in progress and close the transport."""
+        if self._task is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.transport.close()
+
+
+def create_email_outbox_worker(
+    session_factory: Callable[[], AsyncSession],
+) -> EmailOutboxWorker:
+    """Create the app-lifetime outbox worker from auth settings."""
+    return EmailOutboxWorker(
+        session_factory,
+        create_email_transport(
+            auth_settings.email_transport, resend_api_key=auth_settings.resend_api_key
+        ),
+        sender=auth_settings.email_from,
+        concurrency=auth_settings.email_outbox_concurrency,
+        batch_size=auth_settings.email_outbox_batch_size,
+        poll_interval=auth_settings.email_outbox_poll_interval,
+        max_attempts=auth_settings.email_outbox_max_attempts,
+    )
+
+
+__all__ = [
+    "EmailOutboxWorker",
+    "create_email_outbox_worker",
+    "enqueue_email",
+]
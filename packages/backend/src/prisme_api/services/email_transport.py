@@ -0,0 +1,211 @@
+"""Pluggable delivery backends for outgoing email.
+
+The outbox worker hands every message to an ``EmailTransport``. Which one
+is used is selected by ``EMAIL_TRANSPORT``:
+
+- ``resend`` - the Resend API (production).
+- ``smtp://[user:password@]host[:port]`` - any SMTP server, e.g. a local
+  Mailpit/MailHog during development (``smtps://`` for implicit TLS,
+  ``?starttls=true`` to upgrade a plain connection).
+- ``file:///path/to/dir`` - writes each message as an ``.eml`` file; a sink
+  for tests and offline development.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import smtplib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from email.message import EmailMessage as MIMEMessage
+from email.utils import make_msgid
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+import resend
+
+from prisme_api.metrics import observe_outbound
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTransportError(Exception):
+    """Delivery failed; the outbox retries the message later."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class EmailMessage:
+    """A message ready for delivery."""
+
+    sender: str
+    to: str
+    subject: str
+    html: str
+    text: str
+    # Stable across retries of the same outbox row
+    idempotency_key: str
+
+    def to_mime(self) -> MIMEMessage:
+        """Build a multipart text/HTML MIME message."""
+        mime = MIMEMessage()
+        mime["From"] = self.sender
+        mime["To"] = self.to
+        mime["Subject"] = self.subject
+        mime["Message-ID"] = make_msgid(idstring=self.idempotency_key)
+        mime.set_content(self.text)
+        mime.add_alternative(self.html, subtype="html")
+        return mime
+
+
+class EmailTransport(ABC):
+    """Delivers a single message."""
+
+    @abstractmethod
+    async def send(self, message: EmailMessage) -> str | None:
+        """Deliver ``message``.
+
+        Returns:
+            The provider's message ID, if it returns one.
+
+        Raises:
+            EmailTransportError: If delivery failed.
+        """
+
+    async def close(self) -> None:
+        """Release resources held by the transport."""
+        return None
+
+
+class ResendTransport(EmailTransport):
+    """Send through the Resend API.
+
+    The SDK is synchronous, so calls run in a worker thread. The outbox
+    row's idempotency key is passed as Resend's ``Idempotency-Key`` so a
+    retry after a lost response is not delivered twice.
+    """
+
+    def __init__(self, api_key: str) -> None:
+        resend.api_key = api_key
+
+    async def send(self, message: EmailMessage) -> str | None:
+        params: resend.Emails.SendParams = {
+            "from": message.sender,
+            "to": [message.to],
+            "subject": message.subject,
+            "html": message.html,
+            "text": message.text,
+        }
+        options: resend.Emails.SendOptions = {"idempotency_key": message.idempotency_key}
+        try:
+            with observe_outbound("resend", "POST"):
+                response = await asyncio.to_thread(resend.Emails.send, params, options)
+        except Exception as e:
+            raise EmailTransportError(f"Resend send failed: {e}") from e
+        return response.get("id") if isinstance(response, dict) else None
+
+
+class SMTPTransport(EmailTransport):
+    """Send through an SMTP server (one connection per message)."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        *,
+        username: str | None = None,
+        password: str | None = None,
+        use_ssl: bool = False,
+        starttls: bool = False,
+        timeout: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send_sync(self, mime: MIMEMessage) -> None:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        with smtp_class(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(mime)
+
+    async def send(self, message: EmailMessage) -> str | None:
+        mime = message.to_mime()
+        try:
+            await asyncio.to_thread(self._send_sync, mime)
+        except (OSError, smtplib.SMTPException) as e:
+            raise EmailTransportError(f"SMTP send failed: {e}") from e
+        return mime["Message-ID"]
+
+
+class FileTransport(EmailTransport):
+    """Write each message to ``<directory>/<idempotency_key>.eml``.
+
+    Retries overwrite the same file, so each outbox row yields one file.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    def _write(self, message: EmailMessage) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{message.idempotency_key}.eml"
+        path.write_bytes(message.to_mime().as_bytes())
+        return path
+
+    async def send(self, message: EmailMessage) -> str | None:
+        try:
+            path = await asyncio.to_thread(self._write, message)
+        except OSError as e:
+            raise EmailTransportError(f"Writing {message.idempotency_key}.eml failed: {e}") from e
+        return path.name
+
+
+def create_email_transport(spec: str, *, resend_api_key: str = "") -> EmailTransport:
+    """Build a transport from an ``EMAIL_TRANSPORT`` value.
+
+    Args:
+        spec: ``resend``, ``smtp://...`` or ``file:///...``.
+        resend_api_key: API key for the Resend transport.
+
+    Raises:
+        ValueError: If the transport is not recognised.
+    """
+    if spec == "resend":
+        if not resend_api_key:
+            logger.warning("RESEND_API_KEY not set - outgoing email will fail and be retried")
+        return ResendTransport(resend_api_key)
+
+    url = urlparse(spec)
+    if url.scheme in ("smtp", "smtps"):
+        return SMTPTransport(
+            url.hostname or "localhost",
+            url.port or (465 if url.scheme == "smtps" else 25),
+            username=unquote(url.username) if url.username else None,
+            password=unquote(url.password) if url.password else None,
+            use_ssl=url.scheme == "smtps",
+            starttls=parse_qs(url.query).get("starttls") == ["true"],
+        )
+    if url.scheme == "file":
+        return FileTransport(unquote(url.path))
+    raise ValueError(f"Unknown email transport: {spec!r}")
+
+
+__all__ = [
+    "EmailMessage",
+    "EmailTransport",
+    "EmailTransportError",
+    "FileTransport",
+    "ResendTransport",
+    "SMTPTransport",
+    "create_email_transport",
+]
@@ -1,15 +1,52 @@
 """Hetzner DNS management service.
 
 Custom service for managing DNS records via Hetzner DNS API.
+
+Besides the single-record calls, ``bulk_create_a_records`` and
+``bulk_update_a_records`` use Hetzner's ``/records/bulk`` endpoints, and
+``bulk_delete`` issues individual DELETEs (the API has no bulk delete).
+All three split their input into chunks of ``bulk_chunk_size``, run at
+most ``bulk_concurrency`` requests at a time and return a
+``BulkRecordResult`` per record instead of raising on the first failure.
+``list_records`` pages through the whole zone (see ``dns_zone.py``).
+
+Every call goes through ``_request``. Responses 429 and 5xx, and transport
+errors, are retried with jittered exponential backoff that waits at least
+as long as ``Retry-After`` asks. POSTs create records, so they are only
+retried when the request cannot have been processed (429, connection
+failures); a duplicate that slips through is removed by the zone
+reconcile. A ``CircuitBreaker`` counts these failures and, while the API
+is unhealthy, rejects calls at once with ``HetznerDNSUnavailableError``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import logging
 import os
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any, cast
 
 import httpx
 
+from prisme_api.config import settings
+from prisme_api.metrics import OUTBOUND_RETRIES, InstrumentedTransport
+from prisme_api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Responses worth retrying: rate limited or a server-side failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
 
 class HetznerDNSError(Exception):
     """Hetzner DNS API error."""
@@ -17,6 +54,14 @@ class HetznerDNSError(Exception):
     pass
 
 
+class HetznerDNSUnavailableError(HetznerDNSError):
+    """Hetzner DNS is failing; calls are rejected until the circuit closes."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 @dataclass
 class DNSRecord:
     """DNS record representation."""
@@ -29,6 +74,32 @@ class DNSRecord:
     zone_id: str
 
 
+@dataclass(frozen=True)
+class ARecord:
+    """Desired state of a subdomain's A record."""
+
+    subdomain: str
+    ip_address: str
+    ttl: int = 300
+    # Required for updates
+    record_id: str | None = None
+
+
+@dataclass(frozen=True)
+class BulkRecordResult:
+    """Outcome for one record of a bulk operation."""
+
+    # Subdomain for creates, record ID for updates and deletes
+    key: str
+    record_id: str | None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the record was created, updated or deleted."""
+        return self.error is None
+
+
 class HetznerDNSService:
     """Service for managing Hetzner DNS records."""
 
@@ -39,14 +110,49 @@ class HetznerDNSService:
         self,
         api_token: str | None = None,
         zone_id: str | None = None,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 30.0,
+        bulk_chunk_size: int = 100,
+        bulk_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 10.0,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         """Initialize the Hetzner DNS service.
 
+        The service owns a pooled HTTP client and is meant to live for the
+        whole application (see ``create_dns_service``), so connections to
+        dns.hetzner.com are kept alive and reused across requests.
+
         Args:
             api_token: Hetzner DNS API token. If not provided, reads from
                 HETZNER_DNS_API_TOKEN environment variable.
             zone_id: Hetzner DNS zone ID for madewithpris.me. If not provided,
                 reads from HETZNER_DNS_ZONE_ID environment variable.
+            max_connections: Maximum concurrent connections in the pool.
+            max_keepalive_connections: Idle connections kept open for reuse.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            http2: Use HTTP/2 when the ``h2`` package is installed.
+            timeout: Request timeout in seconds. No retry is started once
+                a call has been running this long.
+            bulk_chunk_size: Records per request in bulk operations.
+            bulk_concurrency: Concurrent requests in bulk operations.
+            max_retries: Retries per call after the first attempt.
+            retry_base_delay: Backoff before the first retry, in seconds.
+            retry_max_delay: Upper bound for the backoff, and the longest
+                ``Retry-After`` that is waited out, in seconds.
+            breaker_threshold: Consecutive failures that open the circuit.
+            breaker_reset_timeout: Seconds the circuit stays open.
+            transport: Custom httpx transport (tests use a mock transport).
+                Either way requests are recorded in the ``outbound_*``
+                metrics under ``service="hetzner_dns"``.
 
         Raises:
             HetznerDNSError: If API token or zone ID is not configured.
@@ -57,12 +163,115 @@ class HetznerDNSService:
         if not self.api_token or not self.zone_id:
             raise HetznerDNSError("HETZNER_DNS_API_TOKEN and HETZNER_DNS_ZONE_ID required")
 
+        self.bulk_chunk_size = bulk_chunk_size
+        self.bulk_concurrency = bulk_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.breaker = CircuitBreaker(
+            "hetzner_dns",
+            failure_threshold=breaker_threshold,
+            reset_timeout=breaker_reset_timeout,
+        )
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 package not installed - Hetzner DNS client falls back to HTTP/1.1")
+            http2 = False
+
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                http2=http2,
+            )
         self._client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers={"Auth-API-Token": self.api_token},
-            timeout=30.0,
+            timeout=timeout,
+            transport=InstrumentedTransport(transport, "hetzner_dns"),
         )
 
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures.
+
+        Returns the last response, which may still be a 429 or 5xx once the
+        retries are used up; callers turn it into a ``HetznerDNSError``.
+
+        Raises:
+            HetznerDNSUnavailableError: If the circuit is open
+            HetznerDNSError: If the request could not be sent
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                raise HetznerDNSUnavailableError(
+                    "Hetzner DNS is unavailable, try again later", e.retry_after
+                ) from e
+
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                # A POST that failed to connect never reached Hetzner
+                sent = not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                delay = self._retry_delay(method, attempt, started, sent=sent)
+                if delay is None:
+                    raise HetznerDNSError(f"Hetzner DNS request failed: {e!r}") from e
+                reason = "error"
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                delay = self._retry_delay(
+                    method,
+                    attempt,
+                    started,
+                    sent=response.status_code != 429,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+                if delay is None:
+                    return response
+                reason = str(response.status_code)
+
+            OUTBOUND_RETRIES.labels("hetzner_dns", reason).inc()
+            logger.warning(
+                f"Hetzner DNS {method} {url} failed ({reason}), retry {attempt + 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        started: float,
+        *,
+        sent: bool,
+        retry_after: float | None = None,
+    ) -> float | None:
+        """Delay before the next retry, or None to give up."""
+        if attempt >= self.max_retries or (sent and method == "POST"):
+            return None
+        delay = backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+        if retry_after is not None:
+            if retry_after > self.retry_max_delay:
+                return None
+            delay = max(delay, retry_after)
+        if time.monotonic() - started + delay > self.timeout:
+            return None
+        return delay
+
     async def create_a_record(self, subdomain: str, ip_address: str, ttl: int = 300) -> str:
         """Create an A record for a subdomain.
 
@@ -77,7 +286,8 @@ class HetznerDNSService:
         Raises:
             HetznerDNSError: If the API call fails
         """
-        response = await self._client.post(
+        response = await self._request(
+            "POST",
             "/records",
             json={
                 "zone_id": self.zone_id,
@@ -91,30 +301,53 @@ class HetznerDNSService:
             raise HetznerDNSError(f"Failed to create DNS record: {response.text}")
         return response.json()["record"]["id"]
 
-    async def update_a_record(self, record_id: str, ip_address: str) -> None:
+    async def update_a_record(
+        self,
+        record_id: str,
+        ip_address: str,
+        *,
+        subdomain: str | None = None,
+        ttl: int = 300,
+    ) -> None:
         """Update an existing A record's IP address.
 
+        With ``subdomain`` known, the record is written with a single PUT
+        (zone, type A, name and ``ttl`` are ours). Only if Hetzner answers
+        404 or 422 - our view of the record is stale - is it re-read and
+        the PUT retried with its current fields. Without ``subdomain`` the
+        record is always read first.
+
         Args:
             record_id: The Hetzner DNS record ID
             ip_address: The new IPv4 address
+            subdomain: The record's name, if known
+            ttl: TTL to write along with ``subdomain``
 
         Raises:
             HetznerDNSError: If the record is not found or update fails
         """
-        # Get existing record first
-        get_resp = await self._client.get(f"/records/{record_id}")
-        if get_resp.status_code != 200:
-            raise HetznerDNSError(f"Record {record_id} not found")
-
-        record = get_resp.json()["record"]
-        response = await self._client.put(
+        if subdomain is not None:
+            response = await self._request(
+                "PUT",
+                f"/records/{record_id}",
+                json=self._record_body(ARecord(subdomain, ip_address, ttl)),
+            )
+            if response.status_code == 200:
+                return
+            if response.status_code not in (404, 422):
+                raise HetznerDNSError(f"Failed to update DNS record: {response.text}")
+            logger.info(f"DNS record {record_id} changed upstream, re-reading it")
+
+        record = await self.get_record(record_id)
+        response = await self._request(
+            "PUT",
             f"/records/{record_id}",
             json={
-                "zone_id": record["zone_id"],
-                "type": record["type"],
-                "name": record["name"],
+                "zone_id": record.zone_id,
+                "type": record.type,
+                "name": record.name,
                 "value": ip_address,
-                "ttl": record["ttl"],
+                "ttl": record.ttl,
             },
         )
         if response.status_code != 200:
@@ -129,7 +362,7 @@ class HetznerDNSService:
         Raises:
             HetznerDNSError: If the deletion fails
         """
-        response = await self._client.delete(f"/records/{record_id}")
+        response = await self._request("DELETE", f"/records/{record_id}")
         if response.status_code not in (200, 204):
             raise HetznerDNSError(f"Failed to delete DNS record: {response.text}")
 
@@ -145,60 +378,231 @@ class HetznerDNSService:
         Raises:
             HetznerDNSError: If the record is not found
         """
-        response = await self._client.get(f"/records/{record_id}")
+        response = await self._request("GET", f"/records/{record_id}")
         if response.status_code != 200:
             raise HetznerDNSError(f"Record {record_id} not found")
 
-        data = response.json()["record"]
+        return self._parse_record(response.json()["record"])
+
+    async def list_records(self, *, page_size: int = 100) -> list[DNSRecord]:
+        """List every record in the zone.
+
+        Pages through ``GET /records?zone_id=``. The first page reports the
+        page count; the remaining pages are fetched ``bulk_concurrency`` at
+        a time.
+
+        Args:
+            page_size: Records per page.
+
+        Returns:
+            All records of the zone, of every type.
+
+        Raises:
+            HetznerDNSError: If any page cannot be fetched
+        """
+
+        async def fetch(page: int) -> tuple[list[DNSRecord], int]:
+            response = await self._request(
+                "GET",
+                "/records",
+                params={"zone_id": self.zone_id, "page": page, "per_page": page_size},
+            )
+            if response.status_code != 200:
+                raise HetznerDNSError(f"Failed to list DNS records: {response.text}")
+            data = response.json()
+            pagination = (data.get("meta") or {}).get("pagination") or {}
+            records = [self._parse_record(r) for r in data.get("records") or []]
+            return records, pagination.get("last_page", 1)
+
+        records, last_page = await fetch(1)
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def guarded(page: int) -> list[DNSRecord]:
+            async with semaphore:
+                page_records, _ = await fetch(page)
+                return page_records
+
+        pages = await asyncio.gather(*(guarded(page) for page in range(2, last_page + 1)))
+        for page_records in pages:
+            records.extend(page_records)
+        return records
+
+    @staticmethod
+    def _parse_record(data: dict[str, Any]) -> DNSRecord:
         return DNSRecord(
             id=data["id"],
             name=data["name"],
             type=data["type"],
             value=data["value"],
-            ttl=data["ttl"],
+            ttl=data.get("ttl", 0),
             zone_id=data["zone_id"],
         )
 
-    def check_propagation(self, subdomain: str, expected_ip: str) -> dict[str, bool]:
-        """Check DNS propagation across multiple resolvers.
+    # ── Bulk operations ─────────────────────────────────────────
+
+    def _record_body(self, record: ARecord, *, with_id: bool = False) -> dict[str, Any]:
+        body: dict[str, Any] = {
+            "zone_id": self.zone_id,
+            "type": "A",
+            "name": record.subdomain,
+            "value": record.ip_address,
+            "ttl": record.ttl,
+        }
+        if with_id:
+            body["id"] = record.record_id
+        return body
+
+    async def _run_chunked[T](
+        self,
+        items: Sequence[T],
+        size: int,
+        run: Callable[[Sequence[T]], Awaitable[list[BulkRecordResult]]],
+        key: Callable[[T], str],
+    ) -> list[BulkRecordResult]:
+        """Run ``run`` over chunks of ``items`` with bounded concurrency.
+
+        A chunk whose request fails outright reports the error for each of
+        its records. Results are returned in input order.
+        """
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def guarded(chunk: Sequence[T]) -> list[BulkRecordResult]:
+            async with semaphore:
+                try:
+                    return await run(chunk)
+                except (HetznerDNSError, httpx.HTTPError) as e:
+                    return [BulkRecordResult(key(item), None, str(e)) for item in chunk]
+
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        results = await asyncio.gather(*(guarded(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
 
-        This is a synchronous method that checks if the DNS record has
-        propagated to major DNS resolvers.
+    async def bulk_create_a_records(self, records: Iterable[ARecord]) -> list[BulkRecordResult]:
+        """Create many A records through ``POST /records/bulk``.
 
         Args:
-            subdomain: The subdomain name to check
-            expected_ip: The expected IP address
+            records: Records to create (``record_id`` is ignored).
 
         Returns:
-            Dictionary mapping resolver IPs to boolean propagation status
+            One result per record, keyed by subdomain, in input order. Records
+            Hetzner rejected or that were in a failed request carry an error.
         """
-        import socket
 
-        fqdn = f"{subdomain}.{self.DOMAIN}"
-        results = {}
+        async def create(chunk: Sequence[ARecord]) -> list[BulkRecordResult]:
+            response = await self._request(
+                "POST",
+                "/records/bulk",
+                json={"records": [self._record_body(r) for r in chunk]},
+            )
+            if response.status_code not in (200, 201):
+                raise HetznerDNSError(f"Bulk create failed: {response.text}")
+            data = response.json()
+            created = {r["name"]: r["id"] for r in data.get("records") or []}
+            invalid = {r.get("name") for r in data.get("invalid_records") or []}
+            return [
+                BulkRecordResult(record.subdomain, created[record.subdomain])
+                if record.subdomain in created and record.subdomain not in invalid
+                else BulkRecordResult(record.subdomain, None, "Record rejected by Hetzner DNS")
+                for record in chunk
+            ]
+
+        return await self._run_chunked(
+            list(records), self.bulk_chunk_size, create, lambda r: r.subdomain
+        )
 
-        resolvers = [
-            "1.1.1.1",  # Cloudflare
-            "8.8.8.8",  # Google
-            "213.133.100.98",  # Hetzner
-        ]
+    async def bulk_update_a_records(self, records: Iterable[ARecord]) -> list[BulkRecordResult]:
+        """Update many A records through ``PUT /records/bulk``.
 
-        for server in resolvers:
-            try:
-                # Note: This is a simplified check using gethostbyname
-                # In production, you'd want to use a proper DNS client
-                resolved = socket.gethostbyname(fqdn)
-                results[server] = resolved == expected_ip
-            except socket.gaierror:
-                results[server] = False
+        Args:
+            records: Records with ``record_id`` set, carrying the new values.
+
+        Returns:
+            One result per record, keyed by record ID, in input order.
+
+        Raises:
+            ValueError: If a record has no ``record_id``.
+        """
+        records = list(records)
+        if any(record.record_id is None for record in records):
+            raise ValueError("bulk_update_a_records needs a record_id for every record")
+
+        def key(record: ARecord) -> str:
+            # Every record has an ID, checked above
+            return cast(str, record.record_id)
+
+        async def update(chunk: Sequence[ARecord]) -> list[BulkRecordResult]:
+            response = await self._request(
+                "PUT",
+                "/records/bulk",
+                json={"records": [self._record_body(r, with_id=True) for r in chunk]},
+            )
+            if response.status_code != 200:
+                raise HetznerDNSError(f"Bulk update failed: {response.text}")
+            data = response.json()
+            updated = {r["id"] for r in data.get("records") or []}
+            failed = {r.get("id") for r in data.get("failed_records") or []}
+            return [
+                BulkRecordResult(key(r), key(r))
+                if key(r) in updated and key(r) not in failed
+                else BulkRecordResult(key(r), key(r), "Record update failed")
+                for r in chunk
+            ]
+
+        return await self._run_chunked(records, self.bulk_chunk_size, update, key)
+
+    async def bulk_delete(self, record_ids: Iterable[str]) -> list[BulkRecordResult]:
+        """Delete many records, ``bulk_concurrency`` DELETEs at a time.
+
+        Hetzner has no bulk delete endpoint. A record that is already gone
+        (404) counts as deleted.
+
+        Returns:
+            One result per record ID, in input order.
+        """
+
+        async def delete(chunk: Sequence[str]) -> list[BulkRecordResult]:
+            (record_id,) = chunk
+            response = await self._request("DELETE", f"/records/{record_id}")
+            if response.status_code not in (200, 204, 404):
+                raise HetznerDNSError(f"Failed to delete DNS record: {response.text}")
+            return [BulkRecordResult(record_id, record_id)]
 
-        return results
+        return await self._run_chunked(list(record_ids), 1, delete, lambda record_id: record_id)
 
     async def close(self) -> None:
         """Close the HTTP client connection."""
         await self._client.aclose()
 
 
+def create_dns_service() -> HetznerDNSService | None:
+    """Create the app-lifetime Hetzner DNS service if configured.
+
+    Called once from the application lifespan. Returns None if the
+    environment variables are not set (for local development).
+    """
+    try:
+        return HetznerDNSService(
+            max_connections=settings.hetzner_dns_max_connections,
+            max_keepalive_connections=settings.hetzner_dns_max_keepalive_connections,
+            keepalive_expiry=settings.hetzner_dns_keepalive_expiry,
+            http2=settings.hetzner_dns_http2,
+            timeout=settings.hetzner_dns_timeout,
+            bulk_chunk_size=settings.hetzner_dns_bulk_chunk_size,
+            bulk_concurrency=settings.hetzner_dns_bulk_concurrency,
+            max_retries=settings.hetzner_dns_max_retries,
+            retry_base_delay=settings.hetzner_dns_retry_base_delay,
+            retry_max_delay=settings.hetzner_dns_retry_max_delay,
+            breaker_threshold=settings.hetzner_dns_breaker_threshold,
+            breaker_reset_timeout=settings.hetzner_dns_breaker_reset_timeout,
+        )
+    except HetznerDNSError:
+        logger.warning(
+            "Hetzner DNS not configured - DNS operations will be skipped. "
+            "Set HETZNER_DNS_API_TOKEN and HETZNER_DNS_ZONE_ID to enable."
+        )
+        return None
+
+
 # Reserved subdomain names that cannot be claimed
 # Includes: infrastructure, security, brand names, and common typosquats
 RESERVED_SUBDOMAINS = frozenset(
@@ -0,0 +1,77 @@
+"""Leases for background jobs that must run in one process only.
+
+Each uvicorn worker starts the same background loops. A job that must not
+run concurrently takes a named lease before each run: a conditional UPDATE
+(as the email outbox uses to claim rows) that succeeds only if the lease
+is free, expired or already ours. A holder that dies stops renewing and
+another process takes over once ``expires_at`` has passed.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from prisme_api.models.job_lease import JobLease
+
+
+def process_id() -> str:
+    """Identify this process as a lease holder (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_lease(db: AsyncSession, name: str, holder: str, ttl: float) -> bool:
+    """Take or renew a lease.
+
+    Args:
+        db: Session to use; the change is committed.
+        name: Lease name (one per job).
+        holder: This process (see ``process_id``).
+        ttl: Seconds the lease stays ours without renewal.
+
+    Returns:
+        True if this process holds the lease now.
+    """
+    now = datetime.now(UTC)
+    expires_at = now + timedelta(seconds=ttl)
+    result = await db.execute(
+        update(JobLease)
+        .where(
+            JobLease.name == name,
+            or_(JobLease.holder == holder, JobLease.expires_at <= now),
+        )
+        .values(holder=holder, expires_at=expires_at)
+        .returning(JobLease.name)
+        .execution_options(synchronize_session=False)
+    )
+    if result.first() is not None:
+        await db.commit()
+        return True
+
+    # No row yet, or held by another process; the primary key settles races
+    db.add(JobLease(name=name, holder=holder, expires_at=expires_at))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return False
+    return True
+
+
+async def release_lease(db: AsyncSession, name: str, holder: str) -> None:
+    """Give up a lease we hold, so another process can take it at once."""
+    await db.execute(
+        update(JobLease)
+        .where(JobLease.name == name, JobLease.holder == holder)
+        .values(expires_at=datetime.now(UTC))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+__all__ = ["acquire_lease", "process_id", "release_lease"]
@@ -1,16 +1,41 @@
 """Traefik route manager service.
 
 Manages dynamic Traefik route files for subdomain routing.
+
+Route files are written atomically (temp file, fsync, rename) so Traefik's
+file watcher never sees a half-written file. Changes made inside ``batch()``
+- or within ``batch_window`` seconds of each other - are staged and applied
+together, so bulk activations and ``sync_routes`` cause one Traefik reload
+instead of one per route.
+
+Every uvicorn worker has its own manager on the same directory, so writes
+that merge with what is already on disk hold an ``fcntl`` lock on
+``.lock`` in the routes directory.
 """
 
 from __future__ import annotations
 
+import asyncio
+import fcntl
+import hashlib
+import json
 import logging
 import os
+import zlib
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
 
+# libyaml's emitter is ~10x faster, which matters for large shard files
+YAMLDumper: type[yaml.SafeDumper | yaml.CSafeDumper]
+try:
+    from yaml import CSafeDumper as YAMLDumper
+except ImportError:  # pragma: no cover - depends on libyaml
+    from yaml import SafeDumper as YAMLDumper
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +45,28 @@ class TraefikRouteError(Exception):
     pass
 
 
+@dataclass
+class SyncResult:
+    """Outcome (or, for a dry run, plan) of a route sync."""
+
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    dry_run: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """True if any route was (or would be) written or removed."""
+        return bool(self.created or self.updated or self.deleted)
+
+
+def route_hash(config: dict) -> str:
+    """Content hash of a route config, stable across YAML round trips."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
 class TraefikRouteManager:
     """Service for managing dynamic Traefik route files.
 
@@ -28,16 +75,22 @@ class TraefikRouteManager:
     """
 
     DOMAIN = "madewithpris.me"
+    MANIFEST_NAME = ".manifest.json"
+    LOCK_NAME = ".lock"
 
     def __init__(
         self,
         routes_dir: str | None = None,
+        batch_window: float = 0.0,
     ) -> None:
         """Initialize the route manager.
 
         Args:
             routes_dir: Directory for route files. If not provided, reads from
                 TRAEFIK_ROUTES_DIR environment variable.
+            batch_window: Seconds to collect route changes before writing
+                them in one go. 0 writes each change immediately (unless
+                inside ``batch()``).
 
         Raises:
             TraefikRouteError: If routes directory is not configured.
@@ -45,6 +98,14 @@ class TraefikRouteManager:
         self.routes_dir = Path(
             routes_dir or os.environ.get("TRAEFIK_ROUTES_DIR", "/etc/traefik/dynamic/subdomains")
         )
+        self.batch_window = batch_window
+
+        # Staged changes: subdomain -> route config, or None for a delete
+        self._pending: dict[str, dict | None] = {}
+        self._batch_depth = 0
+        self._window_flush: asyncio.Future[None] | None = None
+        self._window_task: asyncio.Task[None] | None = None
+        self._flush_lock = asyncio.Lock()
 
         # Ensure directory exists
         if not self.routes_dir.exists():
@@ -107,6 +168,208 @@ class TraefikRouteManager:
         """Get the route file path for a subdomain."""
         return self.routes_dir / f"{subdomain}.yml"
 
+    # ── Atomic writes ────────────────────────────────────────────
+
+    def _write_temp(self, path: Path, config: dict) -> Path:
+        """Write and fsync ``config`` as YAML to a temp file next to ``path``.
+
+        The temp name does not end in ``.yml``, so Traefik ignores it.
+        """
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            yaml.dump(config, f, Dumper=YAMLDumper, default_flow_style=False)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the routes directory lock shared by all worker processes."""
+        try:
+            fd = os.open(self.routes_dir / self.LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            raise TraefikRouteError(f"Failed to lock routes directory: {e}") from e
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+
+    def _manifest_path(self) -> Path:
+        return self.routes_dir / self.MANIFEST_NAME
+
+    def _hash_file(self, path: Path) -> str:
+        try:
+            return route_hash(yaml.safe_load(path.read_text()) or {})
+        except (OSError, yaml.YAMLError) as e:
+            # Unreadable files get a hash that never matches, so they are rewritten
+            logger.warning(f"Unreadable route file {path}: {e}")
+            return ""
+
+    def _scan_hashes(self) -> dict[str, str]:
+        """Hash every route file on disk (slow path, used to (re)build)."""
+        return {path.stem: self._hash_file(path) for path in self.routes_dir.glob("*.yml")}
+
+    def _load_manifest(self, verify: bool = False) -> dict[str, str]:
+        """Read route hashes from the manifest, rebuilding it if needed.
+
+        Always read from disk, since other workers update it; call with the
+        directory lock held.
+
+        Args:
+            verify: Ignore the manifest and re-hash the files on disk, which
+                also picks up files edited or removed by hand.
+        """
+        manifest = None
+        if not verify:
+            with suppress(OSError, ValueError):
+                manifest = json.loads(self._manifest_path().read_text())
+        if isinstance(manifest, dict):
+            return manifest
+        manifest = self._scan_hashes()
+        self._write_manifest(manifest)
+        return manifest
+
+    def _write_manifest(self, manifest: dict[str, str]) -> None:
+        path = self._manifest_path()
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _fsync_dir(self) -> None:
+        """Persist renames/unlinks in the routes directory."""
+        fd = os.open(self.routes_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _apply(self, changes: dict[str, dict | None]) -> None:
+        """Apply staged changes to the routes directory.
+
+        Runs under the directory lock, so the manifest read-modify-write
+        never loses another worker's entries.
+        """
+        with self._locked():
+            self._apply_locked(changes)
+
+    def _apply_locked(self, changes: dict[str, dict | None]) -> None:
+        """Write staged changes and update the manifest.
+
+        All temp files are written and fsynced first, then renamed into
+        place back to back, so the watcher sees one burst of complete files.
+        """
+        staged: list[tuple[Path, Path]] = []
+        try:
+            for subdomain, config in changes.items():
+                if config is not None:
+                    path = self._route_file_path(subdomain)
+                    staged.append((self._write_temp(path, config), path))
+
+            for tmp_path, path in staged:
+                os.replace(tmp_path, path)
+            staged = []
+
+            for subdomain, config in changes.items():
+                if config is None:
+                    with suppress(FileNotFoundError):
+                        self._route_file_path(subdomain).unlink()
+
+            manifest = self._load_manifest()
+            for subdomain, config in changes.items():
+                if config is None:
+                    manifest.pop(subdomain, None)
+                else:
+                    manifest[subdomain] = route_hash(config)
+            self._write_manifest(manifest)
+
+            self._fsync_dir()
+        except OSError as e:
+            raise TraefikRouteError(f"Failed to write route files: {e}") from e
+        finally:
+            for tmp_path, _ in staged:
+                with suppress(OSError):
+                    tmp_path.unlink()
+
+    # ── Batching ─────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Collect route changes and write them together on exit.
+
+        Nested batches are flushed when the outermost one exits. If the
+        body raises, staged changes are still written - they describe
+        routes whose DNS has already been changed.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                await self.flush()
+
+    async def flush(self) -> int:
+        """Write all staged changes now.
+
+        Returns:
+            Number of route files written or deleted
+        """
+        async with self._flush_lock:
+            changes, self._pending = self._pending, {}
+            if not changes:
+                return 0
+            try:
+                await asyncio.to_thread(self._apply, changes)
+            except BaseException:
+                # Keep unwritten changes for the next flush; newer staged ones win
+                self._pending = changes | self._pending
+                raise
+            logger.info(f"Flushed {len(changes)} route change(s) to {self.routes_dir}")
+            return len(changes)
+
+    async def _flush_after_window(self, done: asyncio.Future[None]) -> None:
+        try:
+            await asyncio.sleep(self.batch_window)
+            self._window_flush = None
+            await self.flush()
+        except BaseException as e:
+            # Every waiter in _stage must be released, whatever went wrong
+            self._release_window(done, e if isinstance(e, Exception) else None)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            done.set_result(None)
+
+    def _release_window(self, done: asyncio.Future[None], error: Exception | None = None) -> None:
+        """Fail a window's waiters (``error`` None: the flush was cancelled)."""
+        if self._window_flush is done:
+            self._window_flush = None
+        if not done.done():
+            done.set_exception(error or TraefikRouteError("Route flush was cancelled"))
+
+    async def _stage(self, subdomain: str, config: dict | None) -> None:
+        """Stage a change and write it according to the batching mode."""
+        self._pending[subdomain] = config
+        if self._batch_depth:
+            return
+        if self.batch_window <= 0:
+            await self.flush()
+            return
+
+        # Share one delayed flush among all changes made within the window
+        if self._window_flush is None:
+            self._window_flush = asyncio.get_running_loop().create_future()
+            done = self._window_flush
+            self._window_task = asyncio.create_task(self._flush_after_window(done))
+            # Covers a task cancelled before it started running
+            self._window_task.add_done_callback(lambda _: self._release_window(done))
+        await asyncio.shield(self._window_flush)
+
     async def create_route(
         self,
         subdomain: str,
@@ -123,15 +386,8 @@ class TraefikRouteManager:
         Raises:
             TraefikRouteError: If route creation fails
         """
-        route_file = self._route_file_path(subdomain)
-        config = self._generate_route_config(subdomain, target_ip, port)
-
-        try:
-            with open(route_file, "w") as f:
-                yaml.dump(config, f, default_flow_style=False)
-            logger.info(f"Created route file for {subdomain}: {route_file}")
-        except OSError as e:
-            raise TraefikRouteError(f"Failed to create route file: {e}") from e
+        await self._stage(subdomain, self._generate_route_config(subdomain, target_ip, port))
+        logger.info(f"Created route for {subdomain}")
 
     async def update_route(
         self,
@@ -159,17 +415,13 @@ class TraefikRouteManager:
         Raises:
             TraefikRouteError: If route deletion fails
         """
-        route_file = self._route_file_path(subdomain)
-
-        if not route_file.exists():
-            logger.warning(f"Route file not found for {subdomain}: {route_file}")
+        if not await self.route_exists(subdomain):
+            logger.warning(f"Route file not found for {subdomain}")
+            self._pending.pop(subdomain, None)
             return
 
-        try:
-            route_file.unlink()
-            logger.info(f"Deleted route file for {subdomain}: {route_file}")
-        except OSError as e:
-            raise TraefikRouteError(f"Failed to delete route file: {e}") from e
+        await self._stage(subdomain, None)
+        logger.info(f"Deleted route for {subdomain}")
 
     async def route_exists(self, subdomain: str) -> bool:
         """Check if a route file exists for a subdomain.
@@ -178,59 +430,300 @@ class TraefikRouteManager:
             subdomain: The subdomain name
 
         Returns:
-            True if route file exists
+            True if route file exists (taking staged changes into account)
         """
+        if subdomain in self._pending:
+            return self._pending[subdomain] is not None
         return self._route_file_path(subdomain).exists()
 
+    def _current_hashes(self, verify: bool = False) -> dict[str, str]:
+        """Content hash of every route currently on disk.
+
+        The manifest supplies the hashes, but the directory listing decides
+        which routes exist: a file missing from the manifest (e.g. written
+        by a worker that crashed before updating it) is hashed directly.
+        """
+        with self._locked():
+            manifest = self._load_manifest(verify)
+        on_disk = {path.stem: path for path in self.routes_dir.glob("*.yml")}
+        return {
+            name: manifest[name] if name in manifest else self._hash_file(path)
+            for name, path in on_disk.items()
+        }
+
     async def sync_routes(
         self,
         active_subdomains: list[dict],
-    ) -> tuple[int, int]:
+        *,
+        dry_run: bool = False,
+        verify: bool = False,
+    ) -> SyncResult:
         """Sync all route files with the list of active subdomains.
 
-        Creates missing routes and removes orphaned routes.
+        Compares the content hash of each desired route with the manifest
+        of what is on disk, then creates missing routes, rewrites routes
+        whose target changed and removes orphaned routes - all in one
+        batch. Routes that already match are not touched.
 
         Args:
             active_subdomains: List of dicts with 'name', 'ip_address', 'port' keys
+            dry_run: Only compute the diff; write nothing.
+            verify: Re-hash the files on disk instead of trusting the
+                manifest (detects hand edits; slower).
 
         Returns:
-            Tuple of (created_count, deleted_count)
+            SyncResult with the created, updated and deleted route names
         """
-        active_names = {s["name"] for s in active_subdomains}
+        desired = {
+            s["name"]: self._generate_route_config(s["name"], s["ip_address"], s.get("port", 80))
+            for s in active_subdomains
+        }
 
-        # Get existing route files
-        existing_files = set()
-        if self.routes_dir.exists():
-            existing_files = {f.stem for f in self.routes_dir.glob("*.yml")}
+        async with self._flush_lock:
+            current = await asyncio.to_thread(self._current_hashes, verify)
+        # Staged but unflushed changes count as already applied
+        for name, config in self._pending.items():
+            if config is None:
+                current.pop(name, None)
+            else:
+                current[name] = route_hash(config)
+
+        result = SyncResult(dry_run=dry_run)
+        for name, config in desired.items():
+            existing = current.get(name)
+            if existing is None:
+                result.created.append(name)
+            elif existing != route_hash(config):
+                result.updated.append(name)
+            else:
+                result.unchanged += 1
+        result.deleted = sorted(set(current) - set(desired))
+
+        if not dry_run and result.changed:
+            async with self.batch():
+                for name in result.created + result.updated:
+                    await self._stage(name, desired[name])
+                for name in result.deleted:
+                    await self._stage(name, None)
+
+        logger.info(
+            f"Route sync {'plan' if dry_run else 'complete'}: {len(result.created)} created, "
+            f"{len(result.updated)} updated, {len(result.deleted)} deleted, "
+            f"{result.unchanged} unchanged"
+        )
+        return result
 
-        created_count = 0
-        deleted_count = 0
 
-        # Create missing routes
-        for subdomain_data in active_subdomains:
-            name = subdomain_data["name"]
-            if name not in existing_files:
-                await self.create_route(
-                    name,
-                    subdomain_data["ip_address"],
-                    subdomain_data.get("port", 80),
-                )
-                created_count += 1
+class ShardedTraefikRouteManager(TraefikRouteManager):
+    """Route manager that renders all routes into a few sharded files.
 
-        # Delete orphaned routes
-        for name in existing_files - active_names:
-            await self.delete_route(name)
-            deleted_count += 1
+    Each route is assigned to ``routes-NNN.yml`` by a stable hash of its
+    name, so with thousands of subdomains Traefik watches ``shards`` files
+    instead of one file per subdomain, and a change rewrites only the
+    affected shard. The public API is the same as TraefikRouteManager.
 
-        logger.info(f"Route sync complete: {created_count} created, {deleted_count} deleted")
-        return created_count, deleted_count
+    Use a dedicated routes directory: per-subdomain files left in the same
+    directory are not managed by this class.
+
+    The in-memory route map is only a cache: other worker processes write
+    the same shards. Each flush re-reads the shards it rewrites under the
+    directory lock, and ``sync_routes`` reloads every shard.
+    """
+
+    SHARD_PATTERN = "routes-*.yml"
+
+    def __init__(
+        self,
+        routes_dir: str | None = None,
+        batch_window: float = 0.0,
+        shards: int = 16,
+    ) -> None:
+        """Initialize the route manager and load existing shards.
+
+        Args:
+            routes_dir: Directory for shard files. If not provided, reads
+                from TRAEFIK_ROUTES_DIR environment variable.
+            batch_window: See TraefikRouteManager.
+            shards: Number of shard files to spread routes over.
+
+        Raises:
+            TraefikRouteError: If the directory or a shard cannot be read.
+        """
+        super().__init__(routes_dir, batch_window)
+        self.shards = max(1, shards)
+        # In-memory view of every route on disk: subdomain -> route config
+        self._routes: dict[str, dict] = {}
+        self._members: dict[int, set[str]] = {}
+        # Shard files that must be rewritten on the next flush
+        self._dirty_shards: set[int] = set()
+        self._load()
+
+    def _shard_for(self, subdomain: str) -> int:
+        """Stable shard index for a subdomain."""
+        return zlib.crc32(subdomain.encode()) % self.shards
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.routes_dir / f"routes-{shard:03d}.yml"
+
+    def _read_shard(self, path: Path) -> dict[str, dict]:
+        """Split a shard file into per-subdomain route configs."""
+        prefix = "subdomain-"
+        try:
+            http = (yaml.safe_load(path.read_text()) or {}).get("http", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, yaml.YAMLError) as e:
+            raise TraefikRouteError(f"Failed to read route shard {path}: {e}") from e
+
+        routes = {}
+        for router_name, router in (http.get("routers") or {}).items():
+            service = (http.get("services") or {}).get(router["service"], {})
+            routes[router_name.removeprefix(prefix)] = {
+                "http": {
+                    "routers": {router_name: router},
+                    "services": {router["service"]: service},
+                }
+            }
+        return routes
+
+    def _put_from_shard(self, index: int, routes: dict[str, dict]) -> set[int]:
+        """Add routes read from shard ``index``; returns shards to rewrite."""
+        dirty = set()
+        for subdomain, config in routes.items():
+            self._put(subdomain, config)
+            if self._shard_for(subdomain) != index:
+                # Shard count changed since the files were written
+                dirty.update({index, self._shard_for(subdomain)})
+        return dirty
+
+    def _load(self) -> None:
+        """Rebuild the in-memory route map from the shard files."""
+        self._routes.clear()
+        self._members.clear()
+        for path in sorted(self.routes_dir.glob(self.SHARD_PATTERN)):
+            index = int(path.stem.removeprefix("routes-"))
+            self._dirty_shards |= self._put_from_shard(index, self._read_shard(path))
+
+    def _reload_shards(self, shards: set[int]) -> set[int]:
+        """Replace the in-memory routes of ``shards`` with the files on disk.
+
+        Returns:
+            Shards that must be rewritten because they hold misplaced routes
+        """
+        while True:
+            for shard in shards:
+                for subdomain in self._members.pop(shard, set()):
+                    self._routes.pop(subdomain, None)
+            dirty: set[int] = set()
+            for shard in shards:
+                dirty |= self._put_from_shard(shard, self._read_shard(self._shard_path(shard)))
+            if dirty <= shards:
+                return dirty
+            # A misplaced route's own shard must be re-read as well
+            shards = shards | dirty
+
+    def _put(self, subdomain: str, config: dict) -> None:
+        self._routes[subdomain] = config
+        self._members.setdefault(self._shard_for(subdomain), set()).add(subdomain)
+
+    def _drop(self, subdomain: str) -> None:
+        self._routes.pop(subdomain, None)
+        self._members.get(self._shard_for(subdomain), set()).discard(subdomain)
+
+    def _render_shard(self, shard: int) -> dict:
+        """Merge every route belonging to ``shard`` into one config."""
+        routers: dict = {}
+        services: dict = {}
+        for subdomain in sorted(self._members.get(shard, ())):
+            http = self._routes[subdomain]["http"]
+            routers.update(http["routers"])
+            services.update(http["services"])
+        return {"http": {"routers": routers, "services": services}}
+
+    def _apply_locked(self, changes: dict[str, dict | None]) -> None:
+        """Fold changes into the shards on disk and rewrite the affected ones.
+
+        The affected shards are re-read first, so routes written by other
+        processes since our last read are kept.
+        """
+        self._dirty_shards.update(self._shard_for(subdomain) for subdomain in changes)
+        self._dirty_shards |= self._reload_shards(set(self._dirty_shards))
+        for subdomain, config in changes.items():
+            if config is None:
+                self._drop(subdomain)
+            else:
+                self._put(subdomain, config)
+
+        staged: list[tuple[Path, Path]] = []
+        try:
+            for shard in sorted(self._dirty_shards):
+                config = self._render_shard(shard)
+                path = self._shard_path(shard)
+                if config["http"]["routers"]:
+                    staged.append((self._write_temp(path, config), path))
+                else:
+                    with suppress(FileNotFoundError):
+                        path.unlink()
+
+            for tmp_path, path in staged:
+                os.replace(tmp_path, path)
+            staged = []
+
+            # Remove shards beyond the configured count
+            for path in self.routes_dir.glob(self.SHARD_PATTERN):
+                if int(path.stem.removeprefix("routes-")) >= self.shards:
+                    path.unlink()
+
+            self._fsync_dir()
+        except OSError as e:
+            raise TraefikRouteError(f"Failed to write route shards: {e}") from e
+        finally:
+            for tmp_path, _ in staged:
+                with suppress(OSError):
+                    tmp_path.unlink()
+        self._dirty_shards.clear()
+
+    async def route_exists(self, subdomain: str) -> bool:
+        """Check if a route is configured for a subdomain.
+
+        Args:
+            subdomain: The subdomain name
+
+        Returns:
+            True if the route exists (taking staged changes into account)
+        """
+        if subdomain in self._pending:
+            return self._pending[subdomain] is not None
+        # Read the shard itself: another worker may have written the route
+        path = self._shard_path(self._shard_for(subdomain))
+        return subdomain in await asyncio.to_thread(self._read_shard, path)
+
+    def _current_hashes(self, verify: bool = False) -> dict[str, str]:
+        """Content hash of every route in the shard files.
+
+        The shards are always reloaded (other workers write them too), so
+        no manifest file is needed and ``verify`` has no extra effect.
+        """
+        self._load()
+        return {name: route_hash(config) for name, config in self._routes.items()}
+
+
+_route_manager: TraefikRouteManager | None = None
 
 
 def get_route_manager() -> TraefikRouteManager | None:
-    """Get the route manager if configured.
+    """Get the shared route manager if configured.
+
+    One instance is shared per routes directory so that batching windows
+    coalesce changes from concurrent requests. TRAEFIK_ROUTES_BATCH_WINDOW
+    sets the window in seconds (default 0, i.e. write immediately).
+    TRAEFIK_ROUTES_MODE=sharded selects ShardedTraefikRouteManager, with
+    TRAEFIK_ROUTES_SHARDS files (default 16).
 
     Returns None if TRAEFIK_ROUTES_DIR is not set (for development).
     """
+    global _route_manager
+
     routes_dir = os.environ.get("TRAEFIK_ROUTES_DIR")
     if not routes_dir:
         logger.warning(
@@ -239,11 +732,30 @@ def get_route_manager() -> TraefikRouteManager | None:
         )
         return None
 
+    if _route_manager is not None and _route_manager.routes_dir == Path(routes_dir):
+        return _route_manager
+
+    batch_window = float(os.environ.get("TRAEFIK_ROUTES_BATCH_WINDOW", "0"))
     try:
-        return TraefikRouteManager(routes_dir)
+        if os.environ.get("TRAEFIK_ROUTES_MODE", "files") == "sharded":
+            _route_manager = ShardedTraefikRouteManager(
+                routes_dir,
+                batch_window=batch_window,
+                shards=int(os.environ.get("TRAEFIK_ROUTES_SHARDS", "16")),
+            )
+        else:
+            _route_manager = TraefikRouteManager(routes_dir, batch_window=batch_window)
     except TraefikRouteError as e:
         logger.error(f"Failed to initialize route manager: {e}")
         return None
+    return _route_manager
 
 
-__all__ = ["TraefikRouteError", "TraefikRouteManager", "get_route_manager"]
+__all__ = [
+    "ShardedTraefikRouteManager",
+    "SyncResult",
+    "TraefikRouteError",
+    "TraefikRouteManager",
+    "get_route_manager",
+    "route_hash",
+]
@@ -5,8 +5,12 @@ Custom service logic for managing subdomains with Hetzner DNS integration.
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import UTC, datetime, timedelta
+from typing import cast
 
+from sqlalchemy import String, Table, bindparam, select, update
+
+from prisme_api.models.activation_job import ActivationJob
 from prisme_api.models.subdomain import Subdomain
 
 from ._generated.subdomain_base import SubdomainServiceBase
@@ -18,6 +22,7 @@ class SubdomainService(SubdomainServiceBase):
     Extends the base service with:
     - Lookup by name (unique field)
     - Subdomain validation
+    - Desired Traefik routes and DNS records for reconciliation
     """
 
     async def get_by_name(self, name: str) -> Subdomain | None:
@@ -33,5 +38,106 @@ class SubdomainService(SubdomainServiceBase):
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def active_routes(self) -> list[dict]:
+        """Get the desired route of every active subdomain.
+
+        Selects only the routing columns, so a full reconcile stays cheap.
+
+        Returns:
+            List of dicts with 'name', 'ip_address', 'port' keys, as
+            expected by TraefikRouteManager.sync_routes
+        """
+        query = select(self.model.name, self.model.ip_address, self.model.port).where(
+            self.model.status == "active",
+            self.model.ip_address.is_not(None),
+        )
+        result = await self.db.execute(query)
+        return [
+            {"name": name, "ip_address": ip_address, "port": port or 80}
+            for name, ip_address, port in result.all()
+        ]
+
+    async def dns_targets(self, settle_seconds: float = 0.0) -> list[dict]:
+        """Get the DNS state of every subdomain, released ones included.
+
+        Args:
+            settle_seconds: Rows updated this recently, or with a background
+                activation still provisioning, are marked busy: a DNS write
+                for them may be in flight, so the reconcile leaves them alone.
+
+        Returns:
+            List of dicts with 'name', 'status', 'ip_address',
+            'dns_record_id' and 'busy' keys, as expected by ZoneMirror.diff
+            (which deletes leftover records of released names)
+        """
+        activating = (
+            select(ActivationJob.id)
+            .where(
+                ActivationJob.subdomain_id == self.model.id,
+                ActivationJob.status == "provisioning",
+            )
+            .exists()
+        )
+        query = select(
+            self.model.name,
+            self.model.status,
+            self.model.ip_address,
+            self.model.dns_record_id,
+            self.model.updated_at,
+            activating,
+        )
+        result = await self.db.execute(query)
+        cutoff = datetime.now(UTC) - timedelta(seconds=settle_seconds)
+        targets = []
+        for name, status, ip_address, dns_record_id, updated_at, is_activating in result.all():
+            if updated_at.tzinfo is None:
+                # SQLite returns naive timestamps (UTC)
+                updated_at = updated_at.replace(tzinfo=UTC)
+            targets.append(
+                {
+                    "name": name,
+                    "status": status,
+                    "ip_address": ip_address,
+                    "dns_record_id": dns_record_id,
+                    "busy": is_activating or updated_at > cutoff,
+                }
+            )
+        return targets
+
+    async def set_dns_record_ids(
+        self,
+        record_ids: dict[str, str],
+        expected: dict[str, str | None] | None = None,
+    ) -> None:
+        """Store the DNS record ID of many subdomains in one statement.
+
+        Args:
+            record_ids: Subdomain name -> Hetzner DNS record ID
+            expected: Subdomain name -> record ID read before the change. A
+                row whose record ID has changed since is left alone.
+        """
+        if not record_ids:
+            return
+        # Core UPDATE: an executemany keyed by name, not an ORM bulk update by primary key
+        table = cast(Table, self.model.__table__)
+        query = (
+            update(table)
+            .where(table.c.name == bindparam("subdomain_name"))
+            .values(dns_record_id=bindparam("record_id"))
+        )
+        params: list[dict[str, str | None]] = [
+            {"subdomain_name": n, "record_id": r} for n, r in record_ids.items()
+        ]
+        if expected is not None:
+            query = query.where(
+                table.c.dns_record_id.is_not_distinct_from(bindparam("expected", type_=String))
+            )
+            params = [
+                {"subdomain_name": n, "record_id": r, "expected": expected.get(n)}
+                for n, r in record_ids.items()
+            ]
+        await self.db.execute(query, params)
+        await self.db.commit()
+
 
 __all__ = ["SubdomainService"]
@@ -6,27 +6,39 @@ This file was generated once by Prism and is yours to customize.
 
 from __future__ import annotations
 
+from prisme_api.auth.user_cache import user_cache
+from prisme_api.models.user import User
+from prisme_api.schemas.user import UserUpdate
+
 from ._generated.user_base import UserServiceBase
 
 
 class UserService(UserServiceBase):
     """Custom service logic for User.
 
-    Add your custom methods and override base methods here.
+    Keeps the authenticated-user cache coherent: every update or delete
+    (roles, active flag, password, MFA, ...) invalidates the cached user.
     """
 
-    # Example: Override a lifecycle hook
-    # async def before_create(self, data: UserCreate) -> None:
-    #     # Custom validation or transformation
-    #     pass
-
-    # Example: Add a custom method
-    # async def find_by_email(self, email: str) -> User | None:
-    #     query = select(self.model).where(self.model.email == email)
-    #     result = await self.db.execute(query)
-    #     return result.scalar_one_or_none()
-
-    pass
+    async def after_update(self, obj: User) -> None:
+        """Invalidate the cached user after an update."""
+        user_cache.invalidate(obj.id)
+
+    async def after_delete(self, obj: User) -> None:
+        """Invalidate the cached user after a delete."""
+        user_cache.invalidate(obj.id)
+
+    async def update_many(self, *, ids: list[int], data: UserUpdate) -> int:
+        """Bulk update users and invalidate their cache entries."""
+        count = await super().update_many(ids=ids, data=data)
+        user_cache.invalidate_many(ids)
+        return count
+
+    async def delete_many(self, *, ids: list[int], soft: bool = True) -> int:
+        """Bulk delete users and invalidate their cache entries."""
+        count = await super().delete_many(ids=ids, soft=soft)
+        user_cache.invalidate_many(ids)
+        return count
 
 
 __all__ = ["UserService"]
@@ -157,3 +157,53 @@ async def authenticated_client(db):
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def fake_dns():
+    """Serve the DNS dependency from an in-process fake Hetzner DNS API."""
+    from tests.fakes import FakeHetznerDNS
+
+    from prisme_api.api.rest.subdomain import get_dns_service
+    from prisme_api.main import app
+
+    fake = FakeHetznerDNS()
+    service = fake.service()
+    app.dependency_overrides[get_dns_service] = lambda: service
+
+    yield fake
+
+    app.dependency_overrides.pop(get_dns_service, None)
+    await service.close()
+
+
+@pytest_asyncio.fixture
+async def fake_github():
+    """Serve GitHub OAuth from an in-process fake GitHub."""
+    from tests.fakes import FakeGitHub
+
+    from prisme_api.api.rest.auth import get_github_oauth
+    from prisme_api.main import app
+
+    fake = FakeGitHub()
+    client = fake.client()
+    app.dependency_overrides[get_github_oauth] = lambda: client
+
+    yield fake
+
+    app.dependency_overrides.pop(get_github_oauth, None)
+    await client.close()
+
+
+@pytest.fixture
+def query_budget():
+    """Assert that a block issues at most N SQL statements and no N+1s.
+
+    Usage::
+
+        with query_budget(3):
+            await client.get("/api/subdomains")
+    """
+    from prisme_api.middleware.query_budget import query_budget
+
+    return query_budget
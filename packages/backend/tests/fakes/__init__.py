@@ -0,0 +1,6 @@
+"""In-process fakes for external services."""
+
+from .github_oauth import FakeGitHub
+from .hetzner_dns import FakeHetznerDNS
+
+__all__ = ["FakeGitHub", "FakeHetznerDNS"]
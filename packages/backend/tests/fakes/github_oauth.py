@@ -0,0 +1,102 @@
+"""In-process fake of the GitHub OAuth and user APIs.
+
+Served through ``httpx.MockTransport`` so ``GitHubOAuthClient`` can be
+exercised end to end without network access. Each API call can be given an
+artificial latency to check which requests overlap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+from typing import Any
+from urllib.parse import parse_qs
+
+import httpx
+
+from prisme_api.auth.github_oauth import GitHubOAuthClient
+
+
+class FakeGitHub:
+    """Issues tokens for known codes and serves the matching user."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.codes: dict[str, dict[str, Any]] = {}
+        self.tokens: dict[str, dict[str, Any]] = {}
+        self.requests: list[httpx.Request] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    # ── Helpers ──────────────────────────────────────────────────
+
+    def client(self, **kwargs: Any) -> GitHubOAuthClient:
+        """Build a GitHubOAuthClient wired to this fake."""
+        return GitHubOAuthClient(
+            "fake-client-id",
+            "fake-client-secret",
+            "http://test/api/auth/github/callback",
+            transport=httpx.MockTransport(self.handle),
+            **kwargs,
+        )
+
+    def add_user(
+        self,
+        login: str,
+        *,
+        email: str | None = None,
+        emails: list[dict[str, Any]] | None = None,
+        github_id: int | None = None,
+    ) -> str:
+        """Register a GitHub user and return an authorization code for it."""
+        code = secrets.token_urlsafe(8)
+        self.codes[code] = {
+            "profile": {
+                "id": github_id or len(self.codes) + 1000,
+                "login": login,
+                "email": email,
+            },
+            "emails": emails or [],
+        }
+        return code
+
+    def calls(self, path: str) -> int:
+        """Count requests to a path."""
+        return sum(1 for request in self.requests if request.url.path == path)
+
+    # ── Request handling ─────────────────────────────────────────
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._route(request)
+        finally:
+            self.in_flight -= 1
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        host, path = request.url.host, request.url.path
+
+        if host == "github.com" and path == "/login/oauth/access_token":
+            form = parse_qs(request.content.decode())
+            account = self.codes.pop(form.get("code", [""])[0], None)
+            if account is None:
+                return httpx.Response(200, json={"error": "bad_verification_code"})
+            token = secrets.token_hex(8)
+            self.tokens[token] = account
+            return httpx.Response(200, json={"access_token": token, "token_type": "bearer"})
+
+        if host == "api.github.com":
+            token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            account = self.tokens.get(token)
+            if account is None:
+                return httpx.Response(401, json={"message": "Bad credentials"})
+            if path == "/user":
+                return httpx.Response(200, json=account["profile"])
+            if path == "/user/emails":
+                return httpx.Response(200, json=account["emails"])
+
+        return httpx.Response(404, json={"message": "Not Found"})
@@ -0,0 +1,178 @@
+"""In-process fake of the Hetzner DNS API.
+
+Served through ``httpx.MockTransport`` so ``HetznerDNSService`` can be
+exercised end to end without network access.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Any
+
+import httpx
+
+from prisme_api.services.hetzner_dns import HetznerDNSService
+
+ZONE_ID = "fake-zone"
+
+
+class FakeHetznerDNS:
+    """Minimal record store speaking the Hetzner DNS REST API."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, dict[str, Any]] = {}
+        self.requests: list[httpx.Request] = []
+        # Canned error responses served before any real handling
+        self.failures: list[httpx.Response] = []
+
+    # ── Helpers ──────────────────────────────────────────────────
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport routing requests to this fake."""
+        return httpx.MockTransport(self.handle)
+
+    def service(self, **kwargs: Any) -> HetznerDNSService:
+        """Build a HetznerDNSService wired to this fake.
+
+        Retries back off without delay unless ``retry_base_delay`` is given.
+        """
+        kwargs.setdefault("retry_base_delay", 0.0)
+        return HetznerDNSService(
+            api_token="fake-token",
+            zone_id=ZONE_ID,
+            http2=False,
+            transport=self.transport(),
+            **kwargs,
+        )
+
+    def add_record(self, name: str, value: str, ttl: int = 300, type: str = "A") -> str:
+        """Seed a record directly and return its ID."""
+        record_id = uuid.uuid4().hex[:12]
+        self.records[record_id] = {
+            "id": record_id,
+            "zone_id": ZONE_ID,
+            "type": type,
+            "name": name,
+            "value": value,
+            "ttl": ttl,
+        }
+        return record_id
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after: str | None = None) -> None:
+        """Answer the next ``count`` requests with an error status."""
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        self.failures.extend(
+            httpx.Response(status, headers=headers, json={"error": {"message": "unavailable"}})
+            for _ in range(count)
+        )
+
+    def calls(self, method: str, path_prefix: str = "/records") -> int:
+        """Count requests with the given method under a path prefix."""
+        return sum(
+            1
+            for request in self.requests
+            if request.method == method
+            and request.url.path.removeprefix("/api/v1").startswith(path_prefix)
+        )
+
+    # ── Request handling ─────────────────────────────────────────
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.failures:
+            return self.failures.pop(0)
+        path = request.url.path.removeprefix("/api/v1")
+        parts = [p for p in path.split("/") if p]
+
+        if parts == ["records"] and request.method == "GET":
+            return self._list(request.url.params)
+        if parts == ["records"] and request.method == "POST":
+            return self._create(json.loads(request.content))
+        if parts == ["records", "bulk"] and request.method == "POST":
+            return self._bulk_create(json.loads(request.content)["records"])
+        if parts == ["records", "bulk"] and request.method == "PUT":
+            return self._bulk_update(json.loads(request.content)["records"])
+        if len(parts) == 2 and parts[0] == "records":
+            record_id = parts[1]
+            if request.method == "GET":
+                return self._get(record_id)
+            if request.method == "PUT":
+                return self._update(record_id, json.loads(request.content))
+            if request.method == "DELETE":
+                return self._delete(record_id)
+        return httpx.Response(404, json={"error": {"message": "not found"}})
+
+    def _create(self, body: dict[str, Any]) -> httpx.Response:
+        if body.get("zone_id") != ZONE_ID or not body.get("name"):
+            return httpx.Response(422, json={"error": {"message": "invalid record"}})
+        record_id = self.add_record(
+            body["name"], body["value"], body.get("ttl", 300), body.get("type", "A")
+        )
+        return httpx.Response(200, json={"record": self.records[record_id]})
+
+    def _bulk_create(self, bodies: list[dict[str, Any]]) -> httpx.Response:
+        valid, invalid = [], []
+        for body in bodies:
+            if body.get("zone_id") != ZONE_ID or not body.get("name"):
+                invalid.append(body)
+                continue
+            record_id = self.add_record(
+                body["name"], body["value"], body.get("ttl", 300), body.get("type", "A")
+            )
+            valid.append(self.records[record_id])
+        return httpx.Response(
+            200, json={"records": valid, "valid_records": valid, "invalid_records": invalid}
+        )
+
+    def _bulk_update(self, bodies: list[dict[str, Any]]) -> httpx.Response:
+        updated, failed = [], []
+        for body in bodies:
+            record = self.records.get(body.get("id", ""))
+            if record is None:
+                failed.append(body)
+                continue
+            record.update({k: body[k] for k in ("name", "type", "value", "ttl") if k in body})
+            updated.append(record)
+        return httpx.Response(200, json={"records": updated, "failed_records": failed})
+
+    def _list(self, params: httpx.QueryParams) -> httpx.Response:
+        records = [r for r in self.records.values() if r["zone_id"] == params.get("zone_id")]
+        page, per_page = int(params.get("page", 1)), int(params.get("per_page", 100))
+        last_page = max(1, -(-len(records) // per_page))
+        return httpx.Response(
+            200,
+            json={
+                "records": records[(page - 1) * per_page : page * per_page],
+                "meta": {
+                    "pagination": {
+                        "page": page,
+                        "per_page": per_page,
+                        "last_page": last_page,
+                        "total_entries": len(records),
+                    }
+                },
+            },
+        )
+
+    def _get(self, record_id: str) -> httpx.Response:
+        if record_id not in self.records:
+            return httpx.Response(404, json={"error": {"message": "record not found"}})
+        return httpx.Response(200, json={"record": self.records[record_id]})
+
+    def _update(self, record_id: str, body: dict[str, Any]) -> httpx.Response:
+        if record_id not in self.records:
+            return httpx.Response(404, json={"error": {"message": "record not found"}})
+        record = self.records[record_id]
+        if body.get("zone_id") != record["zone_id"]:
+            return httpx.Response(422, json={"error": {"message": "zone mismatch"}})
+        record.update({k: body[k] for k in ("name", "type", "value", "ttl") if k in body})
+        return httpx.Response(200, json={"record": record})
+
+    def _delete(self, record_id: str) -> httpx.Response:
+        if self.records.pop(record_id, None) is None:
+            return httpx.Response(404, json={"error": {"message": "record not found"}})
+        return httpx.Response(200, json={})
+
+
+__all__ = ["ZONE_ID", "FakeHetznerDNS"]
@@ -0,0 +1,102 @@
+"""GraphQL tests for batched relationship loading."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import delete
+from tests.factories.api_key import APIKeyFactory
+from tests.factories.subdomain import SubdomainFactory
+from tests.factories.user import UserFactory
+
+from prisme_api.models.api_key import APIKey
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.models.user import User
+
+
+class TestRelationshipLoaders:
+    """Relationship fields resolve through per-request DataLoaders."""
+
+    @pytest.mark.asyncio
+    async def test_users_with_subdomains_without_n_plus_one(self, client, db, query_budget):
+        """Listing 100 users with subdomains and keys costs a fixed number of queries."""
+        UserFactory._meta.sqlalchemy_session = db
+        SubdomainFactory._meta.sqlalchemy_session = db
+        APIKeyFactory._meta.sqlalchemy_session = db
+        users = [UserFactory.create() for _ in range(100)]
+        await db.flush()
+        subdomains = {user.id: SubdomainFactory.create_batch(2, owner_id=user.id) for user in users}
+        keys = {user.id: APIKeyFactory.create(user_id=user.id) for user in users}
+        await db.commit()
+        user_ids = [user.id for user in users]
+
+        query = """
+            query ListUsers($ids: [Int!]) {
+                users(where: {id: {in: $ids}}, pagination: {pageSize: 100}) {
+                    edges {
+                        node {
+                            id
+                            subdomains {
+                                id
+                                ownerId
+                                owner { id }
+                            }
+                            apiKeys { id userId }
+                        }
+                    }
+                }
+            }
+        """
+
+        # users + count, then one batch each for subdomains, api keys and owners
+        with query_budget(5):
+            response = await client.post(
+                "/graphql", json={"query": query, "variables": {"ids": user_ids}}
+            )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data.get("errors") is None, data.get("errors")
+
+        nodes = [edge["node"] for edge in data["data"]["users"]["edges"]]
+        assert sorted(node["id"] for node in nodes) == sorted(user_ids)
+        for node in nodes:
+            # The session database is shared, so earlier tests may have left
+            # rows for a reused user id; only this test's rows are checked
+            created = {s.id for s in subdomains[node["id"]]}
+            assert created <= {s["id"] for s in node["subdomains"]}
+            assert all(s["ownerId"] == node["id"] for s in node["subdomains"])
+            assert all(s["owner"]["id"] == node["id"] for s in node["subdomains"])
+            assert keys[node["id"]].id in {k["id"] for k in node["apiKeys"]}
+            assert all(k["userId"] == node["id"] for k in node["apiKeys"])
+
+        # Don't leave 200 subdomains behind for tests that count them per owner
+        await db.execute(delete(APIKey).where(APIKey.user_id.in_(user_ids)))
+        await db.execute(delete(Subdomain).where(Subdomain.owner_id.in_(user_ids)))
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_owner_resolved_for_subdomain(self, client, db):
+        """subdomain.owner is loaded instead of returning null."""
+        UserFactory._meta.sqlalchemy_session = db
+        SubdomainFactory._meta.sqlalchemy_session = db
+        user = UserFactory.create()
+        await db.flush()
+        subdomain = SubdomainFactory.create(owner_id=user.id)
+        await db.commit()
+
+        query = """
+            query GetSubdomain($id: Int!) {
+                subdomain(id: $id) {
+                    owner { id email }
+                }
+            }
+        """
+
+        response = await client.post(
+            "/graphql", json={"query": query, "variables": {"id": subdomain.id}}
+        )
+
+        assert response.status_code == 200
+        owner = response.json()["data"]["subdomain"]["owner"]
+        assert owner == {"id": user.id, "email": user.email}
@@ -0,0 +1,132 @@
+"""Integration tests for background activation endpoints."""
+
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from prisme_api.models.subdomain import Subdomain
+
+
+@pytest_asyncio.fixture
+async def worker(engine, fake_dns, monkeypatch):
+    """Serve the activation worker from the test database and fake DNS."""
+    from prisme_api.api.rest.subdomain import get_activation_worker, get_dns_service
+    from prisme_api.main import app
+    from prisme_api.services.activation import ActivationWorker
+
+    monkeypatch.delenv("TRAEFIK_ROUTES_DIR", raising=False)
+    worker = ActivationWorker(
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        app.dependency_overrides[get_dns_service](),
+    )
+    app.dependency_overrides[get_activation_worker] = lambda: worker
+
+    yield worker
+
+    app.dependency_overrides.pop(get_activation_worker, None)
+
+
+async def _reserve(db, name: str) -> None:
+    db.add(Subdomain(name=name, status="reserved"))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+class TestActivationAPI:
+    async def test_accepts_then_provisions(self, client, db, fake_dns, worker):
+        await _reserve(db, "bgactivate")
+
+        response = await client.post(
+            "/api/subdomains/bgactivate/activations", json={"ip_address": "1.2.3.4"}
+        )
+
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "provisioning"
+        assert response.headers["Location"].endswith(f"/api/subdomains/activations/{job['id']}")
+        # Nothing reached Hetzner during the request
+        assert fake_dns.requests == []
+
+        await worker.run_once()
+        polled = await client.get(f"/api/subdomains/activations/{job['id']}")
+        subdomain = await client.get("/api/subdomains/bgactivate/status")
+
+        assert polled.json()["status"] == "succeeded"
+        assert subdomain.json()["status"] == "active"
+        assert fake_dns.records[subdomain.json()["dns_record_id"]]["value"] == "1.2.3.4"
+
+    async def test_repeated_request_returns_pending_job(self, client, db, worker):
+        await _reserve(db, "bgrepeat")
+        url = "/api/subdomains/bgrepeat/activations"
+
+        first = await client.post(url, json={"ip_address": "1.2.3.4"})
+        second = await client.post(url, json={"ip_address": "1.2.3.4"})
+        other = await client.post(url, json={"ip_address": "5.6.7.8"})
+
+        assert second.json()["id"] == first.json()["id"]
+        assert other.status_code == 409
+
+    async def test_pending_job_blocks_activation_until_released(self, client, db, worker):
+        await _reserve(db, "bgsync")
+
+        queued = await client.post(
+            "/api/subdomains/bgsync/activations", json={"ip_address": "1.2.3.4"}
+        )
+        activated = await client.post(
+            "/api/subdomains/bgsync/activate", json={"ip_address": "5.6.7.8"}
+        )
+        released = await client.post("/api/subdomains/bgsync/release")
+        polled = await client.get(f"/api/subdomains/activations/{queued.json()['id']}")
+
+        assert activated.status_code == 409
+        assert queued.json()["id"] in activated.json()["detail"]
+        assert released.status_code == 204
+        assert (polled.json()["status"], polled.json()["error"]) == (
+            "failed",
+            "Subdomain was released",
+        )
+
+    async def test_invalid_request_is_rejected_up_front(self, client, db, worker):
+        await _reserve(db, "bginvalid")
+
+        response = await client.post(
+            "/api/subdomains/bginvalid/activations", json={"ip_address": "999.1.1.1"}
+        )
+
+        assert response.status_code == 400
+
+    async def test_unknown_job(self, client):
+        response = await client.get("/api/subdomains/activations/0123456789abcdef")
+
+        assert response.status_code == 404
+
+    async def test_events_stream_until_done(self, client, db, worker, monkeypatch):
+        from prisme_api.config import settings
+
+        monkeypatch.setattr(settings, "activation_events_poll_interval", 0.01)
+        await _reserve(db, "bgstream")
+        job = (
+            await client.post(
+                "/api/subdomains/bgstream/activations", json={"ip_address": "1.2.3.4"}
+            )
+        ).json()
+
+        get = worker.get
+
+        async def get_after_provisioning(job_id: str):
+            # The request's session holds no connection while the stream is open
+            assert not db.in_transaction()
+            # The job finishes while the stream waits between polls
+            await worker.run_once()
+            return await get(job_id)
+
+        monkeypatch.setattr(worker, "get", get_after_provisioning)
+
+        response = await client.get(f"/api/subdomains/activations/{job['id']}/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [e for e in response.text.split("\n\n") if e.startswith("event: status")]
+        assert '"status":"provisioning"' in events[0]
+        assert '"status":"succeeded"' in events[-1]
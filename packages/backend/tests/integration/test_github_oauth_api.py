@@ -0,0 +1,90 @@
+"""Integration tests for GitHub OAuth login against a fake GitHub."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from sqlalchemy import select
+from tests.fakes import FakeGitHub
+
+from prisme_api.auth.config import auth_settings
+from prisme_api.auth.github_oauth import GitHubOAuthError
+from prisme_api.models.user import User
+
+
+async def _login_state(client, monkeypatch) -> str:
+    monkeypatch.setattr(auth_settings, "github_client_id", "fake-client-id")
+    resp = await client.get("/api/auth/github/login")
+    assert resp.status_code == 302
+    return parse_qs(urlparse(resp.headers["location"]).query)["state"][0]
+
+
+@pytest.mark.asyncio
+class TestGitHubCallback:
+    @patch("prisme_api.api.rest.auth._validate_email_domain", return_value=None)
+    async def test_login_creates_user(
+        self, mock_domain, unauthenticated_client, db, fake_github, monkeypatch
+    ):
+        code = fake_github.add_user(
+            "octocat",
+            emails=[
+                {"email": "old@example.com", "primary": False, "verified": True},
+                {"email": "octocat@example.com", "primary": True, "verified": True},
+            ],
+        )
+        state = await _login_state(unauthenticated_client, monkeypatch)
+
+        resp = await unauthenticated_client.get(
+            "/api/auth/github/callback", params={"code": code, "state": state}
+        )
+
+        assert resp.status_code == 302
+        assert resp.headers["location"] == "/auth/callback"
+        assert auth_settings.session_cookie_name in resp.cookies
+        result = await db.execute(select(User).where(User.email == "octocat@example.com"))
+        user = result.scalar_one()
+        assert user.username == "octocat"
+        assert user.email_verified
+
+    async def test_state_cannot_be_reused(self, unauthenticated_client, fake_github, monkeypatch):
+        state = await _login_state(unauthenticated_client, monkeypatch)
+        params = {"code": "unknown", "state": state}
+
+        first = await unauthenticated_client.get("/api/auth/github/callback", params=params)
+        second = await unauthenticated_client.get("/api/auth/github/callback", params=params)
+
+        assert first.headers["location"] == "/auth/callback?error=no_access_token"
+        assert second.headers["location"] == "/auth/callback?error=invalid_state"
+
+
+@pytest.mark.asyncio
+class TestGitHubOAuthClient:
+    async def test_profile_and_emails_are_fetched_concurrently(self):
+        fake = FakeGitHub(latency=0.05)
+        client = fake.client()
+        code = fake.add_user("octocat", email="public@example.com", github_id=42)
+
+        token = await client.exchange_code(code)
+        identity = await client.fetch_identity(token)
+        await client.close()
+
+        assert identity.github_id == "42"
+        assert identity.email == "public@example.com"
+        assert fake.calls("/user") == fake.calls("/user/emails") == 1
+        assert fake.max_in_flight == 2
+
+    async def test_unverified_emails_are_ignored(self):
+        fake = FakeGitHub()
+        client = fake.client()
+        code = fake.add_user(
+            "octocat", emails=[{"email": "x@example.com", "primary": True, "verified": False}]
+        )
+
+        token = await client.exchange_code(code)
+        with pytest.raises(GitHubOAuthError) as exc_info:
+            await client.fetch_identity(token)
+        await client.close()
+
+        assert exc_info.value.code == "no_email"
@@ -0,0 +1,99 @@
+"""Integration tests for keyset (cursor) pagination on list endpoints."""
+
+from __future__ import annotations
+
+import pytest
+from tests.factories.subdomain import SubdomainFactory
+
+
+async def _walk(client, url: str) -> list[dict]:
+    """Follow next_cursor links until the end and return every item."""
+    items: list[dict] = []
+    response = await client.get(url)
+    while True:
+        data = response.json()
+        items.extend(data["items"])
+        if not data["next_cursor"]:
+            return items
+        separator = "&" if "?" in url else "?"
+        response = await client.get(f"{url}{separator}after={data['next_cursor']}")
+
+
+@pytest.mark.asyncio
+class TestCursorPagination:
+    async def test_walk_matches_offset_order(self, client, db):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        created = [SubdomainFactory.create() for _ in range(7)]
+        await db.commit()
+
+        walked = await _walk(client, "/api/subdomains?page_size=3&sort_by=name")
+        total = (await client.get("/api/subdomains?page_size=1")).json()["total"]
+
+        walked_ids = [item["id"] for item in walked]
+        assert len(walked_ids) == len(set(walked_ids)) == total
+        assert {s.id for s in created} <= set(walked_ids)
+        keys = [(item["name"], item["id"]) for item in walked]
+        assert keys == sorted(keys)
+
+    async def test_before_returns_previous_page(self, client, db):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        for _ in range(6):
+            SubdomainFactory.create()
+        await db.commit()
+
+        url = "/api/subdomains?page_size=2&sort_order=desc"
+
+        first = (await client.get(url)).json()
+        second = (await client.get(f"{url}&after={first['next_cursor']}")).json()
+        back = (await client.get(f"{url}&before={second['prev_cursor']}")).json()
+
+        assert [i["id"] for i in back["items"]] == [i["id"] for i in first["items"]]
+        assert second["prev_cursor"] is not None
+
+    async def test_invalid_cursor_is_rejected(self, client):
+        response = await client.get("/api/subdomains?after=not-a-cursor")
+
+        assert response.status_code == 400
+
+    async def test_cursor_for_other_sort_is_rejected(self, client, db):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        for _ in range(3):
+            SubdomainFactory.create()
+        await db.commit()
+        page = (await client.get("/api/subdomains?page_size=1&sort_by=name")).json()
+
+        response = await client.get(f"/api/subdomains?page_size=1&after={page['next_cursor']}")
+
+        assert response.status_code == 400
+
+    async def test_nullable_sort_column_is_rejected(self, client, db):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        SubdomainFactory.create()
+        await db.commit()
+        page = (await client.get("/api/subdomains?page_size=1")).json()
+
+        response = await client.get(
+            f"/api/subdomains?sort_by=ip_address&after={page['next_cursor']}"
+        )
+
+        assert response.status_code == 400
+
+    async def test_offset_pages_sorted_by_nullable_column(self, client, db):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        for _ in range(3):
+            SubdomainFactory.create()
+        await db.commit()
+
+        first = await client.get("/api/subdomains?sort_by=ip_address&page_size=1")
+        second = await client.get("/api/subdomains?sort_by=ip_address&page_size=1&page=2")
+
+        assert (first.status_code, second.status_code) == (200, 200)
+        assert len(second.json()["items"]) == 1
+        # No cursors for a sort they cannot continue
+        assert second.json()["next_cursor"] is second.json()["prev_cursor"] is None
+
+    async def test_users_endpoint_supports_cursors(self, client):
+        response = await client.get("/api/users?page_size=1")
+
+        assert response.status_code == 200
+        assert "next_cursor" in response.json()
@@ -0,0 +1,114 @@
+"""SQL statement budgets for the hot API paths.
+
+Each test pins how many statements an endpoint may issue; ``query_budget``
+also fails on any statement repeated often enough to look like an N+1.
+"""
+
+from __future__ import annotations
+
+import pytest
+from tests.factories.subdomain import SubdomainFactory
+
+from prisme_api.auth.utils import hash_password
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.models.user import User
+
+
+@pytest.mark.asyncio
+class TestSubdomainQueryBudget:
+    @pytest.mark.parametrize("rows", [5, 50])
+    async def test_list_is_constant_in_table_size(self, client, db, query_budget, rows):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        SubdomainFactory.create_batch(rows)
+        await db.commit()
+
+        # One windowed SELECT returns the page and the total
+        with query_budget(1):
+            response = await client.get("/api/subdomains?limit=100")
+
+        assert response.status_code == 200
+
+    async def test_get(self, client, db, query_budget):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        subdomain = SubdomainFactory.create()
+        await db.commit()
+
+        with query_budget(1):
+            response = await client.get(f"/api/subdomains/{subdomain.id}")
+
+        assert response.status_code == 200
+
+    async def test_claim_activate_release(self, client, fake_dns, query_budget):
+        # Each step: lookups, one write and the refresh of the written row
+        with query_budget(4):
+            claimed = await client.post("/api/subdomains/claim", json={"name": "budget"})
+        with query_budget(5):
+            activated = await client.post(
+                "/api/subdomains/budget/activate", json={"ip_address": "1.2.3.4"}
+            )
+        with query_budget(5):
+            released = await client.post("/api/subdomains/budget/release")
+
+        assert (claimed.status_code, activated.status_code, released.status_code) == (
+            201,
+            200,
+            204,
+        )
+
+    async def test_background_activation(self, client, db, fake_dns, query_budget):
+        db.add(Subdomain(name="budgetbg", status="reserved"))
+        await db.commit()
+
+        # Lookup, pending-job check and the job insert; no DNS call inline
+        with query_budget(3):
+            response = await client.post(
+                "/api/subdomains/budgetbg/activations", json={"ip_address": "1.2.3.4"}
+            )
+
+        assert response.status_code == 202
+        assert fake_dns.requests == []
+
+    async def test_graphql_subdomains_with_owner(self, client, db, query_budget):
+        SubdomainFactory._meta.sqlalchemy_session = db
+        SubdomainFactory.create_batch(20)
+        await db.commit()
+        query = (
+            "{ subdomains(pagination: {pageSize: 20}) { edges { node { name owner { id } } } } }"
+        )
+
+        # Subdomain page, then one batched owner lookup
+        with query_budget(2):
+            response = await client.post("/graphql", json={"query": query})
+
+        assert response.status_code == 200
+        assert response.json().get("errors") is None
+
+
+@pytest.mark.asyncio
+class TestAuthQueryBudget:
+    async def test_login_and_me(self, unauthenticated_client, db, query_budget):
+        db.add(
+            User(
+                email="budget@example.com",
+                username="budget",
+                password_hash=hash_password("StrongPass1"),
+                email_verified=True,
+                is_active=True,
+                roles=["user"],
+                failed_login_attempts=0,
+            )
+        )
+        await db.commit()
+
+        with query_budget(2):
+            login = await unauthenticated_client.post(
+                "/api/auth/login",
+                json={"email": "budget@example.com", "password": "StrongPass1"},
+            )
+        session = login.cookies["prisme_api_session"]
+        with query_budget(1):
+            me = await unauthenticated_client.get(
+                "/api/auth/me", headers={"Cookie": f"prisme_api_session={session}"}
+            )
+
+        assert (login.status_code, me.status_code) == (200, 200)
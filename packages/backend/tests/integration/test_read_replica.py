@@ -0,0 +1,102 @@
+"""Integration tests for read-replica routing against two SQLite databases."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from prisme_api import database
+from prisme_api.models.base import Base
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.models.user import User
+
+
+async def _database(path) -> tuple:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def replica(tmp_path, monkeypatch):
+    """App wired to a primary and a (never replicated) replica database.
+
+    Each database holds one subdomain the other lacks, so responses show
+    which one served the read.
+    """
+    from prisme_api.auth.dependencies import get_current_active_user
+    from prisme_api.main import app
+
+    primary_engine, primary = await _database(tmp_path / "primary.db")
+    replica_engine, replica_sessions = await _database(tmp_path / "replica.db")
+    for sessions, name in ((primary, "onprimary"), (replica_sessions, "onreplica")):
+        async with sessions() as db:
+            db.add(Subdomain(name=name, owner_id=1, status="reserved"))
+            await db.commit()
+
+    async def override_get_db():
+        async with primary() as session:
+            yield session
+
+    async def override_get_current_active_user():
+        return User(
+            id=1,
+            email="test@example.com",
+            is_active=True,
+            email_verified=True,
+            subdomain_limit=10,
+            roles=["admin"],
+        )
+
+    monkeypatch.setattr(database, "async_read_session", replica_sessions)
+    app.dependency_overrides[database.get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = override_get_current_active_user
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+    app.dependency_overrides.clear()
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+async def _names(client) -> set[str]:
+    response = await client.get("/api/subdomains")
+    assert response.status_code == 200
+    return {item["name"] for item in response.json()["items"]}
+
+
+@pytest.mark.asyncio
+class TestReadReplica:
+    async def test_rest_reads_use_replica(self, replica):
+        assert await _names(replica) == {"onreplica"}
+
+    async def test_graphql_queries_use_replica(self, replica):
+        response = await replica.post(
+            "/graphql", json={"query": "{ subdomains { edges { node { name } } } }"}
+        )
+
+        edges = response.json()["data"]["subdomains"]["edges"]
+        assert [edge["node"]["name"] for edge in edges] == ["onreplica"]
+
+    async def test_client_is_pinned_to_primary_after_write(self, replica):
+        response = await replica.post("/api/subdomains/claim", json={"name": "fresh"})
+
+        assert response.status_code == 201
+        assert database.READ_YOUR_WRITES_COOKIE in response.cookies
+        assert await _names(replica) == {"onprimary", "fresh"}
+
+    async def test_expired_pin_reads_replica_again(self, replica):
+        replica.cookies.set(database.READ_YOUR_WRITES_COOKIE, str(time.time() - 1))
+
+        assert await _names(replica) == {"onreplica"}
+
+    async def test_reads_without_write_set_no_cookie(self, replica):
+        response = await replica.get("/api/subdomains")
+
+        assert database.READ_YOUR_WRITES_COOKIE not in response.cookies
@@ -0,0 +1,173 @@
+"""Integration tests for subdomain endpoints backed by the (fake) Hetzner DNS API."""
+
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+
+from prisme_api.models.subdomain import Subdomain
+
+
+@pytest.mark.asyncio
+class TestSubdomainDNSLifecycle:
+    async def test_activate_creates_record(self, client, fake_dns):
+        await client.post("/api/subdomains/claim", json={"name": "dnsnew"})
+
+        response = await client.post(
+            "/api/subdomains/dnsnew/activate", json={"ip_address": "1.2.3.4"}
+        )
+
+        assert response.status_code == 200
+        record_id = response.json()["dns_record_id"]
+        assert fake_dns.records[record_id]["name"] == "dnsnew"
+        assert fake_dns.records[record_id]["value"] == "1.2.3.4"
+
+    async def test_reactivate_updates_record(self, client, fake_dns):
+        await client.post("/api/subdomains/claim", json={"name": "dnsupd"})
+        first = await client.post("/api/subdomains/dnsupd/activate", json={"ip_address": "1.2.3.4"})
+
+        second = await client.post(
+            "/api/subdomains/dnsupd/activate", json={"ip_address": "5.6.7.8"}
+        )
+
+        record_id = first.json()["dns_record_id"]
+        assert second.json()["dns_record_id"] == record_id
+        assert fake_dns.records[record_id]["value"] == "5.6.7.8"
+        # A single PUT, without re-reading the record first
+        assert fake_dns.calls("GET") == 0
+
+    async def test_release_deletes_record(self, client, fake_dns):
+        await client.post("/api/subdomains/claim", json={"name": "dnsrel"})
+        activated = await client.post(
+            "/api/subdomains/dnsrel/activate", json={"ip_address": "1.2.3.4"}
+        )
+
+        response = await client.post("/api/subdomains/dnsrel/release")
+
+        assert response.status_code == 204
+        assert activated.json()["dns_record_id"] not in fake_dns.records
+
+    async def test_activate_fails_fast_while_dns_is_down(self, client, db, fake_dns):
+        from prisme_api.api.rest.subdomain import get_dns_service
+        from prisme_api.main import app
+
+        service = app.dependency_overrides[get_dns_service]()
+        for _ in range(service.breaker.failure_threshold):
+            service.breaker.record_failure()
+        db.add(Subdomain(name="dnsdown", status="reserved"))
+        await db.commit()
+
+        response = await client.post(
+            "/api/subdomains/dnsdown/activate", json={"ip_address": "1.2.3.4"}
+        )
+
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) > 0
+        assert fake_dns.calls("POST") == 0
+
+    async def test_client_is_shared_across_requests(self, client, fake_dns):
+        from prisme_api.api.rest.subdomain import get_dns_service
+        from prisme_api.main import app
+
+        service = app.dependency_overrides[get_dns_service]()
+        await client.post("/api/subdomains/claim", json={"name": "dnsshared"})
+        await client.post("/api/subdomains/dnsshared/activate", json={"ip_address": "1.2.3.4"})
+        await client.post("/api/subdomains/dnsshared/release")
+
+        assert not service._client.is_closed
+
+
+@pytest.mark.asyncio
+class TestRouteReconcile:
+    async def test_reconcile_dry_run_reports_missing_routes(
+        self, client, fake_dns, tmp_path, monkeypatch
+    ):
+        from prisme_api.services import route_manager
+
+        monkeypatch.setenv("TRAEFIK_ROUTES_DIR", str(tmp_path))
+        monkeypatch.setattr(route_manager, "_route_manager", None)
+        await client.post("/api/subdomains/claim", json={"name": "dnsroute"})
+        await client.post("/api/subdomains/dnsroute/activate", json={"ip_address": "1.2.3.4"})
+        (tmp_path / "dnsroute.yml").unlink()
+
+        response = await client.post("/api/subdomains/routes/reconcile?dry_run=true&verify=true")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "dnsroute" in data["created"]
+        assert data["dry_run"] is True
+        assert not (tmp_path / "dnsroute.yml").exists()
+
+    async def test_reconcile_without_route_manager(self, client, monkeypatch):
+        monkeypatch.delenv("TRAEFIK_ROUTES_DIR", raising=False)
+
+        response = await client.post("/api/subdomains/routes/reconcile")
+
+        assert response.status_code == 503
+
+
+@pytest_asyncio.fixture
+async def zone(fake_dns, monkeypatch):
+    """Serve the zone mirror dependency from a mirror of the fake zone."""
+    from prisme_api.api.rest.subdomain import get_dns_service, get_zone_mirror
+    from prisme_api.config import settings
+    from prisme_api.main import app
+    from prisme_api.services.dns_zone import ZoneMirror
+
+    # Rows seeded by the tests are brand new; repair them without waiting
+    monkeypatch.setattr(settings, "dns_zone_settle_seconds", 0)
+
+    mirror = ZoneMirror(app.dependency_overrides[get_dns_service]())
+    app.dependency_overrides[get_zone_mirror] = lambda: mirror
+
+    yield mirror
+
+    app.dependency_overrides.pop(get_zone_mirror, None)
+
+
+@pytest.mark.asyncio
+class TestZoneReconcile:
+    async def test_reconcile_repairs_drift(self, client, db, fake_dns, zone):
+        subdomain = Subdomain(
+            name="zonelost", status="active", ip_address="1.2.3.4", dns_record_id="gone"
+        )
+        db.add(subdomain)
+        # A release that failed to delete its record left it behind
+        db.add(Subdomain(name="zoneorphan", status="released"))
+        await db.commit()
+        orphan = fake_dns.add_record("zoneorphan", "1.2.3.4")
+        infra = fake_dns.add_record("zoneinfra", "1.2.3.4")
+
+        response = await client.post("/api/subdomains/dns/reconcile")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "zonelost" in data["created"]
+        assert "zoneorphan" in data["deleted"]
+        assert orphan not in fake_dns.records
+        # No subdomain ever held this name: not the app's record to delete
+        assert "zoneinfra" not in data["deleted"]
+        assert infra in fake_dns.records
+        await db.refresh(subdomain)
+        assert fake_dns.records[subdomain.dns_record_id]["value"] == "1.2.3.4"
+
+    async def test_status_reads_zone_from_mirror(self, client, db, fake_dns, zone):
+        record_id = fake_dns.add_record("zonestatus", "1.2.3.4")
+        db.add(
+            Subdomain(
+                name="zonestatus", status="active", ip_address="1.2.3.4", dns_record_id=record_id
+            )
+        )
+        await db.commit()
+        await zone.refresh()
+        requests_before = len(fake_dns.requests)
+
+        response = await client.get("/api/subdomains/zonestatus/status")
+
+        assert response.json()["zone_ip_address"] == "1.2.3.4"
+        assert len(fake_dns.requests) == requests_before
+
+    async def test_reconcile_without_dns(self, client):
+        response = await client.post("/api/subdomains/dns/reconcile")
+
+        assert response.status_code == 503
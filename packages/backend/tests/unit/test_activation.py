@@ -0,0 +1,174 @@
+"""Unit tests for the background activation worker."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from tests.fakes.hetzner_dns import FakeHetznerDNS
+
+from prisme_api.models.activation_job import ActivationJob
+from prisme_api.models.base import Base
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.services.activation import (
+    ActivationWorker,
+    cancel_activations,
+    enqueue_activation,
+)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Fresh database file per test, so concurrent workers get their own connections."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/activation.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def fake(monkeypatch):
+    monkeypatch.delenv("TRAEFIK_ROUTES_DIR", raising=False)
+    return FakeHetznerDNS()
+
+
+async def _enqueue(session_factory, name: str = "async", status: str = "reserved") -> None:
+    async with session_factory() as db:
+        subdomain = Subdomain(name=name, status=status)
+        db.add(subdomain)
+        await db.flush()
+        enqueue_activation(db, subdomain, "1.2.3.4", 8080)
+        await db.commit()
+
+
+async def _state(session_factory) -> tuple[ActivationJob, Subdomain]:
+    async with session_factory() as db:
+        job = (await db.execute(select(ActivationJob))).scalar_one()
+        return job, await db.get(Subdomain, job.subdomain_id)
+
+
+def _worker(session_factory, fake, **kwargs) -> ActivationWorker:
+    return ActivationWorker(session_factory, fake.service(max_retries=0), base_delay=60, **kwargs)
+
+
+@pytest.mark.asyncio
+class TestActivationWorker:
+    async def test_provisions_dns_and_activates(self, session_factory, fake):
+        await _enqueue(session_factory)
+
+        processed = await _worker(session_factory, fake).run_once()
+
+        job, subdomain = await _state(session_factory)
+        assert processed == 1
+        assert (job.status, job.attempts, job.completed_at is not None) == ("succeeded", 1, True)
+        assert (subdomain.status, subdomain.ip_address, subdomain.port) == (
+            "active",
+            "1.2.3.4",
+            8080,
+        )
+        assert fake.records[subdomain.dns_record_id]["value"] == "1.2.3.4"
+
+    async def test_dns_failure_is_retried(self, session_factory, fake):
+        await _enqueue(session_factory)
+        fake.fail_next(status=503)
+        worker = _worker(session_factory, fake)
+
+        await worker.run_once()
+        job, subdomain = await _state(session_factory)
+        assert (job.status, job.attempts) == ("provisioning", 1)
+        assert "Failed to create DNS record" in job.last_error
+        assert subdomain.status == "reserved"
+        # Backed off: not due yet
+        assert await worker.run_once() == 0
+
+        async with session_factory() as db:
+            await db.execute(update(ActivationJob).values(next_attempt_at=datetime.now(UTC)))
+            await db.commit()
+        await worker.run_once()
+
+        job, subdomain = await _state(session_factory)
+        assert (job.status, job.attempts, job.last_error) == ("succeeded", 2, None)
+        assert len(fake.records) == 1
+
+    async def test_gives_up_after_max_attempts(self, session_factory, fake):
+        await _enqueue(session_factory)
+        fake.fail_next(status=503)
+
+        await _worker(session_factory, fake, max_attempts=1).run_once()
+
+        job, subdomain = await _state(session_factory)
+        assert job.status == "failed"
+        assert subdomain.status == "reserved"
+
+    async def test_suspended_subdomain_fails_without_retry(self, session_factory, fake):
+        await _enqueue(session_factory, status="suspended")
+
+        await _worker(session_factory, fake).run_once()
+
+        job, _ = await _state(session_factory)
+        assert (job.status, job.last_error) == ("failed", "Subdomain 'async' is suspended")
+        assert fake.records == {}
+
+    async def test_release_during_provisioning_undoes_activation(self, session_factory, fake):
+        await _enqueue(session_factory)
+        worker = _worker(session_factory, fake)
+        create_a_record = worker.dns_service.create_a_record
+
+        async def create_then_release(*args, **kwargs):
+            record_id = await create_a_record(*args, **kwargs)
+            async with session_factory() as db:
+                await db.execute(update(Subdomain).values(status="released", owner_id=None))
+                await db.commit()
+            return record_id
+
+        worker.dns_service.create_a_record = create_then_release
+        await worker.run_once()
+
+        job, subdomain = await _state(session_factory)
+        assert (job.status, job.last_error) == (
+            "failed",
+            "Subdomain 'async' was released during activation",
+        )
+        assert (subdomain.status, subdomain.ip_address, subdomain.dns_record_id) == (
+            "released",
+            None,
+            None,
+        )
+        assert fake.records == {}
+
+    async def test_cancelled_job_is_not_completed(self, session_factory, fake):
+        await _enqueue(session_factory)
+        worker = _worker(session_factory, fake)
+        create_a_record = worker.dns_service.create_a_record
+
+        async def create_then_cancel(*args, **kwargs):
+            record_id = await create_a_record(*args, **kwargs)
+            async with session_factory() as db:
+                job, _ = await _state(session_factory)
+                assert await cancel_activations(db, job.subdomain_id, "Subdomain was released")
+                await db.commit()
+            return record_id
+
+        worker.dns_service.create_a_record = create_then_cancel
+        await worker.run_once()
+
+        job, subdomain = await _state(session_factory)
+        assert (job.status, job.last_error) == ("failed", "Subdomain was released")
+        assert (subdomain.status, subdomain.dns_record_id) == ("reserved", None)
+        assert fake.records == {}
+
+    async def test_claimed_jobs_run_once(self, session_factory, fake):
+        for i in range(6):
+            await _enqueue(session_factory, name=f"async{i}")
+
+        await asyncio.gather(
+            _worker(session_factory, fake, batch_size=3).run_once(),
+            _worker(session_factory, fake, batch_size=3).run_once(),
+        )
+
+        assert fake.calls("POST") == 6
@@ -0,0 +1,93 @@
+"""Unit tests for db_pool.py."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from prisme_api.config import Settings
+from prisme_api.db_pool import (
+    InstrumentedQueuePool,
+    engine_options,
+    install_sqlite_pragmas,
+    pool_stats,
+)
+
+PG_URL = "postgresql+asyncpg://user:pw@db/prisme"
+
+
+class TestEngineOptions:
+    def test_postgres_pool_follows_environment(self):
+        production = engine_options(PG_URL, Settings(environment="production"))
+        development = engine_options(PG_URL, Settings(environment="development"))
+
+        assert (production["pool_size"], production["max_overflow"]) == (10, 10)
+        assert (development["pool_size"], development["max_overflow"]) == (5, 5)
+        assert production["poolclass"] is InstrumentedQueuePool
+        assert production["pool_pre_ping"] is True
+
+    def test_explicit_settings_override_defaults(self):
+        settings = Settings(
+            environment="production",
+            db_pool_size=3,
+            db_max_overflow=0,
+            db_statement_cache_size=0,
+            db_statement_timeout_ms=5000,
+            db_server_settings={"lock_timeout": "1000"},
+        )
+
+        options = engine_options(PG_URL, settings)
+
+        assert (options["pool_size"], options["max_overflow"]) == (3, 0)
+        connect_args = options["connect_args"]
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["server_settings"]["statement_timeout"] == "5000"
+        assert connect_args["server_settings"]["lock_timeout"] == "1000"
+
+    def test_memory_sqlite_keeps_default_pool(self):
+        options = engine_options("sqlite+aiosqlite:///:memory:", Settings())
+
+        assert "poolclass" not in options
+        assert "pool_size" not in options
+
+
+@pytest.mark.asyncio
+class TestSQLiteEngine:
+    async def test_file_database_uses_wal(self, tmp_path):
+        url = f"sqlite+aiosqlite:///{tmp_path}/app.db"
+        engine = create_async_engine(url, **engine_options(url, Settings()))
+        install_sqlite_pragmas(engine)
+
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        await engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+
+    async def test_pool_stats_record_checkouts_and_timeouts(self, tmp_path):
+        url = f"sqlite+aiosqlite:///{tmp_path}/app.db"
+        engine = create_async_engine(
+            url, poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+
+        async with engine.connect():
+            busy = pool_stats(engine)
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        stats = pool_stats(engine)
+        await engine.dispose()
+
+        assert busy.checked_out == 1
+        assert stats.checked_out == 0
+        assert stats.checkouts == 1
+        assert stats.timeouts == 1
+        assert stats.wait_seconds_max >= 0
+
+    async def test_pool_stats_none_for_uninstrumented_pool(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+        assert pool_stats(engine) is None
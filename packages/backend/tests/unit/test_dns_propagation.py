@@ -0,0 +1,154 @@
+"""Unit tests for services/dns_propagation.py against a local stub DNS server."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import struct
+
+import pytest
+
+from prisme_api.services.dns_propagation import (
+    DNSPropagationChecker,
+    DNSQueryError,
+    build_query,
+    parse_resolver,
+    parse_response,
+)
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """Answers A queries from a name -> (ips, ttl) table.
+
+    Answers use a compression pointer back to the question name, like real
+    resolvers. Unknown names get NXDOMAIN; ``silent`` drops every query.
+    """
+
+    def __init__(self, records: dict[str, tuple[list[str], int]], silent: bool = False) -> None:
+        self.records = records
+        self.silent = silent
+        self.queries: list[str] = []
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        query_id = struct.unpack("!H", data[:2])[0]
+        labels, offset = [], 12
+        while data[offset]:
+            length = data[offset]
+            labels.append(data[offset + 1 : offset + 1 + length].decode())
+            offset += length + 1
+        name = ".".join(labels)
+        question = data[12 : offset + 5]
+        self.queries.append(name)
+        if self.silent:
+            return
+
+        ips, ttl = self.records.get(name, ([], 0))
+        rcode = 0 if name in self.records else 3
+        header = struct.pack("!HHHHHH", query_id, 0x8180 | rcode, 1, len(ips), 0, 0)
+        answers = b"".join(
+            b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, ttl, 4) + socket.inet_aton(ip) for ip in ips
+        )
+        self.transport.sendto(header + question + answers, addr)
+
+    @property
+    def address(self) -> str:
+        host, port = self.transport.get_extra_info("sockname")[:2]
+        return f"{host}:{port}"
+
+
+async def _start(records, silent: bool = False) -> StubDNSServer:
+    loop = asyncio.get_running_loop()
+    _, server = await loop.create_datagram_endpoint(
+        lambda: StubDNSServer(records, silent), local_addr=("127.0.0.1", 0)
+    )
+    return server
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestWireFormat:
+    def test_parse_resolver(self):
+        assert parse_resolver("1.1.1.1") == ("1.1.1.1", 53)
+        assert parse_resolver("127.0.0.1:5353") == ("127.0.0.1", 5353)
+        assert parse_resolver("[::1]:5353") == ("::1", 5353)
+
+    def test_response_id_mismatch(self):
+        query = build_query(1, "example.com")
+
+        with pytest.raises(DNSQueryError):
+            parse_response(b"\x00\x02" + query[2:], 1)
+
+
+@pytest.mark.asyncio
+class TestDNSPropagationChecker:
+    async def test_queries_every_resolver(self):
+        first = await _start({"app.example.com": (["1.2.3.4"], 300)})
+        second = await _start({"app.example.com": (["1.2.3.4", "5.6.7.8"], 60)})
+        checker = DNSPropagationChecker([first.address, second.address], timeout=1)
+
+        results = await checker.check("app.example.com")
+
+        assert [r.resolver for r in results] == [first.address, second.address]
+        assert results[0].ips == ("1.2.3.4",)
+        assert results[0].ttl == 300
+        assert results[1].ips == ("1.2.3.4", "5.6.7.8")
+        assert results[1].ttl == 60
+        assert all(r.resolves_to("1.2.3.4") and r.error is None for r in results)
+        assert all(r.latency_ms is not None for r in results)
+        assert first.queries == second.queries == ["app.example.com"]
+
+    async def test_nxdomain_is_not_propagated(self):
+        server = await _start({})
+        checker = DNSPropagationChecker([server.address], timeout=1)
+
+        [result] = await checker.check("missing.example.com")
+
+        assert result.ips == ()
+        assert result.error is None
+        assert not result.resolves_to("1.2.3.4")
+
+    async def test_slow_resolver_times_out_independently(self):
+        fast = await _start({"app.example.com": (["1.2.3.4"], 300)})
+        silent = await _start({}, silent=True)
+        checker = DNSPropagationChecker([fast.address, silent.address], timeout=0.2)
+
+        fast_result, silent_result = await checker.check("app.example.com")
+
+        assert fast_result.resolves_to("1.2.3.4")
+        assert silent_result.error == "timeout"
+        assert silent_result.latency_ms is None
+
+    async def test_results_are_cached(self):
+        clock = FakeClock()
+        server = await _start({"app.example.com": (["1.2.3.4"], 300)})
+        checker = DNSPropagationChecker([server.address], timeout=1, cache_ttl=10, clock=clock)
+
+        await checker.check("app.example.com")
+        await checker.check("APP.example.com.")
+        assert len(server.queries) == 1
+
+        clock.now += 11
+        await checker.check("app.example.com")
+        assert len(server.queries) == 2
+
+        checker.invalidate("app.example.com")
+        await checker.check("app.example.com")
+        assert len(server.queries) == 3
+
+    async def test_concurrent_checks_share_queries(self):
+        server = await _start({"app.example.com": (["1.2.3.4"], 300)})
+        checker = DNSPropagationChecker([server.address], timeout=1)
+
+        await asyncio.gather(*(checker.check("app.example.com") for _ in range(5)))
+
+        assert len(server.queries) == 1
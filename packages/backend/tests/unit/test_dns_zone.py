@@ -0,0 +1,250 @@
+"""Unit tests for the DNS zone mirror against the fake Hetzner DNS API."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from tests.fakes.hetzner_dns import FakeHetznerDNS
+
+from prisme_api.config import settings
+from prisme_api.models.base import Base
+from prisme_api.models.subdomain import Subdomain
+from prisme_api.services.dns_zone import (
+    ZoneMirror,
+    ZoneReconciler,
+    is_managed_name,
+    reconcile_zone,
+)
+from prisme_api.services.subdomain import SubdomainService
+
+
+def row(name: str, ip_address: str | None, record_id: str | None, status: str = "active") -> dict:
+    return {"name": name, "status": status, "ip_address": ip_address, "dns_record_id": record_id}
+
+
+@pytest.fixture
+def fake() -> FakeHetznerDNS:
+    return FakeHetznerDNS()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Fresh database file per test, so reconcilers get their own connections."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/zone.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(session_factory, name: str, ip_address: str, record_id: str | None) -> None:
+    async with session_factory() as db:
+        db.add(
+            Subdomain(
+                name=name,
+                status="active",
+                ip_address=ip_address,
+                dns_record_id=record_id,
+                updated_at=datetime.now(UTC) - timedelta(minutes=5),
+            )
+        )
+        await db.commit()
+
+
+class TestIsManagedName:
+    def test_zone_records_are_not_managed(self):
+        assert not is_managed_name("@")
+        assert not is_managed_name("www")
+        assert not is_managed_name("_acme-challenge.app")
+        assert is_managed_name("myapp")
+
+
+@pytest.mark.asyncio
+class TestZoneMirror:
+    async def test_refresh_indexes_a_records(self, fake):
+        record_id = fake.add_record("indexed", "10.0.0.1")
+        fake.add_record("indexed", "v=spf1 -all", type="TXT")
+        mirror = ZoneMirror(fake.service(), page_size=1)
+
+        await mirror.refresh()
+        await mirror.dns_service.close()
+
+        assert mirror.loaded
+        assert mirror.lookup("indexed").id == record_id
+        assert mirror.get(record_id).value == "10.0.0.1"
+
+    async def test_writes_during_refresh_are_kept(self, fake):
+        fake.add_record("old", "10.0.0.1")
+        mirror = ZoneMirror(fake.service())
+        list_records = mirror.dns_service.list_records
+
+        async def slow_list(**kwargs):
+            records = await list_records(**kwargs)
+            mirror.record_written("new-id", "new", "10.0.0.2")
+            return records
+
+        mirror.dns_service.list_records = slow_list
+        await mirror.refresh()
+        await mirror.dns_service.close()
+
+        assert mirror.lookup("new").id == "new-id"
+        assert mirror.lookup("old") is not None
+
+    async def test_diff(self, fake):
+        ok = fake.add_record("ok", "10.0.0.1")
+        stale = fake.add_record("stale", "10.0.0.1")
+        moved = fake.add_record("moved", "10.0.0.1")
+        orphan = fake.add_record("orphan", "10.0.0.1")
+        duplicate = fake.add_record("ok", "10.0.0.1")
+        fake.add_record("www", "10.0.0.9")
+        fake.add_record("parked", "10.0.0.1")
+        fake.add_record("mail", "10.0.0.9")
+        mirror = ZoneMirror(fake.service())
+        await mirror.refresh()
+        await mirror.dns_service.close()
+
+        diff = mirror.diff(
+            [
+                row("ok", "10.0.0.1", ok),
+                row("stale", "10.0.0.2", stale),
+                row("moved", "10.0.0.1", "lost-id"),
+                row("missing", "10.0.0.3", None),
+                row("parked", None, None, status="suspended"),
+                row("orphan", None, None, status="released"),
+            ]
+        )
+
+        assert [(r.subdomain, r.ip_address) for r in diff.missing] == [("missing", "10.0.0.3")]
+        assert [(r.record_id, r.ip_address) for r in diff.stale] == [(stale, "10.0.0.2")]
+        assert {r.id for r in diff.orphaned} == {orphan, duplicate}
+        assert diff.relinked == {"moved": moved}
+        assert diff.unchanged == 1
+
+    async def test_diff_skips_busy_rows(self, fake):
+        first = fake.add_record("busy", "10.0.0.1")
+        fake.add_record("busy", "10.0.0.1")
+        mirror = ZoneMirror(fake.service())
+        await mirror.refresh()
+        await mirror.dns_service.close()
+
+        diff = mirror.diff(
+            [
+                {**row("busy", "10.0.0.2", first), "busy": True},
+                {**row("new", "10.0.0.3", None), "busy": True},
+            ]
+        )
+
+        assert not diff.changed
+
+    async def test_sync_repairs_with_bulk_calls(self, fake):
+        stale = fake.add_record("stale", "10.0.0.1")
+        orphan = fake.add_record("orphan", "10.0.0.1")
+        mirror = ZoneMirror(fake.service())
+        await mirror.refresh()
+        rows = [
+            row("stale", "10.0.0.2", stale),
+            row("missing", "10.0.0.3", None),
+            row("orphan", None, None, status="released"),
+        ]
+
+        result = await mirror.sync(rows)
+        await mirror.dns_service.close()
+
+        assert (result.created, result.updated, result.deleted) == (
+            ["missing"],
+            ["stale"],
+            ["orphan"],
+        )
+        assert result.failed == []
+        assert orphan not in fake.records
+        assert fake.records[stale]["value"] == "10.0.0.2"
+        assert fake.records[result.record_ids["missing"]]["value"] == "10.0.0.3"
+        assert fake.calls("POST", "/records/bulk") == 1
+        assert fake.calls("PUT", "/records/bulk") == 1
+        # The mirror follows its own repairs
+        assert not mirror.diff(
+            [*rows[:1], row("missing", "10.0.0.3", result.record_ids["missing"]), rows[2]]
+        ).changed
+
+    async def test_sync_leaves_records_of_unknown_names(self, fake):
+        infra = fake.add_record("mail", "10.0.0.9")
+        recent = fake.add_record("leaving", "10.0.0.1")
+        mirror = ZoneMirror(fake.service())
+        await mirror.refresh()
+
+        result = await mirror.sync(
+            [{**row("leaving", None, None, status="released"), "busy": True}]
+        )
+        await mirror.dns_service.close()
+
+        assert result.deleted == []
+        assert {infra, recent} <= set(fake.records)
+        assert fake.calls("DELETE") == 0
+
+    async def test_dry_run_changes_nothing(self, fake):
+        fake.add_record("orphan", "10.0.0.1")
+        mirror = ZoneMirror(fake.service())
+        await mirror.refresh()
+
+        result = await mirror.sync(
+            [row("missing", "10.0.0.3", None), row("orphan", None, None, status="released")],
+            dry_run=True,
+        )
+        await mirror.dns_service.close()
+
+        assert (result.created, result.deleted) == (["missing"], ["orphan"])
+        assert len(fake.records) == 1
+        assert fake.calls("POST") == fake.calls("DELETE") == 0
+
+
+@pytest.mark.asyncio
+class TestReconcileZone:
+    async def test_row_changed_while_settling_is_not_reverted(
+        self, session_factory, fake, monkeypatch
+    ):
+        record_id = fake.add_record("moving", "10.0.0.2")
+        await _seed(session_factory, "moving", "10.0.0.1", record_id)
+
+        async def activation_commits(delay: float) -> None:
+            # The activation that wrote 10.0.0.2 to DNS commits its row now
+            async with session_factory() as db:
+                await db.execute(
+                    update(Subdomain)
+                    .where(Subdomain.name == "moving")
+                    .values(ip_address="10.0.0.2")
+                )
+                await db.commit()
+
+        monkeypatch.setattr("prisme_api.services.dns_zone.asyncio.sleep", activation_commits)
+        mirror = ZoneMirror(fake.service())
+        async with session_factory() as db:
+            result = await reconcile_zone(mirror, db, settle_seconds=5)
+        await mirror.dns_service.close()
+
+        assert result.updated == []
+        assert fake.records[record_id]["value"] == "10.0.0.2"
+
+    async def test_only_the_lease_holder_repairs(self, session_factory, fake, monkeypatch):
+        monkeypatch.setattr(settings, "dns_zone_settle_seconds", 0)
+        await _seed(session_factory, "myapp", "10.0.0.1", None)
+        reconcilers = [
+            ZoneReconciler(ZoneMirror(fake.service()), session_factory, repair=True)
+            for _ in range(4)
+        ]
+        for i, reconciler in enumerate(reconcilers):
+            reconciler.holder = f"worker-{i}"
+
+        results = [await r.run_once() for r in reconcilers]
+        for reconciler in reconcilers:
+            await reconciler.mirror.dns_service.close()
+
+        assert [r is not None for r in results] == [True, False, False, False]
+        assert [r["name"] for r in fake.records.values()] == ["myapp"]
+        assert all(r.mirror.loaded for r in reconcilers)
+        async with session_factory() as db:
+            subdomain = await SubdomainService(db).get_by_name("myapp")
+        assert subdomain.dns_record_id in fake.records
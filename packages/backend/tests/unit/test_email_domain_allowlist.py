@@ -0,0 +1,122 @@
+"""Unit tests for services/email_domain_allowlist.py."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import delete
+
+from prisme_api.models.allowed_email_domain import AllowedEmailDomain
+from prisme_api.schemas.allowed_email_domain import (
+    AllowedEmailDomainCreate,
+    AllowedEmailDomainUpdate,
+)
+from prisme_api.services.allowed_email_domain import AllowedEmailDomainService
+from prisme_api.services.email_domain_allowlist import (
+    AllowlistSnapshot,
+    DomainSuffixTrie,
+    EmailDomainAllowlist,
+    email_domain_allowlist,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _snapshot(*rows: tuple[str, bool]) -> AllowlistSnapshot:
+    return AllowlistSnapshot.build(rows, version=0, expires_at=0.0)
+
+
+class TestDomainSuffixTrie:
+    def test_matches_strict_subdomains(self):
+        trie = DomainSuffixTrie(["example.edu", "ac.uk"])
+
+        assert trie.matches("cs.example.edu")
+        assert trie.matches("a.b.example.edu")
+        assert trie.matches("ox.ac.uk")
+        assert not trie.matches("example.edu")
+        assert not trie.matches("badexample.edu")
+        assert not trie.matches("example.com")
+        assert len(trie) == 2
+
+
+class TestAllowlistSnapshot:
+    def test_exact_and_wildcard_entries(self):
+        snapshot = _snapshot(
+            ("Example.com", True), ("*.example.edu", True), ("inactive.com", False)
+        )
+
+        assert snapshot.allows("example.com")
+        assert snapshot.allows("EXAMPLE.COM.")
+        assert snapshot.allows("physics.example.edu")
+        assert not snapshot.allows("example.edu")
+        assert not snapshot.allows("inactive.com")
+        assert not snapshot.allow_all
+
+    def test_empty_table_allows_all(self):
+        assert _snapshot().allows("anything.org")
+
+    def test_only_inactive_rows_allow_nothing(self):
+        snapshot = _snapshot(("example.com", False))
+
+        assert not snapshot.allow_all
+        assert not snapshot.allows("example.com")
+
+
+@pytest.mark.asyncio
+class TestEmailDomainAllowlist:
+    async def test_snapshot_is_reused_until_ttl(self, db):
+        clock = FakeClock()
+        allowlist = EmailDomainAllowlist(ttl_seconds=30, clock=clock)
+
+        first = await allowlist.get(db)
+        assert await allowlist.get(db) is first
+        assert allowlist.loads == 1
+
+        clock.now += 31
+        assert await allowlist.get(db) is not first
+        assert allowlist.loads == 2
+
+    async def test_invalidate_forces_reload(self, db):
+        allowlist = EmailDomainAllowlist(ttl_seconds=30)
+        await allowlist.get(db)
+
+        allowlist.invalidate()
+        snapshot = await allowlist.get(db)
+
+        assert allowlist.loads == 2
+        assert snapshot.version == allowlist.version == 1
+
+    async def test_zero_ttl_disables_caching(self, db):
+        allowlist = EmailDomainAllowlist(ttl_seconds=0)
+
+        await allowlist.get(db)
+        await allowlist.get(db)
+
+        assert allowlist.loads == 2
+
+
+@pytest.mark.asyncio
+class TestServiceInvalidation:
+    async def test_mutations_invalidate_snapshot(self, db):
+        await db.execute(delete(AllowedEmailDomain))
+        await db.commit()
+        email_domain_allowlist.invalidate()
+        service = AllowedEmailDomainService(db)
+
+        created = await service.create(data=AllowedEmailDomainCreate(domain="*.uni.edu"))
+        assert await service.is_domain_allowed("alice@cs.uni.edu")
+        assert not await service.is_domain_allowed("alice@other.org")
+        loads = email_domain_allowlist.loads
+        assert await service.is_domain_allowed("bob@math.uni.edu")
+        assert email_domain_allowlist.loads == loads
+
+        await service.update(id=created.id, data=AllowedEmailDomainUpdate(is_active=False))
+        assert not await service.is_domain_allowed("alice@cs.uni.edu")
+
+        await service.delete_many(ids=[created.id])
+        assert await service.is_domain_allowed("alice@other.org")
@@ -0,0 +1,192 @@
+"""Unit tests for the email outbox and its delivery worker."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from prisme_api.models.base import Base
+from prisme_api.models.email_outbox import EmailOutbox
+from prisme_api.services.email_outbox import EmailOutboxWorker, enqueue_email
+from prisme_api.services.email_transport import (
+    EmailMessage,
+    EmailTransport,
+    EmailTransportError,
+    FileTransport,
+)
+
+
+class RecordingTransport(EmailTransport):
+    """Records messages; fails the first ``failures`` sends."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0) -> None:
+        self.failures = failures
+        self.delay = delay
+        self.sent: list[EmailMessage] = []
+        self.attempts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, message: EmailMessage) -> str | None:
+        self.attempts += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise EmailTransportError("provider unavailable")
+            self.sent.append(message)
+            return f"msg-{len(self.sent)}"
+        finally:
+            self.in_flight -= 1
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Fresh database file per test, so concurrent workers get their own
+    connections and outbox rows never leak between tests."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/outbox.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _enqueue(session_factory, count: int = 1) -> None:
+    async with session_factory() as db:
+        for i in range(count):
+            enqueue_email(db, f"user{i}@example.com", "Hello", "<p>Hi</p>", "Hi")
+        await db.commit()
+
+
+async def _rows(session_factory) -> list[EmailOutbox]:
+    async with session_factory() as db:
+        result = await db.execute(select(EmailOutbox).order_by(EmailOutbox.id))
+        return list(result.scalars().all())
+
+
+def _worker(session_factory, transport, **kwargs) -> EmailOutboxWorker:
+    return EmailOutboxWorker(
+        session_factory, transport, sender="noreply@example.com", base_delay=60, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+class TestEmailOutboxWorker:
+    async def test_rolled_back_email_is_never_sent(self, session_factory):
+        async with session_factory() as db:
+            enqueue_email(db, "user@example.com", "Hello", "<p>Hi</p>", "Hi")
+            await db.rollback()
+
+        assert await _rows(session_factory) == []
+
+    async def test_delivers_pending_rows(self, session_factory):
+        await _enqueue(session_factory, 3)
+        transport = RecordingTransport()
+
+        processed = await _worker(session_factory, transport).run_once()
+
+        assert processed == 3
+        rows = await _rows(session_factory)
+        assert [row.status for row in rows] == ["sent"] * 3
+        assert all(row.sent_at is not None and row.provider_message_id for row in rows)
+        assert {m.idempotency_key for m in transport.sent} == {r.idempotency_key for r in rows}
+        assert await _worker(session_factory, transport).run_once() == 0
+
+    async def test_concurrency_is_bounded(self, session_factory):
+        await _enqueue(session_factory, 10)
+        transport = RecordingTransport(delay=0.02)
+
+        await _worker(session_factory, transport, concurrency=3).run_once()
+
+        assert len(transport.sent) == 10
+        assert transport.max_in_flight == 3
+
+    async def test_failure_is_retried_with_same_idempotency_key(self, session_factory):
+        await _enqueue(session_factory)
+        transport = RecordingTransport(failures=1)
+        worker = _worker(session_factory, transport)
+
+        await worker.run_once()
+        [row] = await _rows(session_factory)
+        assert row.status == "pending"
+        assert row.attempts == 1
+        assert row.last_error == "provider unavailable"
+        # Backed off: not due yet
+        assert await worker.run_once() == 0
+
+        async with session_factory() as db:
+            await db.execute(update(EmailOutbox).values(next_attempt_at=datetime.now(UTC)))
+            await db.commit()
+        await worker.run_once()
+
+        [row] = await _rows(session_factory)
+        assert row.status == "sent"
+        assert row.attempts == 2
+        assert [m.idempotency_key for m in transport.sent] == [row.idempotency_key]
+
+    async def test_gives_up_after_max_attempts(self, session_factory):
+        await _enqueue(session_factory)
+        worker = _worker(session_factory, RecordingTransport(failures=5), max_attempts=1)
+
+        await worker.run_once()
+
+        [row] = await _rows(session_factory)
+        assert row.status == "failed"
+
+    async def test_claimed_rows_are_not_sent_twice(self, session_factory):
+        await _enqueue(session_factory, 10)
+        first, second = RecordingTransport(delay=0.01), RecordingTransport(delay=0.01)
+
+        await asyncio.gather(
+            _worker(session_factory, first, batch_size=5).run_once(),
+            _worker(session_factory, second, batch_size=5).run_once(),
+        )
+
+        sent = [m.idempotency_key for m in first.sent + second.sent]
+        assert len(sent) == len(set(sent)) == 10
+
+    async def test_expired_lease_is_reclaimed(self, session_factory):
+        await _enqueue(session_factory)
+        async with session_factory() as db:
+            # A worker claimed the row and died before finishing
+            await db.execute(
+                update(EmailOutbox).values(
+                    status="sending",
+                    attempts=1,
+                    next_attempt_at=datetime.now(UTC) - timedelta(seconds=1),
+                )
+            )
+            await db.commit()
+        transport = RecordingTransport()
+
+        await _worker(session_factory, transport).run_once()
+
+        [row] = await _rows(session_factory)
+        assert row.status == "sent"
+        assert row.attempts == 2
+
+    async def test_background_loop_and_file_transport(self, session_factory, tmp_path):
+        outbox_dir = tmp_path / "mail"
+        worker = _worker(session_factory, FileTransport(outbox_dir), poll_interval=0.01)
+        worker.start()
+        await _enqueue(session_factory)
+        worker.wake()
+
+        for _ in range(100):
+            if list(outbox_dir.glob("*.eml")):
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+        [row] = await _rows(session_factory)
+        [path] = outbox_dir.glob("*.eml")
+        assert row.status == "sent"
+        assert path.name == f"{row.idempotency_key}.eml"
+        assert "Subject: Hello" in path.read_text()
@@ -0,0 +1,317 @@
+"""Unit tests for HetznerDNSService against the fake Hetzner DNS API."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from tests.fakes.hetzner_dns import ZONE_ID, FakeHetznerDNS
+
+from prisme_api.services.hetzner_dns import (
+    ARecord,
+    HetznerDNSError,
+    HetznerDNSService,
+    HetznerDNSUnavailableError,
+)
+
+
+@pytest.fixture
+def fake() -> FakeHetznerDNS:
+    return FakeHetznerDNS()
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record retry delays instead of sleeping."""
+    delays: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr("prisme_api.services.hetzner_dns.asyncio.sleep", sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+class TestRetry:
+    async def test_transient_errors_are_retried(self, fake, sleeps):
+        record_id = fake.add_record("retry", "10.0.0.1")
+        fake.fail_next(2, status=503)
+        service = fake.service(retry_base_delay=1.0)
+
+        await service.update_a_record(record_id, "10.0.0.2", subdomain="retry")
+        await service.close()
+
+        assert fake.records[record_id]["value"] == "10.0.0.2"
+        assert fake.calls("PUT") == 3
+        assert 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+
+    async def test_retry_after_is_honoured(self, fake, sleeps):
+        fake.fail_next(status=429, retry_after="3")
+        service = fake.service()
+
+        await service.create_a_record("ratelimited", "10.0.0.1")
+        await service.close()
+
+        assert sleeps == [3.0]
+        assert fake.calls("POST") == 2
+
+    async def test_long_retry_after_is_not_waited_out(self, fake, sleeps):
+        fake.fail_next(status=429, retry_after="120")
+        service = fake.service()
+
+        with pytest.raises(HetznerDNSError):
+            await service.create_a_record("ratelimited", "10.0.0.1")
+        await service.close()
+
+        assert sleeps == []
+
+    async def test_failed_post_is_not_repeated(self, fake, sleeps):
+        fake.fail_next(status=502)
+        service = fake.service()
+
+        with pytest.raises(HetznerDNSError, match="Failed to create DNS record"):
+            await service.create_a_record("maybe", "10.0.0.1")
+        await service.close()
+
+        assert fake.calls("POST") == 1
+
+    async def test_gives_up_after_max_retries(self, fake, sleeps):
+        fake.fail_next(10, status=500)
+        service = fake.service(max_retries=2)
+
+        with pytest.raises(HetznerDNSError):
+            await service.delete_a_record("abc")
+        await service.close()
+
+        assert fake.calls("DELETE") == 3
+
+    async def test_transport_errors_become_dns_errors(self, sleeps):
+        def fail(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        service = HetznerDNSService(
+            api_token="t", zone_id=ZONE_ID, http2=False, transport=httpx.MockTransport(fail)
+        )
+
+        with pytest.raises(HetznerDNSError, match="request failed"):
+            await service.create_a_record("offline", "10.0.0.1")
+        await service.close()
+
+        assert len(sleeps) == 3
+
+
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    async def test_open_circuit_fails_fast(self, fake, sleeps):
+        fake.fail_next(10, status=503)
+        service = fake.service(max_retries=0, breaker_threshold=2)
+        for _ in range(2):
+            with pytest.raises(HetznerDNSError):
+                await service.delete_a_record("abc")
+
+        with pytest.raises(HetznerDNSUnavailableError) as exc_info:
+            await service.delete_a_record("abc")
+        await service.close()
+
+        assert fake.calls("DELETE") == 2
+        assert exc_info.value.retry_after > 0
+
+    async def test_bulk_chunks_fail_fast_while_open(self, fake, sleeps):
+        fake.fail_next(1, status=503)
+        service = fake.service(max_retries=0, breaker_threshold=1)
+        with pytest.raises(HetznerDNSError):
+            await service.delete_a_record("abc")
+
+        results = await service.bulk_delete(["a", "b"])
+        await service.close()
+
+        assert [r.ok for r in results] == [False, False]
+        assert fake.calls("DELETE") == 1
+
+
+@pytest.mark.asyncio
+class TestUpdateARecord:
+    async def test_known_record_takes_one_put(self, fake):
+        record_id = fake.add_record("known", "10.0.0.1")
+        service = fake.service()
+
+        await service.update_a_record(record_id, "10.0.0.2", subdomain="known")
+        await service.close()
+
+        assert fake.records[record_id]["value"] == "10.0.0.2"
+        assert (fake.calls("PUT"), fake.calls("GET")) == (1, 0)
+
+    async def test_stale_record_is_reread(self, fake):
+        record_id = fake.add_record("moved", "10.0.0.1")
+        fake.records[record_id]["zone_id"] = "other-zone"
+        service = fake.service()
+
+        await service.update_a_record(record_id, "10.0.0.2", subdomain="moved")
+        await service.close()
+
+        assert fake.records[record_id]["value"] == "10.0.0.2"
+        assert (fake.calls("PUT"), fake.calls("GET")) == (2, 1)
+
+    async def test_missing_record_raises(self, fake):
+        service = fake.service()
+
+        with pytest.raises(HetznerDNSError, match="not found"):
+            await service.update_a_record("missing", "10.0.0.2", subdomain="gone")
+        await service.close()
+
+    async def test_unknown_name_reads_record_first(self, fake):
+        record_id = fake.add_record("legacy", "10.0.0.1", ttl=60)
+        service = fake.service()
+
+        await service.update_a_record(record_id, "10.0.0.2")
+        await service.close()
+
+        assert fake.records[record_id]["ttl"] == 60
+        assert (fake.calls("PUT"), fake.calls("GET")) == (1, 1)
+
+
+@pytest.mark.asyncio
+class TestBulkCreate:
+    async def test_creates_records_in_chunks(self, fake):
+        service = fake.service(bulk_chunk_size=4)
+        records = [ARecord(f"bulk{i}", f"10.0.0.{i}") for i in range(10)]
+
+        results = await service.bulk_create_a_records(records)
+        await service.close()
+
+        assert [r.key for r in results] == [f"bulk{i}" for i in range(10)]
+        assert all(r.ok for r in results)
+        assert {fake.records[r.record_id]["value"] for r in results} == {
+            f"10.0.0.{i}" for i in range(10)
+        }
+        assert fake.calls("POST", "/records/bulk") == 3
+
+    async def test_reports_rejected_records(self, fake):
+        service = fake.service()
+
+        results = await service.bulk_create_a_records(
+            [ARecord("good", "10.0.0.1"), ARecord("", "10.0.0.2")]
+        )
+        await service.close()
+
+        assert [r.ok for r in results] == [True, False]
+        assert results[1].error == "Record rejected by Hetzner DNS"
+
+    async def test_failed_chunk_fails_only_its_records(self, fake):
+        def handle(request: httpx.Request) -> httpx.Response:
+            if b"broken" in request.content:
+                return httpx.Response(500, json={"error": {"message": "boom"}})
+            return fake.handle(request)
+
+        service = HetznerDNSService(
+            api_token="t",
+            zone_id=ZONE_ID,
+            http2=False,
+            bulk_chunk_size=2,
+            transport=httpx.MockTransport(handle),
+        )
+
+        results = await service.bulk_create_a_records(
+            [ARecord("a", "10.0.0.1"), ARecord("b", "10.0.0.2"), ARecord("broken", "10.0.0.3")]
+        )
+        await service.close()
+
+        assert [r.ok for r in results] == [True, True, False]
+        assert "Bulk create failed" in results[2].error
+
+
+@pytest.mark.asyncio
+class TestBulkUpdate:
+    async def test_updates_known_records_and_reports_unknown(self, fake):
+        first = fake.add_record("one", "10.0.0.1")
+        second = fake.add_record("two", "10.0.0.2")
+        service = fake.service()
+
+        results = await service.bulk_update_a_records(
+            [
+                ARecord("one", "10.0.1.1", record_id=first),
+                ARecord("two", "10.0.1.2", record_id=second),
+                ARecord("gone", "10.0.1.3", record_id="missing"),
+            ]
+        )
+        await service.close()
+
+        assert [r.ok for r in results] == [True, True, False]
+        assert fake.records[first]["value"] == "10.0.1.1"
+        assert fake.records[second]["value"] == "10.0.1.2"
+        assert fake.calls("PUT", "/records/bulk") == 1
+        assert fake.calls("GET") == 0
+
+    async def test_requires_record_ids(self, fake):
+        service = fake.service()
+
+        with pytest.raises(ValueError):
+            await service.bulk_update_a_records([ARecord("one", "10.0.0.1")])
+        await service.close()
+
+
+@pytest.mark.asyncio
+class TestBulkDelete:
+    async def test_deletes_with_bounded_concurrency(self, fake):
+        record_ids = [fake.add_record(f"del{i}", "10.0.0.1") for i in range(8)]
+        in_flight = peak = 0
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return fake.handle(request)
+
+        service = HetznerDNSService(
+            api_token="t",
+            zone_id=ZONE_ID,
+            http2=False,
+            bulk_concurrency=3,
+            transport=httpx.MockTransport(handle),
+        )
+
+        results = await service.bulk_delete([*record_ids, "already-gone"])
+        await service.close()
+
+        assert all(r.ok for r in results)
+        assert [r.key for r in results] == [*record_ids, "already-gone"]
+        assert fake.records == {}
+        assert peak == 3
+
+
+@pytest.mark.asyncio
+class TestListRecords:
+    async def test_pages_through_zone(self, fake):
+        for i in range(25):
+            fake.add_record(f"page{i}", "10.0.0.1")
+        service = fake.service()
+
+        records = await service.list_records(page_size=10)
+        await service.close()
+
+        assert sorted(r.name for r in records) == sorted(f"page{i}" for i in range(25))
+        assert fake.calls("GET") == 3
+
+    async def test_failed_page_raises(self, fake):
+        def handle(request: httpx.Request) -> httpx.Response:
+            if request.url.params.get("page") == "2":
+                return httpx.Response(500, json={"error": {"message": "boom"}})
+            return fake.handle(request)
+
+        for i in range(3):
+            fake.add_record(f"page{i}", "10.0.0.1")
+        service = HetznerDNSService(
+            api_token="t",
+            zone_id=ZONE_ID,
+            http2=False,
+            max_retries=0,
+            transport=httpx.MockTransport(handle),
+        )
+
+        with pytest.raises(HetznerDNSError, match="Failed to list DNS records"):
+            await service.list_records(page_size=2)
+        await service.close()
@@ -0,0 +1,98 @@
+"""Unit tests for ServiceBase.list_with_count."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import event
+from tests.factories.subdomain import SubdomainFactory
+
+from prisme_api.schemas.subdomain import SubdomainFilter
+from prisme_api.services.cursor import cursor_for
+from prisme_api.services.subdomain import SubdomainService
+
+
+@pytest.fixture
+def statements(engine):
+    """Record every SQL statement sent to the database."""
+    seen: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def _seed(db, count: int) -> str:
+    """Create subdomains sharing a unique prefix and return the prefix."""
+    prefix = f"lwc{uuid.uuid4().hex[:6]}"
+    SubdomainFactory._meta.sqlalchemy_session = db
+    for i in range(count):
+        SubdomainFactory.create(name=f"{prefix}{i}")
+    await db.commit()
+    return prefix
+
+
+@pytest.mark.asyncio
+class TestListWithCount:
+    async def test_items_and_total_in_one_query(self, db, statements):
+        prefix = await _seed(db, 5)
+        service = SubdomainService(db)
+        filters = SubdomainFilter(name_like=f"{prefix}%")
+        statements.clear()
+
+        page = await service.list_with_count(skip=0, limit=2, filters=filters, sort_by="name")
+
+        assert [item.name for item in page.items] == [f"{prefix}0", f"{prefix}1"]
+        assert page.total == 5
+        assert not page.total_is_estimate
+        assert len(statements) == 1
+
+    async def test_matches_separate_count(self, db):
+        prefix = await _seed(db, 3)
+        service = SubdomainService(db)
+        filters = SubdomainFilter(name_like=f"{prefix}%")
+
+        page = await service.list_with_count(skip=1, limit=10, filters=filters)
+
+        assert page.total == await service.count_filtered(filters=filters) == 3
+        assert len(page.items) == 2
+
+    async def test_empty_page_still_counts(self, db):
+        prefix = await _seed(db, 2)
+        service = SubdomainService(db)
+
+        page = await service.list_with_count(
+            skip=10, limit=10, filters=SubdomainFilter(name_like=f"{prefix}%")
+        )
+
+        assert page.items == []
+        assert page.total == 2
+
+    async def test_keyset_page_reports_full_total(self, db):
+        prefix = await _seed(db, 4)
+        service = SubdomainService(db)
+        filters = SubdomainFilter(name_like=f"{prefix}%")
+        first = await service.list(limit=2, filters=filters, sort_by="name")
+
+        page = await service.list_with_count(
+            limit=2,
+            filters=filters,
+            sort_by="name",
+            after=cursor_for(first[-1], sort_by="name", sort_order="asc"),
+        )
+
+        assert [item.name for item in page.items] == [f"{prefix}2", f"{prefix}3"]
+        assert page.total == 4
+
+    async def test_approximate_is_exact_on_sqlite(self, db):
+        await _seed(db, 1)
+        service = SubdomainService(db)
+
+        page = await service.list_with_count(limit=1, approximate=True)
+
+        assert page.total == await service.count()
+        assert not page.total_is_estimate
@@ -0,0 +1,96 @@
+"""Unit tests for metrics.py."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from tests.fakes.hetzner_dns import FakeHetznerDNS
+
+from prisme_api.metrics import observe_outbound
+from prisme_api.services.hetzner_dns import HetznerDNSError, HetznerDNSService
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+class TestRequestMetrics:
+    async def test_requests_are_labelled_by_route_template(self, client):
+        labels = {"method": "GET", "route": "/api/subdomains/{id}", "status": "404"}
+        before = _sample("http_requests_total", **labels)
+
+        await client.get("/api/subdomains/999001")
+        await client.get("/api/subdomains/999002")
+
+        assert _sample("http_requests_total", **labels) == before + 2
+
+    async def test_unmatched_paths_share_one_label(self, client):
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        before = _sample("http_requests_total", **labels)
+
+        await client.get("/no/such/path")
+
+        assert _sample("http_requests_total", **labels) == before + 1
+
+    async def test_queries_are_attributed_to_route(self, client):
+        labels = {"route": "/api/subdomains", "operation": "SELECT"}
+        before = _sample("db_queries_total", **labels)
+
+        response = await client.get("/api/subdomains")
+
+        assert response.status_code == 200
+        assert _sample("db_queries_total", **labels) > before
+
+    async def test_metrics_endpoint_exposes_text_format(self, client):
+        await client.get("/health")
+
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+
+
+@pytest.mark.asyncio
+class TestOutboundMetrics:
+    async def test_hetzner_calls_are_counted_by_status(self):
+        fake = FakeHetznerDNS()
+        service = fake.service()
+        labels = {"service": "hetzner_dns", "method": "POST", "status": "200"}
+        before = _sample("outbound_requests_total", **labels)
+
+        await service.create_a_record("metrics", "1.2.3.4")
+        await service.close()
+
+        assert _sample("outbound_requests_total", **labels) == before + 1
+
+    async def test_transport_errors_are_counted(self):
+        def fail(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        service = HetznerDNSService(
+            api_token="t",
+            zone_id="z",
+            http2=False,
+            max_retries=0,
+            transport=httpx.MockTransport(fail),
+        )
+        labels = {"service": "hetzner_dns", "method": "DELETE", "status": "error"}
+        before = _sample("outbound_requests_total", **labels)
+
+        with pytest.raises(HetznerDNSError):
+            await service.delete_a_record("abc")
+        await service.close()
+
+        assert _sample("outbound_requests_total", **labels) == before + 1
+
+    async def test_observe_outbound_records_failures(self):
+        labels = {"service": "resend", "method": "POST", "status": "error"}
+        before = _sample("outbound_requests_total", **labels)
+
+        with pytest.raises(RuntimeError), observe_outbound("resend", "POST"):
+            raise RuntimeError("boom")
+
+        assert _sample("outbound_requests_total", **labels) == before + 1
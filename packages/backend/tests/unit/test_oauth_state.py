@@ -0,0 +1,56 @@
+"""Unit tests for auth/oauth_state.py."""
+
+from __future__ import annotations
+
+import pytest
+
+from prisme_api.auth.oauth_state import MemoryOAuthStateStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+class TestMemoryOAuthStateStore:
+    async def test_state_is_single_use(self):
+        store = MemoryOAuthStateStore(ttl_seconds=300)
+
+        await store.add("abc")
+
+        assert await store.consume("abc")
+        assert not await store.consume("abc")
+
+    async def test_unknown_state_is_rejected(self):
+        store = MemoryOAuthStateStore(ttl_seconds=300)
+
+        assert not await store.consume("never-issued")
+
+    async def test_expired_state_is_rejected(self):
+        clock = FakeClock()
+        store = MemoryOAuthStateStore(ttl_seconds=300, clock=clock)
+        await store.add("abc")
+
+        clock.now += 301
+
+        assert not await store.consume("abc")
+
+    async def test_expired_states_are_dropped(self):
+        clock = FakeClock()
+        store = MemoryOAuthStateStore(ttl_seconds=300, clock=clock)
+        for i in range(100):
+            await store.add(f"old-{i}")
+        await store.consume("old-0")
+
+        clock.now += 200
+        await store.add("new")
+        assert len(store) == 100
+
+        clock.now += 101
+        await store.add("newer")
+        assert len(store) == 2
+        assert await store.consume("new")
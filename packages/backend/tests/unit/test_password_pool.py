@@ -0,0 +1,93 @@
+"""Unit tests for auth/password_pool.py and the async password helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from prisme_api.auth.password_pool import PasswordHashPool, PasswordHashPoolSaturatedError
+from prisme_api.auth.utils import hash_password_async, verify_password, verify_password_async
+
+
+@pytest.mark.asyncio
+class TestPasswordHashPool:
+    async def test_hash_and_verify_async(self):
+        hashed = await hash_password_async("SecurePass1")
+
+        assert verify_password("SecurePass1", hashed)
+        assert await verify_password_async("SecurePass1", hashed)
+        assert not await verify_password_async("WrongPassword1", hashed)
+
+    async def test_runs_off_the_event_loop(self):
+        pool = PasswordHashPool(max_workers=1, max_queue=0)
+        loop_thread = threading.get_ident()
+
+        worker_thread = await pool.run(threading.get_ident)
+
+        assert worker_thread != loop_thread
+        pool.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        def sample(name: str) -> float:
+            return REGISTRY.get_sample_value(name) or 0.0
+
+        pool = PasswordHashPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        rejected = sample("password_hash_rejected_total")
+
+        running = asyncio.create_task(pool.run(release.wait, 5))
+        queued = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        stats = pool.stats()
+        assert (stats.in_flight, stats.queued) == (1, 1)
+        with pytest.raises(PasswordHashPoolSaturatedError):
+            await pool.run(release.wait, 5)
+        assert pool.stats().rejected == 1
+        assert (sample("password_hash_in_flight"), sample("password_hash_queued")) == (1, 1)
+        assert sample("password_hash_rejected_total") - rejected == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        stats = pool.stats()
+        assert (stats.in_flight, stats.queued, stats.completed) == (0, 0, 2)
+        assert (sample("password_hash_in_flight"), sample("password_hash_queued")) == (0, 0)
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+class TestLoginBackpressure:
+    async def test_login_returns_503_when_pool_saturated(
+        self, unauthenticated_client, db, monkeypatch
+    ):
+        from prisme_api.auth import utils
+        from prisme_api.auth.utils import hash_password
+        from prisme_api.models.user import User
+
+        db.add(
+            User(
+                email="busy@example.com",
+                username="busy",
+                password_hash=hash_password("StrongPass1"),
+                email_verified=True,
+                is_active=True,
+                roles=["user"],
+                failed_login_attempts=0,
+            )
+        )
+        await db.commit()
+
+        saturated = PasswordHashPool(max_workers=1, max_queue=0)
+        saturated._pending = 1
+        monkeypatch.setattr(utils, "password_hash_pool", saturated)
+
+        resp = await unauthenticated_client.post(
+            "/api/auth/login",
+            json={"email": "busy@example.com", "password": "StrongPass1"},
+        )
+
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "1"
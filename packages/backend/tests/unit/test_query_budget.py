@@ -0,0 +1,94 @@
+"""Unit tests for middleware/query_budget.py."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from prisme_api.middleware.query_budget import (
+    QUERY_COUNT_HEADER,
+    QueryBudgetExceededError,
+    QueryBudgetMiddleware,
+    count_queries,
+    normalize_statement,
+    query_budget,
+)
+from prisme_api.models.user import User
+
+
+class TestNormalizeStatement:
+    def test_literals_and_whitespace_are_dropped(self):
+        assert normalize_statement("SELECT *\n  FROM t WHERE id = 5 AND name = 'a''b'") == (
+            "SELECT * FROM t WHERE id = ? AND name = ?"
+        )
+
+    def test_in_lists_of_any_length_match(self):
+        assert normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?)") == normalize_statement(
+            "SELECT * FROM t WHERE id IN (?)"
+        )
+        assert normalize_statement("SELECT * FROM t WHERE id IN ($1, $2)") == (
+            "SELECT * FROM t WHERE id IN (?)"
+        )
+
+
+@pytest.mark.asyncio
+class TestQueryBudget:
+    async def test_counts_statements(self, db):
+        with count_queries() as log:
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+
+        assert log.count == 2
+
+    async def test_nested_blocks_both_count(self, db):
+        with count_queries() as outer:
+            await db.execute(text("SELECT 1"))
+            with count_queries() as inner:
+                await db.execute(text("SELECT 2"))
+
+        assert (outer.count, inner.count) == (2, 1)
+
+    async def test_over_budget_raises(self, db):
+        expected = pytest.raises(QueryBudgetExceededError, match="3 SQL statements, budget is 2")
+        with expected, query_budget(2):
+            for _ in range(3):
+                await db.execute(text("SELECT 1"))
+
+    async def test_repeated_statement_is_reported_as_n_plus_one(self, db):
+        expected = pytest.raises(QueryBudgetExceededError, match="possible N\\+1: 3x SELECT")
+        with expected, query_budget(None, repeat_threshold=3):
+            for user_id in (1, 2, 3):
+                await db.execute(select(User).where(User.id == user_id))
+
+    async def test_within_budget_passes(self, db):
+        with query_budget(1) as log:
+            await db.execute(text("SELECT 1"))
+
+        assert log.count == 1
+
+
+@pytest.mark.asyncio
+class TestQueryBudgetMiddleware:
+    async def test_reports_count_and_warns(self, db, caplog):
+        async def endpoint(request):
+            for user_id in (1, 2):
+                await db.execute(select(User).where(User.id == user_id))
+            return PlainTextResponse("ok")
+
+        app = QueryBudgetMiddleware(
+            Starlette(routes=[Route("/", endpoint)]), budget=1, repeat_threshold=2
+        )
+
+        with caplog.at_level(logging.WARNING, logger="prisme_api.middleware.query_budget"):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as c:
+                response = await c.get("/")
+
+        assert response.headers[QUERY_COUNT_HEADER] == "2"
+        assert "GET /: 2 SQL statements, budget is 1" in caplog.text
+        assert "possible N+1: 2x SELECT" in caplog.text
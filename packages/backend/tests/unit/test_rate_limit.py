@@ -0,0 +1,66 @@
+"""Unit tests for the shared SQLite rate limit storage."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from prisme_api.rate_limit import SQLiteStorage
+
+
+def _storage(tmp_path) -> SQLiteStorage:
+    return storage_from_string(f"sqlite:///{tmp_path}/limits.db")
+
+
+class TestSQLiteStorage:
+    def test_uri_scheme_is_registered(self, tmp_path):
+        storage = _storage(tmp_path)
+
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.path == f"{tmp_path}/limits.db"
+        assert storage.check()
+
+    def test_incr_get_clear(self, tmp_path):
+        storage = _storage(tmp_path)
+
+        assert storage.incr("key", 60) == 1
+        assert storage.incr("key", 60, amount=2) == 3
+        assert storage.get("key") == 3
+        assert storage.get_expiry("key") > 0
+
+        storage.clear("key")
+        assert storage.get("key") == 0
+
+    def test_limit_is_shared_between_workers(self, tmp_path):
+        """Two storages on the same file (one per worker) share one budget."""
+        item = parse("5/minute")
+        workers = [SlidingWindowCounterRateLimiter(_storage(tmp_path)) for _ in range(2)]
+
+        hits = [workers[i % 2].hit(item, "user:1") for i in range(8)]
+
+        assert hits == [True] * 5 + [False] * 3
+        assert not workers[0].test(item, "user:1")
+        assert workers[1].get_window_stats(item, "user:1").remaining == 0
+        assert workers[0].hit(item, "user:2")
+
+    def test_concurrent_hits_never_exceed_limit(self, tmp_path):
+        item = parse("10/hour")
+        limiters = [SlidingWindowCounterRateLimiter(_storage(tmp_path)) for _ in range(4)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            hits = list(pool.map(lambda i: limiters[i % 4].hit(item, "user:1"), range(40)))
+
+        assert sum(hits) == 10
+
+    def test_clear_sliding_window(self, tmp_path):
+        item = parse("1/minute")
+        limiter = SlidingWindowCounterRateLimiter(_storage(tmp_path))
+
+        assert limiter.hit(item, "user:1")
+        assert not limiter.hit(item, "user:1")
+
+        limiter.clear(item, "user:1")
+        assert limiter.hit(item, "user:1")
@@ -0,0 +1,117 @@
+"""Unit tests for resilience.py."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+from prometheus_client import REGISTRY
+
+from prisme_api.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker("test_upstream", failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+
+class TestBackoff:
+    def test_grows_exponentially_with_jitter(self):
+        assert 0.5 <= backoff_delay(0, 1.0, 60.0) <= 1.0
+        assert 4.0 <= backoff_delay(3, 1.0, 60.0) <= 8.0
+
+    def test_is_capped(self):
+        assert backoff_delay(20, 1.0, 5.0) <= 5.0
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("7") == 7.0
+
+    def test_http_date(self):
+        retry_at = datetime.now(UTC) + timedelta(seconds=30)
+
+        assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+    def test_missing_or_malformed(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+        assert exc_info.value.retry_after == 10.0
+
+    def test_half_open_admits_one_probe(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10.0
+
+        breaker.before_call()
+
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_successful_probe_closes(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10.0
+        breaker.before_call()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10.0
+        breaker.before_call()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.retry_after == 10.0
+
+    def test_state_is_exported(self, breaker):
+        labels = {"service": "test_upstream", "state": "open"}
+        before = REGISTRY.get_sample_value("circuit_breaker_transitions_total", labels) or 0.0
+
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert REGISTRY.get_sample_value("circuit_breaker_state", {"service": "test_upstream"}) == 2
+        assert REGISTRY.get_sample_value("circuit_breaker_transitions_total", labels) == before + 1
@@ -0,0 +1,296 @@
+"""Unit tests for services/route_manager.py."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import yaml
+
+from prisme_api.services.route_manager import (
+    ShardedTraefikRouteManager,
+    TraefikRouteError,
+    TraefikRouteManager,
+)
+
+
+def _server_url(path) -> str:
+    config = yaml.safe_load(path.read_text())
+    service = next(iter(config["http"]["services"].values()))
+    return service["loadBalancer"]["servers"][0]["url"]
+
+
+@pytest.mark.asyncio
+class TestTraefikRouteManager:
+    async def test_create_writes_complete_file_without_temp_leftovers(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+
+        await manager.create_route("myapp", "1.2.3.4", 8080)
+
+        assert _server_url(tmp_path / "myapp.yml") == "http://1.2.3.4:8080"
+        assert [p.name for p in tmp_path.glob("*.yml")] == ["myapp.yml"]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    async def test_update_replaces_file(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("myapp", "1.2.3.4")
+
+        await manager.update_route("myapp", "5.6.7.8", 81)
+
+        assert _server_url(tmp_path / "myapp.yml") == "http://5.6.7.8:81"
+
+    async def test_delete_removes_file(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("myapp", "1.2.3.4")
+
+        await manager.delete_route("myapp")
+
+        assert not (tmp_path / "myapp.yml").exists()
+
+    async def test_batch_defers_writes_until_exit(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+
+        async with manager.batch():
+            await manager.create_route("one", "1.1.1.1")
+            await manager.create_route("two", "2.2.2.2")
+            assert not list(tmp_path.glob("*.yml"))
+            assert await manager.route_exists("one")
+
+        assert sorted(p.name for p in tmp_path.glob("*.yml")) == ["one.yml", "two.yml"]
+
+    async def test_batch_window_coalesces_concurrent_changes(self, tmp_path, monkeypatch):
+        manager = TraefikRouteManager(str(tmp_path), batch_window=0.05)
+        applied: list[dict] = []
+        original = manager._apply
+
+        def record(changes):
+            applied.append(dict(changes))
+            original(changes)
+
+        monkeypatch.setattr(manager, "_apply", record)
+
+        await asyncio.gather(*(manager.create_route(f"app{i}", "1.2.3.4") for i in range(5)))
+
+        assert len(applied) == 1
+        assert len(list(tmp_path.glob("*.yml"))) == 5
+
+    async def test_failed_window_flush_releases_waiters_and_keeps_changes(
+        self, tmp_path, monkeypatch
+    ):
+        manager = TraefikRouteManager(str(tmp_path), batch_window=0.01)
+
+        def fail(changes):
+            raise RuntimeError("disk gone")
+
+        monkeypatch.setattr(manager, "_apply", fail)
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(manager.create_route(f"app{i}", "1.2.3.4") for i in range(3)),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        monkeypatch.undo()
+        assert await manager.flush() == 3
+        assert len(list(tmp_path.glob("*.yml"))) == 3
+
+    async def test_cancelled_window_flush_releases_waiters(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path), batch_window=10)
+        waiter = asyncio.create_task(manager.create_route("myapp", "1.2.3.4"))
+        await asyncio.sleep(0)
+
+        manager._window_task.cancel()
+
+        with pytest.raises(TraefikRouteError, match="cancelled"):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert await manager.flush() == 1
+
+    async def test_sync_routes_flushes_once(self, tmp_path, monkeypatch):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("orphan", "9.9.9.9")
+        flushes = 0
+        original = manager._apply
+
+        def record(changes):
+            nonlocal flushes
+            flushes += 1
+            original(changes)
+
+        monkeypatch.setattr(manager, "_apply", record)
+
+        result = await manager.sync_routes(
+            [{"name": f"app{i}", "ip_address": "1.2.3.4", "port": 80} for i in range(3)]
+        )
+
+        assert (len(result.created), result.deleted) == (3, ["orphan"])
+        assert flushes == 1
+        assert sorted(p.stem for p in tmp_path.glob("*.yml")) == ["app0", "app1", "app2"]
+
+
+def _active(*routes: tuple[str, str, int]) -> list[dict]:
+    return [{"name": n, "ip_address": ip, "port": port} for n, ip, port in routes]
+
+
+@pytest.mark.asyncio
+class TestSyncRoutes:
+    async def test_detects_stale_routes(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("same", "1.1.1.1")
+        await manager.create_route("moved", "1.1.1.1")
+
+        result = await manager.sync_routes(
+            _active(("same", "1.1.1.1", 80), ("moved", "2.2.2.2", 80), ("new", "3.3.3.3", 80))
+        )
+
+        assert (result.created, result.updated, result.deleted) == (["new"], ["moved"], [])
+        assert result.unchanged == 1
+        assert _server_url(tmp_path / "moved.yml") == "http://2.2.2.2:80"
+
+    async def test_in_sync_writes_nothing(self, tmp_path, monkeypatch):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("myapp", "1.1.1.1")
+        monkeypatch.setattr(manager, "_apply", lambda changes: pytest.fail("unexpected write"))
+
+        result = await manager.sync_routes(_active(("myapp", "1.1.1.1", 80)))
+
+        assert not result.changed
+        assert result.unchanged == 1
+
+    async def test_dry_run_reports_without_writing(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("orphan", "1.1.1.1")
+
+        result = await manager.sync_routes(_active(("new", "1.1.1.1", 80)), dry_run=True)
+
+        assert (result.created, result.deleted, result.dry_run) == (["new"], ["orphan"], True)
+        assert [p.name for p in tmp_path.glob("*.yml")] == ["orphan.yml"]
+
+    async def test_manifest_survives_restart(self, tmp_path):
+        await TraefikRouteManager(str(tmp_path)).create_route("myapp", "1.1.1.1")
+
+        result = await TraefikRouteManager(str(tmp_path)).sync_routes(
+            _active(("myapp", "1.1.1.1", 80))
+        )
+
+        assert result.unchanged == 1
+        assert (tmp_path / ".manifest.json").exists()
+
+    async def test_workers_share_the_manifest(self, tmp_path):
+        a = TraefikRouteManager(str(tmp_path))
+        b = TraefikRouteManager(str(tmp_path))
+        await a.create_route("seed", "1.1.1.1")
+        await b.create_route("x", "1.1.1.1")
+        await a.create_route("y", "1.1.1.1")
+
+        result = await b.sync_routes(
+            _active(("seed", "1.1.1.1", 80), ("y", "1.1.1.1", 80)), dry_run=True
+        )
+
+        assert (result.deleted, result.unchanged) == (["x"], 2)
+
+    async def test_files_missing_from_manifest_are_orphans(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("seed", "1.1.1.1")
+        (tmp_path / "x.yml").write_text("http: {}\n")
+
+        result = await manager.sync_routes(_active(("seed", "1.1.1.1", 80)), dry_run=True)
+
+        assert result.deleted == ["x"]
+
+    async def test_verify_catches_hand_edits(self, tmp_path):
+        manager = TraefikRouteManager(str(tmp_path))
+        await manager.create_route("myapp", "1.1.1.1")
+        (tmp_path / "myapp.yml").write_text("http: {}\n")
+
+        trusting = await manager.sync_routes(_active(("myapp", "1.1.1.1", 80)), dry_run=True)
+        verified = await manager.sync_routes(_active(("myapp", "1.1.1.1", 80)), verify=True)
+
+        assert not trusting.changed
+        assert verified.updated == ["myapp"]
+        assert _server_url(tmp_path / "myapp.yml") == "http://1.1.1.1:80"
+
+    async def test_sharded_sync(self, tmp_path):
+        manager = ShardedTraefikRouteManager(str(tmp_path), shards=4)
+        await manager.create_route("same", "1.1.1.1")
+        await manager.create_route("gone", "1.1.1.1")
+
+        result = await manager.sync_routes(_active(("same", "1.1.1.1", 80), ("new", "2.2.2.2", 80)))
+
+        assert (result.created, result.deleted, result.unchanged) == (["new"], ["gone"], 1)
+        assert not await manager.route_exists("gone")
+
+
+@pytest.mark.asyncio
+class TestShardedTraefikRouteManager:
+    async def test_routes_share_shard_files(self, tmp_path):
+        manager = ShardedTraefikRouteManager(str(tmp_path), shards=4)
+
+        async with manager.batch():
+            for i in range(20):
+                await manager.create_route(f"app{i}", "1.2.3.4")
+
+        files = sorted(p.name for p in tmp_path.glob("*.yml"))
+        assert 1 <= len(files) <= 4
+        assert all(name.startswith("routes-") for name in files)
+        routers = set()
+        for path in tmp_path.glob("*.yml"):
+            routers |= set(yaml.safe_load(path.read_text())["http"]["routers"])
+        assert routers == {f"subdomain-app{i}" for i in range(20)}
+
+    async def test_update_rewrites_only_affected_shard(self, tmp_path):
+        manager = ShardedTraefikRouteManager(str(tmp_path), shards=4)
+        async with manager.batch():
+            for i in range(20):
+                await manager.create_route(f"app{i}", "1.2.3.4")
+        before = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.yml")}
+        shard = tmp_path / f"routes-{manager._shard_for('app3'):03d}.yml"
+
+        await manager.update_route("app3", "5.6.7.8")
+
+        after = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.yml")}
+        changed = {name for name in after if after[name] != before[name]}
+        assert changed == {shard.name}
+        services = yaml.safe_load(shard.read_text())["http"]["services"]
+        assert services["subdomain-app3"]["loadBalancer"]["servers"][0]["url"] == (
+            "http://5.6.7.8:80"
+        )
+
+    async def test_state_is_reloaded_from_disk(self, tmp_path):
+        manager = ShardedTraefikRouteManager(str(tmp_path), shards=4)
+        await manager.create_route("myapp", "1.2.3.4")
+        await manager.create_route("other", "1.2.3.4")
+
+        reloaded = ShardedTraefikRouteManager(str(tmp_path), shards=4)
+        await reloaded.delete_route("myapp")
+
+        assert await reloaded.route_exists("other")
+        assert not await reloaded.route_exists("myapp")
+
+    async def test_workers_keep_each_others_routes(self, tmp_path):
+        a = ShardedTraefikRouteManager(str(tmp_path), shards=1)
+        b = ShardedTraefikRouteManager(str(tmp_path), shards=1)
+
+        await a.create_route("alpha", "1.1.1.1")
+        await b.create_route("beta", "2.2.2.2")
+        await a.delete_route("beta")
+        await b.create_route("gamma", "3.3.3.3")
+
+        assert sorted(ShardedTraefikRouteManager(str(tmp_path), shards=1)._routes) == [
+            "alpha",
+            "gamma",
+        ]
+
+    async def test_resharding_moves_routes(self, tmp_path):
+        manager = ShardedTraefikRouteManager(str(tmp_path), shards=8)
+        async with manager.batch():
+            for i in range(20):
+                await manager.create_route(f"app{i}", "1.2.3.4")
+
+        resharded = ShardedTraefikRouteManager(str(tmp_path), shards=2)
+        await resharded.flush()
+        await resharded.create_route("new", "1.2.3.4")
+
+        assert {p.name for p in tmp_path.glob("*.yml")} <= {"routes-000.yml", "routes-001.yml"}
+        assert len(ShardedTraefikRouteManager(str(tmp_path), shards=2)._routes) == 21
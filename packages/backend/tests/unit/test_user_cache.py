@@ -0,0 +1,168 @@
+"""Unit tests for auth/user_cache.py."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+from prisme_api.auth.dependencies import create_session_jwt, get_current_user
+from prisme_api.auth.user_cache import UserCache, user_cache
+from prisme_api.models.user import User
+from prisme_api.schemas.user import UserUpdate
+from prisme_api.services.user import UserService
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _user(user_id: int = 1, **kwargs) -> User:
+    return User(
+        id=user_id,
+        email=kwargs.get("email", f"user{user_id}@example.com"),
+        roles=kwargs.get("roles", ["user"]),
+        is_active=True,
+    )
+
+
+async def _persisted_user(db) -> User:
+    unique = uuid.uuid4().hex[:8]
+    user = User(
+        email=f"cached-{unique}@example.com",
+        username=f"cached-{unique}",
+        email_verified=True,
+        is_active=True,
+        roles=["user"],
+        failed_login_attempts=0,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+class TestUserCache:
+    def test_miss_then_hit(self):
+        cache = UserCache(max_size=10, ttl_seconds=30)
+        assert cache.get(1) is None
+
+        cache.put(_user(1), cache.version(1))
+        cached = cache.get(1)
+
+        assert cached is not None
+        assert cached.email == "user1@example.com"
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_ratio == 0.5
+
+    def test_lookups_are_exported(self):
+        def lookups(result: str) -> float:
+            return REGISTRY.get_sample_value("user_cache_lookups_total", {"result": result}) or 0.0
+
+        cache = UserCache()
+        hits, misses = lookups("hit"), lookups("miss")
+
+        cache.get(1)
+        cache.put(_user(1), cache.version(1))
+        cache.get(1)
+
+        assert (lookups("hit") - hits, lookups("miss") - misses) == (1, 1)
+
+    def test_snapshot_is_a_copy(self):
+        cache = UserCache()
+        user = _user(1, roles=["user"])
+        cache.put(user, cache.version(1))
+
+        user.roles.append("admin")
+
+        assert cache.get(1).roles == ["user"]
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = UserCache(ttl_seconds=30, clock=clock)
+        cache.put(_user(1), cache.version(1))
+
+        clock.now += 31
+
+        assert cache.get(1) is None
+        assert cache.stats().size == 0
+
+    def test_lru_eviction(self):
+        cache = UserCache(max_size=2)
+        for user_id in (1, 2):
+            cache.put(_user(user_id), cache.version(user_id))
+        cache.get(1)  # 2 is now least recently used
+        cache.put(_user(3), cache.version(3))
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.stats().evictions == 1
+
+    def test_invalidate_drops_entry(self):
+        cache = UserCache()
+        cache.put(_user(1), cache.version(1))
+
+        cache.invalidate(1)
+
+        assert cache.get(1) is None
+        assert cache.stats().invalidations == 1
+
+    def test_put_with_stale_version_is_discarded(self):
+        cache = UserCache()
+        version = cache.version(1)
+        # A write lands while the row is being loaded
+        cache.invalidate(1)
+
+        cache.put(_user(1), version)
+
+        assert cache.get(1) is None
+
+    def test_zero_ttl_disables(self):
+        cache = UserCache(ttl_seconds=0)
+        cache.put(_user(1), cache.version(1))
+
+        assert not cache.enabled
+        assert cache.get(1) is None
+
+
+@pytest.mark.asyncio
+class TestGetCurrentUserCaching:
+    async def test_second_lookup_skips_query(self, db, engine):
+        user = await _persisted_user(db)
+        token = create_session_jwt(user)
+        user_cache.invalidate(user.id)
+
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        try:
+            first = await get_current_user(token, db)
+            queries_after_first = len(statements)
+            second = await get_current_user(token, db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+        assert first.id == second.id == user.id
+        assert len(statements) == queries_after_first
+
+    async def test_user_service_update_invalidates(self, db):
+        user = await _persisted_user(db)
+        token = create_session_jwt(user)
+        await get_current_user(token, db)
+        assert user_cache.get(user.id) is not None
+
+        await UserService(db).update(id=user.id, data=UserUpdate(roles=["user", "admin"]))
+
+        assert user_cache.get(user.id) is None
+        refreshed = await get_current_user(token, db)
+        assert "admin" in refreshed.roles